@@ -1,50 +1,50 @@
 from domain.ports import LeaveBalancePort,TicketCreationPort
 from domain.tools.clerk_tool import make_get_leave_balance_tool,make_ticket_creation_tool
-from domain.prompts.clerk_prompt import Clerk_Classification_prompt,Clerk_Inner_Model_Prompt,Clerk_Final_Response_Prompt
-from domain.entities import TicketCreation, TicketCreationClassification, GetBalanceClassification, GeneralInformationClassification
+from domain.prompts.clerk_prompt import Clerk_Classification_prompt,Clerk_Extraction_Prompt,Clerk_Inner_Model_Prompt,Clerk_Final_Response_Prompt,CLERK_OUTCOME_TEMPLATES
+from domain.entities import TicketCreation, ClerkMultipleTasksOutput, ClerkTaskOutput
 from application.states import ClerkClassificationState, ClerkState
 from langchain_core.language_models.chat_models import BaseChatModel
 from langgraph.graph import END,StateGraph,START
 from collections import deque
+from typing import Optional
 from langchain_core.messages import AIMessage
 try:
     from IPython.display import Image,display
 except ImportError:
     Image=None
     display=None
-from infrastructure.redis.redis_client import save_agent_state_for_final_response,get_agent_state_for_final_response,save_agent_state_for_hitl_intervention
+from infrastructure.redis.redis_client import save_agent_state_for_hitl_intervention
 from domain.entities import AgentState
+from application.services.conversation_compaction import trim_messages_to_budget
+from application.services.structured_output import ainvoke_structured
+from config import AGENT_PROMPT_HISTORY_TOKEN_BUDGET, AGENT_LLM_RETRY_BACKOFF_SECONDS, CLERK_BATCHED_EXTRACTION, CLERK_TEMPLATED_RESPONSES
 from infrastructure.redis.redis_config import get_async_redis_client
 from infrastructure.socket.socket_manager import broadcast_hitl_event
+import asyncio
 import json
 
 #Clerk Agent Implementation
 class ClerkAgent:
-    def __init__(self, llm_model:BaseChatModel, leave_balance_port:LeaveBalancePort, ticket_creation_port:TicketCreationPort):
+    def __init__(self, llm_model:BaseChatModel, leave_balance_port:LeaveBalancePort, ticket_creation_port:TicketCreationPort, batched_extraction:bool=CLERK_BATCHED_EXTRACTION, templated_responses:bool=CLERK_TEMPLATED_RESPONSES):
         self.llm_model=llm_model
         self.leave_balance_port=leave_balance_port
         self.ticket_creation_port=ticket_creation_port
+        self.batched_extraction=batched_extraction
+        self.templated_responses=templated_responses
 
     # The outer model node takes the user's query 
     # classifies it into one or more tasks for the inner model to execute. 
-    # It also initializes the agent's state with the original user query and an empty message history.
-    def Clerk_Outer_Model_Node(self, state: ClerkState) -> dict:
+    # With batched extraction the same call also fills the details of every task.
+    async def Clerk_Outer_Model_Node(self, state: ClerkState) -> dict:
         try:
-            formatted_prompt = Clerk_Classification_prompt.format_messages(query=state.user_query.query)
-            response = self.llm_model.invoke(list(state.messages) + formatted_prompt)
-
-            raw = response.content.strip()
-
-            if raw.startswith("```"):
-                lines = [l for l in raw.split("\n") if not l.strip().startswith("```")]
-                raw = "\n".join(lines).strip()
-
-            parsed = json.loads(raw)
-
-            if isinstance(parsed, dict):
-                parsed = [parsed]
-
-            tasks = [self._parse_clerk_task(t) for t in parsed]
+            prompt = Clerk_Extraction_Prompt if self.batched_extraction else Clerk_Classification_prompt
+            formatted_prompt = prompt.format_messages(query=state.user_query.query)
+            output, response = await ainvoke_structured(
+                self.llm_model,
+                trim_messages_to_budget(state.messages, AGENT_PROMPT_HISTORY_TOKEN_BUDGET) + formatted_prompt,
+                ClerkMultipleTasksOutput,
+            )
+            tasks = output.tasks
 
             return {
                 "messages": [AIMessage(content=response.content)],
@@ -69,25 +69,29 @@ class ClerkAgent:
     #clerk inner model node takes the current task from the pending_tasks queue
     # generates a response that includes the details needed to execute the task. 
     # It updates the agent's state with the new messages, the final response for the current task, and the remaining pending tasks.
-    def Clerk_Inner_Model_Node(self, state: ClerkState) -> dict:
+    async def Clerk_Inner_Model_Node(self, state: ClerkState) -> dict:
         try:
             pending = deque(state.pending_tasks)
             current_task = pending.popleft()
 
+            # Tasks already filled by the batched extraction skip the per-task LLM call
+            if self._is_extracted(current_task):
+                final_response = list(state.final_response or [])
+                final_response.append(current_task)
+                return {
+                    "final_response": final_response,
+                    "pending_tasks": pending
+                }
+
             formatted_prompt = Clerk_Inner_Model_Prompt.format_messages(
                 current_task=current_task.model_dump(),
                 user_query=state.user_query.query
             )
-            response = self.llm_model.invoke(list(state.messages) + formatted_prompt)
-
-            raw = response.content.strip()
-
-            if raw.startswith("```"):
-                lines = [l for l in raw.split("\n") if not l.strip().startswith("```")]
-                raw = "\n".join(lines).strip()
-
-            parsed = json.loads(raw)
-            result = self._parse_clerk_task(parsed)
+            result, response = await ainvoke_structured(
+                self.llm_model,
+                trim_messages_to_budget(state.messages, AGENT_PROMPT_HISTORY_TOKEN_BUDGET) + formatted_prompt,
+                ClerkTaskOutput,
+            )
 
             final_response = list(state.final_response or [])
             final_response.append(result)
@@ -108,24 +112,17 @@ class ClerkAgent:
             }
 
 
-    # This method executes the current task using the appropriate tool based on the action type.
-    def _parse_clerk_task(self, data: dict):
-        action = data.get("action")
-        if action == "ticket_creation":
-            if data.get("details") is not None:
-                return TicketCreationClassification(**data)
-            return TicketCreationClassification(action="ticket_creation", details=None)
-        elif action == "get_balance":
-            return GetBalanceClassification(**data)
-        elif action == "general_information":
-            return GeneralInformationClassification(**data)
-        else:
-            return GetBalanceClassification(action="get_balance", details=None)
-
+    # This method checks whether a task has every detail the tool execution node needs
+    def _is_extracted(self, task: ClerkClassificationState) -> bool:
+        if task.action == "get_balance":
+            return True
+        if task.action == "general_information":
+            return task.details is not None and bool(task.details.response)
+        return task.details is not None
 
     # The tool execution node checks the final_response for the current task 
     #  executes the corresponding tool based on the action type.
-    def Clerk_Tool_Execution_Node(self, state: ClerkState) -> dict:
+    async def Clerk_Tool_Execution_Node(self, state: ClerkState) -> dict:
         if not state.final_response:
             return {}
 
@@ -138,7 +135,9 @@ class ClerkAgent:
                 while counter > 0:
                     try:
                         leave_balance_tool = make_get_leave_balance_tool(self.leave_balance_port, state.user_query.auth_token)
-                        leave_balance: int = leave_balance_tool.invoke({})
+                        leave_balance: int = await leave_balance_tool.ainvoke({})
+                        if leave_balance is None:
+                            raise ValueError("No leave balance was returned")
                         state.tool_results.append({
                             "action": "get_balance",
                             "success": True,
@@ -211,7 +210,7 @@ class ClerkAgent:
                         })
                     else:
                         ticket_creation_tool = make_ticket_creation_tool(self.ticket_creation_port, ticket_creation_date, state.user_query.auth_token)
-                        response: bool = ticket_creation_tool.invoke({})
+                        response: bool = await ticket_creation_tool.ainvoke({})
                         state.tool_results.append({
                             "action": "ticket_creation",
                             "success": response,
@@ -321,10 +320,59 @@ class ClerkAgent:
         finally:
             await redis.aclose()
 
+    # This method renders the reply from CLERK_OUTCOME_TEMPLATES when every task is a tool outcome.
+    # Returns None when a task has no tool result to describe it, the LLM then writes the reply.
+    def _render_tool_outcomes(self, state: ClerkState) -> Optional[str]:
+        tasks = list(state.final_response)
+        if not tasks or any(task.action not in ("get_balance", "ticket_creation") for task in tasks):
+            return None
+
+        balance_results = [r for r in state.tool_results if isinstance(r, dict) and r.get("action") == "get_balance"]
+        ticket_results = [r for r in state.tool_results if isinstance(r, dict) and r.get("action") == "ticket_creation"]
+        balance_tasks = sum(task.action == "get_balance" for task in tasks)
+        if (balance_tasks and not balance_results) or len(ticket_results) != len(tasks) - balance_tasks:
+            return None
+
+        # results follow the task order, the balance tool runs once per request however many tasks asked for it
+        pending_tickets = iter(ticket_results)
+        results = []
+        for task in tasks:
+            if task.action == "ticket_creation":
+                results.append(next(pending_tickets))
+            elif balance_results[0] not in results:
+                results.append(balance_results[0])
+        paragraphs = []
+        for result in results:
+            data = result.get("data") or {}
+            if hasattr(data, "model_dump"):
+                data = data.model_dump()
+            # a balance result without a balance is a failed lookup, never "0 days"
+            if result.get("success") and not (result["action"] == "get_balance" and data.get("leave_balance") is None):
+                outcome = "success"
+            elif result.get("error") == "User rejected the ticket creation.":
+                outcome = "rejected"
+            else:
+                outcome = "failed"
+            try:
+                paragraphs.append(CLERK_OUTCOME_TEMPLATES[(result["action"], outcome)].format(**data))
+            except (KeyError, ValueError) as e:
+                print(f"[Clerk] Template rendering failed, using the LLM: {e}")
+                return None
+        return "\n\n".join(paragraphs)
+
     # The final response node generates the final response to the user after all tasks have been executed. 
     # It compiles the results from the tool executions 
     # formats a response using the final response prompt. 
-    def Clerk_Final_Response_Node(self, state: ClerkState) -> dict:
+    async def Clerk_Final_Response_Node(self, state: ClerkState) -> dict:
+        # Balance checks and tickets are answered from templates, the LLM only handles free-text or mixed results
+        templated = self._render_tool_outcomes(state) if self.templated_responses else None
+        if templated is not None:
+            return {
+                "messages": [AIMessage(content=templated)],
+                "final_response": deque(),
+                "response": templated,
+            }
+
         formatted_prompt = Clerk_Final_Response_Prompt.format_messages(
             final_response=list(state.final_response),
             tool_results=state.tool_results
@@ -332,33 +380,21 @@ class ClerkAgent:
         counter = 3
         while counter > 0:
             try:
-                response = self.llm_model.invoke(list(state.messages) + formatted_prompt)
-
-                user_id = state.user_query.user_id
-                conversation_id = state.user_query.conversation_id
-                existing = get_agent_state_for_final_response(user_id, conversation_id, "Clerk")
-
-                agent_state = AgentState(
-                    user_id=user_id,
-                    key=conversation_id,
-                    agent_name="Clerk",
-                    state={
-                        **existing,
-                        "status": "completed",
-                        "final_response": response.content,
-                    }
-                )
-                save_agent_state_for_final_response(agent_state)
+                response = await self.llm_model.ainvoke(trim_messages_to_budget(state.messages, AGENT_PROMPT_HISTORY_TOKEN_BUDGET) + formatted_prompt)
                 return {
                     "messages": [AIMessage(content=response.content)],
                     "final_response": deque(),
+                    "response": response.content,
                 }
             except Exception as e:
                 print(f"[Clerk] Final response error: {type(e).__name__}: {e}")
                 counter -= 1
+                if counter > 0:
+                    await asyncio.sleep(AGENT_LLM_RETRY_BACKOFF_SECONDS * (3 - counter))
 
         return {
             "messages": [AIMessage(content="Sorry, I am unable to generate a response at the moment.")],
+            "response": "Sorry, I am unable to generate a response at the moment.",
         }
 
     
@@ -370,7 +406,15 @@ class ClerkAgent:
         clerk_graph.add_node("clerk_tool_execution_node", self.Clerk_Tool_Execution_Node)
         clerk_graph.add_node("final_response_node", self.Clerk_Final_Response_Node)
         clerk_graph.add_node("hitl_intervention_node", self.hitl_intervention_node)
-        clerk_graph.add_edge(START, "clerk_outer_model_node")
+        # Tasks handed off already classified by the Supervisor start at the decision node
+        clerk_graph.add_conditional_edges(
+            START,
+            lambda state: "decision" if state.pending_tasks else "outer",
+            {
+                "outer": "clerk_outer_model_node",
+                "decision": "clerk_decision_node"
+            }
+        )
         clerk_graph.add_edge("clerk_outer_model_node", "clerk_decision_node")
         clerk_graph.add_conditional_edges(
             "clerk_decision_node",
@@ -1,6 +1,6 @@
 from langchain_core.messages import AIMessage
 from domain.ports import LibrarianRetrievalPort, LibrarianInsertionPort, LibrarianUpdatePort
-from domain.entities import LibrarianTask
+from domain.entities import LibrarianTask, LibrarianTaskIntent
 from application.states import LibrarianState
 from domain.tools.librarian_tool import make_librarian_retrieval_tool, make_librarian_insertion_tool, make_librarian_update_tool
 from langchain_core.language_models.chat_models import BaseChatModel
@@ -11,14 +11,14 @@ except ImportError:
     display = None
 from langgraph.graph import START, END, StateGraph
 from domain.prompts.librarian_prompt import librarianPrompt, LibrarianFinalResponsePrompt
-from infrastructure.redis.redis_client import (
-    save_agent_state_for_final_response,
-    get_agent_state_for_final_response,
-    save_agent_state_for_hitl_intervention,
-)
+from infrastructure.redis.redis_client import save_agent_state_for_hitl_intervention
 from domain.entities import AgentState
+from application.services.conversation_compaction import trim_messages_to_budget
+from application.services.structured_output import ainvoke_structured
+from config import AGENT_PROMPT_HISTORY_TOKEN_BUDGET, AGENT_LLM_RETRY_BACKOFF_SECONDS
 from infrastructure.redis.redis_config import get_async_redis_client
 from infrastructure.socket.socket_manager import broadcast_hitl_event
+import asyncio
 import json
 
 #Librarian Agent Implementation
@@ -36,10 +36,10 @@ class LibrarianAgent:
         self.update_tool = make_librarian_update_tool(update_port)
 
     #Librarian model node takes the user's query and classifies it into one or more tasks for the agent to execute.
-    def librarian_model_node(self, state: LibrarianState) -> dict:
+    async def librarian_model_node(self, state: LibrarianState) -> dict:
         """
         Classifies the user request into one or more LibrarianTask objects by
-        invoking the LLM with the librarian prompt and parsing the JSON reply.
+        invoking the LLM in JSON mode with the librarian prompt.
         """
         try:
             formatted_prompt = librarianPrompt.format_messages(
@@ -48,19 +48,12 @@ class LibrarianAgent:
                 UploadedText=state.user_query.UploadedText,
             )
 
-            response = self.llm_model.invoke(list(state.messages) + formatted_prompt)
-
-            raw = response.content.strip()
-            if raw.startswith("```"):
-                lines = [l for l in raw.split("\n") if not l.strip().startswith("```")]
-                raw = "\n".join(lines).strip()
-
-            parsed = json.loads(raw)
-
-            if isinstance(parsed, dict):
-                parsed = [parsed]
-
-            tasks = [LibrarianTask(**t) for t in parsed]
+            output, response = await ainvoke_structured(
+                self.llm_model,
+                trim_messages_to_budget(state.messages, AGENT_PROMPT_HISTORY_TOKEN_BUDGET) + formatted_prompt,
+                LibrarianTaskIntent,
+            )
+            tasks = output.task
 
             return {
                 "messages": [AIMessage(content=response.content)],
@@ -99,7 +92,14 @@ class LibrarianAgent:
             if not pending_task:
                 return {}
 
-            if pending_task.action == "update_policy":
+            # tasks handed off by the Supervisor skip the model node, so admin rights are checked here as well
+            if pending_task.action in ("upload_policy", "update_policy") and not (
+                state.user_query.isAdmin and state.user_query.UploadedText
+            ):
+                pending_task.result = "Only administrators can upload or update policy documents, and a document must be attached."
+                pending_task.status = "error"
+
+            elif pending_task.action == "update_policy":
                 if pending_task.hitl_response is None:
                     pending_task.status = "waiting_for_human"
                     
@@ -115,8 +115,7 @@ class LibrarianAgent:
                 
                 if pending_task.hitl_response is True:
                     
-                    document_content = state.user_query.UploadedText or pending_task.query
-                    update_result = self.update_tool.invoke({"document_content": document_content})
+                    update_result = self.update_tool.invoke({"document_content": state.user_query.UploadedText})
                     pending_task.result = (
                         "Policy document updated successfully."
                         if update_result
@@ -141,8 +140,7 @@ class LibrarianAgent:
                 pending_task.status = "completed"
 
             elif pending_task.action == "upload_policy":   
-                document_content = state.user_query.UploadedText or pending_task.query
-                insertion_result = self.insertion_tool.invoke({"document_content": document_content})
+                insertion_result = self.insertion_tool.invoke({"document_content": state.user_query.UploadedText})
                 pending_task.result = "Policy uploaded successfully." if insertion_result else "Policy upload failed."
                 pending_task.status = "completed"
 
@@ -247,7 +245,7 @@ class LibrarianAgent:
         return result
 
     # The final response node generates the final response to the user after all tasks have been executed.
-    def librarian_final_response_node(self, state: LibrarianState) -> dict:
+    async def librarian_final_response_node(self, state: LibrarianState) -> dict:
         """
         Generates the final user-facing response after all tasks are complete.
         """
@@ -258,24 +256,7 @@ class LibrarianAgent:
         counter = 3
         while counter > 0:
             try:
-                response = self.llm_model.invoke(list(state.messages) + formatted_prompt)
-
-                user_id = state.user_query.user_id
-                conversation_id = state.user_query.conversation_id
-
-                existing = get_agent_state_for_final_response(user_id, conversation_id, "Librarian")
-                agent_state = AgentState(
-                    user_id=user_id,
-                    key=conversation_id,
-                    agent_name="Librarian",
-                    state={
-                        **(existing or {}),
-                        "status": "completed",
-                        "final_response": response.content,
-                    },
-                )
-                save_agent_state_for_final_response(agent_state)
-
+                response = await self.llm_model.ainvoke(trim_messages_to_budget(state.messages, AGENT_PROMPT_HISTORY_TOKEN_BUDGET) + formatted_prompt)
                 return {
                     "messages": [AIMessage(content=response.content)],
                     "response": response.content,
@@ -283,10 +264,13 @@ class LibrarianAgent:
             except Exception as e:
                 print(f"[Librarian] Final response error: {type(e).__name__}: {e}. Retrying…")
                 counter -= 1
+                if counter > 0:
+                    await asyncio.sleep(AGENT_LLM_RETRY_BACKOFF_SECONDS * (3 - counter))
 
         print("[Librarian] Failed to generate final response after multiple attempts.")
         return {
             "messages": [AIMessage(content="Sorry, I am unable to generate a response at the moment.")],
+            "response": "Sorry, I am unable to generate a response at the moment.",
         }
 
     
@@ -301,7 +285,15 @@ class LibrarianAgent:
         librarian_graph.add_node("hitl_node", self.librarian_hitl_node)
         librarian_graph.add_node("final_response", self.librarian_final_response_node)
 
-        librarian_graph.add_edge(START, "model_node")
+        # Tasks handed off already classified by the Supervisor start at the decision node
+        librarian_graph.add_conditional_edges(
+            START,
+            lambda state: "decision_node" if state.action else "model_node",
+            {
+                "model_node": "model_node",
+                "decision_node": "decision_node",
+            },
+        )
         librarian_graph.add_edge("model_node", "decision_node")
         librarian_graph.add_conditional_edges(
             "decision_node",
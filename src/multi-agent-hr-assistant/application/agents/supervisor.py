@@ -3,11 +3,15 @@ from domain.prompts.supervisor_prompt import SupervisorDecompositionPrompt,Super
 from domain.tools.supervisor_tool import make_supervisor_execute_clerk_graph_tool, make_supervisor_execute_librarian_graph_tool
 from application.states import LibrarianState, SupervisorState,ClerkState
 from langchain_core.language_models.chat_models import BaseChatModel
-from infrastructure.redis.redis_client import get_agent_state_for_final_response
-from domain.entities import SupervisorTaskIntent, TaskIntent
+from domain.entities import SupervisorTaskIntent, TaskIntent, LibrarianTask, UserQuery, GetBalanceClassification, TicketCreationClassification, GeneralInformationClassification
 from langchain_core.messages import AIMessage, HumanMessage
-from domain.intents import SUPERVISOR_ONLY_INTENTS
-from domain.ports import ClerkGraphExecutionPort, LibrarianGraphExecutionPort
+from domain.intents import SUPERVISOR_ONLY_INTENTS, LIBRARIAN_ADMIN_ACTIONS
+from application.services.structured_output import ainvoke_structured
+from domain.ports import ClerkGraphExecutionPort, LibrarianGraphExecutionPort, IntentRouterPort, DecompositionCachePort
+from typing import Optional
+from config import SYNTHESIS_POLICY
+from collections import deque
+import asyncio
 import json
 try:
     from IPython.display import Image,display
@@ -15,47 +19,62 @@ except ImportError:
     Image=None
     display=None
 
+#Clerk task built from each pre-classified Clerk action, details are filled in by the Clerk
+CLERK_HAND_OFF={
+    "get_balance":GetBalanceClassification,
+    "ticket_creation":TicketCreationClassification,
+    "general_information":GeneralInformationClassification,
+}
+
 #Supervisor Agent Implementation
 class SupervisorAgent:
-    def __init__(self,llm_model:BaseChatModel,SupervisorClerkGraphExecutorPort:ClerkGraphExecutionPort,SupervisorLibrarianGraphExecutorPort:LibrarianGraphExecutionPort):
+    def __init__(self,llm_model:BaseChatModel,SupervisorClerkGraphExecutorPort:ClerkGraphExecutionPort,SupervisorLibrarianGraphExecutorPort:LibrarianGraphExecutionPort,intent_router:Optional[IntentRouterPort]=None,decomposition_cache:Optional[DecompositionCachePort]=None,synthesis_policy:str=SYNTHESIS_POLICY):
         self.llm_model=llm_model
         self.SupervisorClerkGraphExecutorPort=SupervisorClerkGraphExecutorPort
         self.SupervisorLibrarianGraphExecutorPort=SupervisorLibrarianGraphExecutorPort
+        self.intent_router=intent_router
+        self.decomposition_cache=decomposition_cache
+        self.synthesis_policy=synthesis_policy
     
     async def decompose_query_into_tasks(self, state: SupervisorState) -> dict:
         """
         This method takes the user's query and decomposes it into specific tasks with associated intents and agents. 
          It uses a structured output prompt to ensure the response is in a predictable format that can be parsed.
         """
+        query=state.user_query.query
+        is_admin=bool(state.user_query.isAdmin)
+        has_uploaded_text=bool(state.user_query.UploadedText)
         try:
+            # Repeated queries reuse an earlier decomposition, queries with uploaded text are never cached
+            if self.decomposition_cache:
+                cached_tasks = await self.decomposition_cache.get(query, is_admin, has_uploaded_text)
+                if cached_tasks:
+                    return {
+                        "messages": [],
+                        "identified_intent": cached_tasks
+                    }
+
+            # Short single-intent queries are routed locally and skip the decomposition LLM call.
+            # Uploaded documents and admin requests always need the full decomposition.
+            if self.intent_router and not state.user_query.UploadedText and not state.user_query.isAdmin:
+                routed = await self.intent_router.route(state.user_query.query)
+                if routed is not None:
+                    return {
+                        "messages": [],
+                        "identified_intent": routed.task
+                    }
+
             formatted_prompt = SupervisorDecompositionPrompt.format_messages(
                 query=state.user_query.query,
                 isUploaded=state.user_query.UploadedText or "None",
                 isAdmin=state.user_query.isAdmin or False
             )
 
-            response = await self.llm_model.ainvoke(formatted_prompt)
-            # print(f"[decompose] raw response type : {type(response)}")
-            # print(f"[decompose] raw response content: '{response.content}'")
-            # print(f"[decompose] response_metadata  : {getattr(response, 'response_metadata', {})}")
-
-            raw = response.content.strip()
-
-            if not raw:
-                raise ValueError(
-                    "Model returned an empty response. "
-                    f"response_metadata={getattr(response, 'response_metadata', {})}"
-                )
-
-            if raw.startswith("```"):
-                lines = raw.split("\n")
-                lines = [l for l in lines if not l.strip().startswith("```")]
-                raw = "\n".join(lines).strip()
-
-            parsed = json.loads(raw)
-            result = SupervisorTaskIntent(**parsed)
+            result, response = await ainvoke_structured(self.llm_model, formatted_prompt, SupervisorTaskIntent)
 
             print(f"[decompose] parsed result: {result}")
+            if self.decomposition_cache:
+                await self.decomposition_cache.set(query, is_admin, has_uploaded_text, result.task)
             return {
                 "messages": [AIMessage(content=response.content)],
                 "identified_intent": result.task
@@ -84,15 +103,100 @@ class SupervisorAgent:
             next_steps="tool_node"
         return {"next_steps": next_steps}
 
-    # This tool node executes the pending tasks by invoking the appropriate tools based on the agent 
-    # specified in each task.
+    # This tool node schedules the pending tasks as a dependency graph.
+    # A task starts as soon as every task in its depends_on has completed, so independent branches run
+    # concurrently. Tasks for the same agent never overlap because they share the agent's HITL channel.
+    # Results stay in the order of identified_intent.
     async def Supervisor_tool_node(self,state:SupervisorState)->dict:
         pending_tasks=[intent for intent in state.identified_intent if intent.status=="pending"]
 
         if not pending_tasks:
             return {}
 
-        tasks=pending_tasks[0]
+        #ids are assigned and checked for uniqueness by SupervisorTaskIntent
+        tasks_by_id={task.id:task for task in state.identified_intent if task.id}
+        agent_locks:dict[str,asyncio.Lock]={}
+        running:dict[asyncio.Task,TaskIntent]={}
+
+        while True:
+            self._fail_blocked_tasks(pending_tasks,tasks_by_id)
+            ready=[
+                task for task in pending_tasks
+                if task.status=="pending" and all(tasks_by_id[dep].status=="completed" for dep in task.depends_on)
+            ]
+            for task in ready:
+                task.status="running"
+                lock=agent_locks.setdefault(self._execution_group(task),asyncio.Lock())
+                upstream=[tasks_by_id[dep] for dep in task.depends_on]
+                running[asyncio.create_task(self._execute_task_with_lock(state,task,lock,upstream))]=task
+
+            if not running:
+                break
+            done,_=await asyncio.wait(running,return_when=asyncio.FIRST_COMPLETED)
+            for finished in done:
+                running.pop(finished)
+
+        #anything still pending waits on itself through a dependency cycle
+        for task in pending_tasks:
+            if task.status=="pending":
+                task.status="error"
+                task.result="This task could not run because of a circular dependency between tasks."
+
+        return {"identified_intent": state.identified_intent}
+
+    # Marks pending tasks whose dependencies are unknown or failed as errors, so they are never started
+    def _fail_blocked_tasks(self,pending_tasks:list[TaskIntent],tasks_by_id:dict[str,TaskIntent])->None:
+        for task in pending_tasks:
+            if task.status!="pending":
+                continue
+            for dep in task.depends_on:
+                upstream=tasks_by_id.get(dep)
+                if upstream is None:
+                    task.status="error"
+                    task.result=f"This task depends on an unknown task '{dep}'."
+                    break
+                if upstream.status=="error":
+                    task.status="error"
+                    task.result=f"This task was skipped because the task it depends on ({dep}) failed."
+                    break
+
+    # Clerk and Librarian tasks are grouped per agent, Supervisor-only tasks are independent LLM calls
+    def _execution_group(self,task:TaskIntent)->str:
+        normalized_agent=(task.agent or "").strip().lower()
+        if normalized_agent in ("clerk","librarian") and task.intent not in SUPERVISOR_ONLY_INTENTS:
+            return normalized_agent
+        return f"task:{id(task)}"
+
+    async def _execute_task_with_lock(self,state:SupervisorState,task:TaskIntent,lock:asyncio.Lock,upstream:list[TaskIntent])->None:
+        async with lock:
+            await self._execute_task(state,task,self._query_with_upstream_results(task,upstream))
+
+    # Dependent tasks receive the results of the tasks they depend on along with their own query
+    def _query_with_upstream_results(self,task:TaskIntent,upstream:list[TaskIntent])->str:
+        if not upstream:
+            return task.decomposed_query
+        results="\n".join(f"- {dep.decomposed_query}: {dep.result}" for dep in upstream)
+        return f"{task.decomposed_query}\n\nResults of the earlier steps:\n{results}"
+
+    # These methods turn a pre-classified action into the first task of the agent, which then starts
+    # at its decision node instead of classifying the query again.
+    def _clerk_hand_off(self,task:TaskIntent)->deque:
+        if task.action not in CLERK_HAND_OFF:
+            return deque()
+        return deque([CLERK_HAND_OFF[task.action](action=task.action)])
+
+    # Policy changes are only handed off for admins with an uploaded document, otherwise the Librarian
+    # classifies the query itself and its prompt applies the admin rules.
+    def _librarian_hand_off(self,task:TaskIntent,agent_query:str,user_query:UserQuery)->list[LibrarianTask]:
+        if not task.action:
+            return []
+        if task.action in LIBRARIAN_ADMIN_ACTIONS and not (user_query.isAdmin and user_query.UploadedText):
+            return []
+        return [LibrarianTask(action=task.action,query=agent_query)]
+
+    # This method executes a single task with the appropriate agent, errors are recorded on the task
+    # so that they never affect the other tasks of the step.
+    async def _execute_task(self,state:SupervisorState,tasks:TaskIntent,agent_query:str)->None:
         tasks.status="running"
         try:
             normalized_agent=(tasks.agent or "").strip().lower()
@@ -102,7 +206,7 @@ class SupervisorAgent:
 
                 clean_messages = [
                     GENERAL_CHAT_SYSTEM_PROMPT,
-                    HumanMessage(content=tasks.decomposed_query)
+                    HumanMessage(content=agent_query)
                 ]
                 response=await self.llm_model.ainvoke(clean_messages)
                 tasks.status="completed"
@@ -110,25 +214,21 @@ class SupervisorAgent:
 
             elif normalized_agent=="clerk":
                 state.active_agent="Clerk"
-                updated_query=state.user_query.model_copy(update={"query":tasks.decomposed_query})
-                clerk_state=ClerkState(user_query=updated_query)
-                self.SupervisorClerkGraphExecutorPort.update_clerk_state(clerk_state)
-                clerk_graph_executor=make_supervisor_execute_clerk_graph_tool(self.SupervisorClerkGraphExecutorPort)
-                await clerk_graph_executor.ainvoke({})
-                clerk_result_state=get_agent_state_for_final_response(state.user_query.user_id,state.user_query.conversation_id,"Clerk")
+                updated_query=state.user_query.model_copy(update={"query":agent_query})
+                clerk_state=ClerkState(user_query=updated_query,messages=list(state.conversation_context),pending_tasks=self._clerk_hand_off(tasks))
+                clerk_graph_executor=make_supervisor_execute_clerk_graph_tool(self.SupervisorClerkGraphExecutorPort,clerk_state)
+                clerk_response=await clerk_graph_executor.ainvoke({})
                 tasks.status="completed"
-                tasks.result=clerk_result_state.get("final_response","") if clerk_result_state else ""
+                tasks.result=clerk_response or ""
 
             elif normalized_agent=="librarian":
                 state.active_agent="Librarian"
-                updated_query=state.user_query.model_copy(update={"query":tasks.decomposed_query})
-                librarian_state=LibrarianState(user_query=updated_query)
-                self.SupervisorLibrarianGraphExecutorPort.update_librarian_state(librarian_state)
-                librarian_graph_executor=make_supervisor_execute_librarian_graph_tool(self.SupervisorLibrarianGraphExecutorPort)
-                await librarian_graph_executor.ainvoke({})
-                librarian_result_state=get_agent_state_for_final_response(state.user_query.user_id,state.user_query.conversation_id,"Librarian")
+                updated_query=state.user_query.model_copy(update={"query":agent_query})
+                librarian_state=LibrarianState(user_query=updated_query,messages=list(state.conversation_context),action=self._librarian_hand_off(tasks,agent_query,state.user_query))
+                librarian_graph_executor=make_supervisor_execute_librarian_graph_tool(self.SupervisorLibrarianGraphExecutorPort,librarian_state)
+                librarian_response=await librarian_graph_executor.ainvoke({})
                 tasks.status="completed"
-                tasks.result=librarian_result_state.get("final_response","") if librarian_result_state else ""
+                tasks.result=librarian_response or ""
 
             else:
                 raise ValueError(f"Unsupported agent '{tasks.agent}' for intent '{tasks.intent}'")
@@ -138,21 +238,35 @@ class SupervisorAgent:
             tasks.status="error"
             tasks.result=str(e)
 
-        return {"identified_intent": state.identified_intent}
+    # This method decides whether the task results can be shown without the synthesis LLM call.
+    # Returns the response to send as it is, or None when synthesis is needed.
+    def _pass_through_response(self,all_tasks:list[TaskIntent])->Optional[str]:
+        if all(t.intent in SUPERVISOR_ONLY_INTENTS for t in all_tasks):
+            return next(
+                (t.result for t in all_tasks if t.result),
+                "I'm here to help! How can I assist you with HR matters?"
+            )
+        if self.synthesis_policy=="always":
+            return None
+
+        #a single Clerk or Librarian answer is already written for the user by its own final node
+        if len(all_tasks)==1 and all_tasks[0].status=="completed" and all_tasks[0].result:
+            return all_tasks[0].result
+        if self.synthesis_policy=="never":
+            return "\n\n".join(
+                t.result if t.status=="completed" and t.result
+                else f"I wasn't able to complete your request: {t.decomposed_query}"
+                for t in all_tasks
+            )
+        return None
 
     # This result node checks if all tasks are completed and then generates the final response to the user.
     async def Supervisor_result_node(self,state:SupervisorState)->dict:
         try:
             all_tasks = state.identified_intent
 
-            all_supervisor_only = all(
-                t.intent in SUPERVISOR_ONLY_INTENTS for t in all_tasks
-            )
-            if all_supervisor_only:
-                direct_response = next(
-                    (t.result for t in all_tasks if t.result),
-                    "I'm here to help! How can I assist you with HR matters?"
-                )
+            direct_response=self._pass_through_response(all_tasks)
+            if direct_response is not None:
                 return {
                     "messages": [AIMessage(content=direct_response)],
                     "final_response": direct_response
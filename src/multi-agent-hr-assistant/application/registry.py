@@ -0,0 +1,108 @@
+from typing import Optional
+from langgraph.graph.state import CompiledStateGraph
+from application.agents.supervisor import SupervisorAgent
+from application.services.ingestion import IngestionService
+from application.services.conversation_compaction import ConversationCompactor
+from application.services.intent_router import EmbeddingIntentRouter
+from infrastructure.llm_providers.groq_provider import create_model_instance
+from infrastructure.adapters.supervisor_clerk_graph_executor import SupervisorClerkGraphExecutor
+from infrastructure.adapters.Supervisor_librarian_graph_executor import SupervisorLibrarianGraphExecutor
+from infrastructure.adapters.clerk_leave_balance_adapter import ClerkLeaveBalanceAdapter
+from infrastructure.adapters.clerk_ticket_creation_adapter import ClerkTicketCreationAdapter
+from infrastructure.adapters.librarian_retrieval_adapter import LibrarianRetrievalAdapter
+from infrastructure.adapters.librarian_insertion_adapter import LibrarianInsertionAdapter
+from infrastructure.adapters.librarian_updation_adapter import LibrarianUpdateAdapter
+from infrastructure.adapters.chroma_store import ChromaVectorStore
+from infrastructure.adapters.redis_store import RedisDocumentStore
+from infrastructure.adapters.redis_summary_store import RedisConversationSummaryStore
+from infrastructure.adapters.decomposition_cache import RedisDecompositionCache
+from infrastructure.vector_store.chroma_client import get_vector_store_provider
+from config import INTENT_ROUTER_ENABLED, DECOMPOSITION_CACHE_ENABLED
+from domain.ports import ClerkGraphExecutionPort, LibrarianGraphExecutionPort
+
+#Process-wide registry holding the LLM clients, adapters and compiled agent graphs.
+#It is built once when the application starts so that requests only carry their own state.
+class AgentRegistry:
+    def __init__(self):
+        #LLM clients for each agent
+        self.supervisor_llm_model=create_model_instance()
+        self.clerk_llm_model=create_model_instance("openai/gpt-oss-20b")
+        self.librarian_llm_model=create_model_instance("llama-3.3-70b-versatile")
+
+        #Clerk adapters and executor, the executor compiles the Clerk graph once
+        self.leave_balance_port=ClerkLeaveBalanceAdapter()
+        self.ticket_creation_port=ClerkTicketCreationAdapter()
+        self.clerk_executor:ClerkGraphExecutionPort=SupervisorClerkGraphExecutor(
+            self.clerk_llm_model,
+            self.leave_balance_port,
+            self.ticket_creation_port,
+        )
+
+        #Shared embedding model and Chroma handle, injected into every vector store port
+        self.vector_store_provider=get_vector_store_provider()
+        self.vector_store_provider.start()
+        vector_store=self.vector_store_provider.get_vector_store()
+
+        #Librarian adapters and executor, the executor compiles the Librarian graph once
+        self.chroma_store=ChromaVectorStore(vector_store)
+        self.redis_store=RedisDocumentStore()
+        self.ingestion_service=IngestionService(self.redis_store,self.chroma_store)
+        self.retrieval_port=LibrarianRetrievalAdapter(vector_store)
+        self.insertion_port=LibrarianInsertionAdapter(self.ingestion_service)
+        self.updation_port=LibrarianUpdateAdapter(self.ingestion_service)
+        self.librarian_executor:LibrarianGraphExecutionPort=SupervisorLibrarianGraphExecutor(
+            self.librarian_llm_model,
+            self.retrieval_port,
+            self.insertion_port,
+            self.updation_port,
+        )
+
+        #Embedding intent router sharing the loaded embedding model, the exemplars are embedded once here
+        self.intent_router=None
+        if INTENT_ROUTER_ENABLED:
+            self.intent_router=EmbeddingIntentRouter(self.vector_store_provider.get_embedding_model())
+            self.intent_router.warm_up()
+
+        #Decomposition cache shared by every request of this process
+        self.decomposition_cache=RedisDecompositionCache() if DECOMPOSITION_CACHE_ENABLED else None
+
+        #Supervisor agent and its compiled graph
+        self.supervisor_agent=SupervisorAgent(
+            self.supervisor_llm_model,
+            self.clerk_executor,
+            self.librarian_executor,
+            intent_router=self.intent_router,
+            decomposition_cache=self.decomposition_cache,
+        )
+        self.supervisor_graph:CompiledStateGraph=self.supervisor_agent.create_supervisor_agent_graph()
+
+        #Rolling conversation summary used to cap the history sent to the agents
+        self.conversation_compactor=ConversationCompactor(self.supervisor_llm_model,RedisConversationSummaryStore())
+
+    #function to release process-wide resources on shutdown
+    def close(self)->None:
+        self.conversation_compactor.close()
+        self.vector_store_provider.close()
+
+
+_agent_registry:Optional[AgentRegistry]=None
+
+#function to build the registry, called once from the FastAPI startup hook
+def init_agent_registry()->AgentRegistry:
+    global _agent_registry
+    if _agent_registry is None:
+        _agent_registry=AgentRegistry()
+    return _agent_registry
+
+#function to get the registry built at startup
+def get_agent_registry()->AgentRegistry:
+    if _agent_registry is None:
+        raise RuntimeError("Agent registry has not been initialised. Call init_agent_registry() on startup.")
+    return _agent_registry
+
+#function to release the registry, called from the FastAPI shutdown hook
+def close_agent_registry()->None:
+    global _agent_registry
+    if _agent_registry is not None:
+        _agent_registry.close()
+        _agent_registry=None
@@ -0,0 +1,142 @@
+import asyncio
+from typing import Optional, Sequence
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+from domain.ports import ConversationSummaryPort
+from domain.prompts.conversation_prompt import ConversationSummaryPrompt
+from config import CONTEXT_RECENT_MESSAGES, CONTEXT_TOKEN_BUDGET
+
+SUMMARY_PREFIX="Summary of the earlier conversation:\n"
+
+#function to approximate the number of tokens in a text, about four characters per token
+def estimate_tokens(text:str)->int:
+    return (len(text or "")+3)//4
+
+#function to keep the newest messages that fit in the token budget.
+#A leading conversation summary is always kept so agents never lose the older context.
+def trim_messages_to_budget(messages:Sequence[BaseMessage], token_budget:int)->list[BaseMessage]:
+    """
+    Keep the most recent messages whose combined size fits in the token budget.
+    args:
+        messages (Sequence[BaseMessage]): Messages ordered oldest first.
+        token_budget (int): Approximate number of tokens allowed.
+    returns:
+        list[BaseMessage]: The kept messages, oldest first.
+    """
+    messages=list(messages)
+    head=[]
+    if messages and isinstance(messages[0],SystemMessage) and messages[0].content.startswith(SUMMARY_PREFIX):
+        head=[messages.pop(0)]
+        token_budget-=estimate_tokens(head[0].content)
+
+    kept=[]
+    for message in reversed(messages):
+        cost=estimate_tokens(message.content if isinstance(message.content,str) else str(message.content))
+        if cost>token_budget:
+            break
+        token_budget-=cost
+        kept.append(message)
+    return head+list(reversed(kept))
+
+#function to convert a stored chat message row into a LangChain message
+def _to_message(row:dict)->BaseMessage:
+    if row.get("type")=="user":
+        return HumanMessage(content=row.get("content") or "")
+    return AIMessage(content=row.get("content") or "")
+
+#Compacts a conversation into a rolling summary plus the last few turns.
+#Older turns are folded into the stored summary in the background after the response is sent,
+#so the request path only reads the summary.
+class ConversationCompactor:
+    def __init__(
+        self,
+        llm_model:BaseChatModel,
+        summary_store:ConversationSummaryPort,
+        recent_messages:int=CONTEXT_RECENT_MESSAGES,
+        token_budget:int=CONTEXT_TOKEN_BUDGET,
+    ):
+        self.llm_model=llm_model
+        self.summary_store=summary_store
+        self.recent_messages=recent_messages
+        self.token_budget=token_budget
+        self._refresh_tasks:dict[str,asyncio.Task]={}
+
+    #function to split the history into rows not yet covered by the summary
+    def _unsummarized(self,history:list[dict],until:Optional[str])->list[dict]:
+        if not until:
+            return list(history)
+        return [row for row in history if (row.get("created_at") or "")>until]
+
+    async def build_context(self,conversation_id:str,history:list[dict])->list[BaseMessage]:
+        """
+        Build the conversation context sent to the agents: the rolling summary followed by the last turns.
+        args:
+            conversation_id (str): Unique identifier of the conversation.
+            history (list[dict]): Stored chat message rows, oldest first.
+        returns:
+            list[BaseMessage]: Summary message (if any) followed by the recent turns, within the token budget.
+        """
+        stored=await self.summary_store.get_summary(conversation_id)
+        pending=self._unsummarized(history,stored.get("until"))
+        recent=pending[-self.recent_messages:] if self.recent_messages>0 else []
+
+        messages=[_to_message(row) for row in recent]
+        if stored.get("summary"):
+            messages.insert(0,SystemMessage(content=SUMMARY_PREFIX+stored["summary"]))
+        return trim_messages_to_budget(messages,self.token_budget)
+
+    async def refresh_summary(self,conversation_id:str,history:list[dict])->bool:
+        """
+        Fold the turns that fell out of the recent window into the stored summary.
+        args:
+            conversation_id (str): Unique identifier of the conversation.
+            history (list[dict]): Stored chat message rows, oldest first.
+        returns:
+            bool: True if the summary was updated, False if there was nothing to fold or it failed.
+        """
+        try:
+            stored=await self.summary_store.get_summary(conversation_id)
+            pending=self._unsummarized(history,stored.get("until"))
+            older=pending[:-self.recent_messages] if self.recent_messages>0 else pending
+            if not older:
+                return False
+
+            turns="\n".join(
+                f"{'User' if row.get('type')=='user' else 'Assistant'}: {row.get('content')}" for row in older
+            )
+            formatted_prompt=ConversationSummaryPrompt.format_messages(
+                summary=stored.get("summary") or "None",
+                turns=turns,
+            )
+            response=await self.llm_model.ainvoke(formatted_prompt)
+            summary=response.content.strip()
+            if not summary:
+                return False
+            return await self.summary_store.save_summary(conversation_id,summary,older[-1].get("created_at"))
+        except Exception as e:
+            print(f"Error refreshing conversation summary: {e}")
+            return False
+
+    def schedule_refresh(self,conversation_id:str,history:list[dict])->None:
+        """
+        Refresh the summary in the background, at most one refresh runs per conversation at a time.
+        args:
+            conversation_id (str): Unique identifier of the conversation.
+            history (list[dict]): Stored chat message rows, oldest first.
+        """
+        running=self._refresh_tasks.get(conversation_id)
+        if running is not None and not running.done():
+            return
+        task=asyncio.create_task(self.refresh_summary(conversation_id,history))
+        self._refresh_tasks[conversation_id]=task
+        task.add_done_callback(lambda done: self._forget_refresh(conversation_id,done))
+
+    def _forget_refresh(self,conversation_id:str,task:asyncio.Task)->None:
+        if self._refresh_tasks.get(conversation_id) is task:
+            del self._refresh_tasks[conversation_id]
+
+    #function to cancel the background refreshes on shutdown
+    def close(self)->None:
+        for task in list(self._refresh_tasks.values()):
+            task.cancel()
+        self._refresh_tasks.clear()
@@ -0,0 +1,90 @@
+import asyncio
+import math
+import re
+import threading
+from typing import Optional
+from langchain_core.embeddings import Embeddings
+from domain.entities import SupervisorTaskIntent, TaskIntent
+from domain.intents import INTENT_ACTIONS, INTENT_AGENTS, INTENT_EXEMPLARS
+from domain.ports import IntentRouterPort
+from config import INTENT_ROUTER_THRESHOLD, INTENT_ROUTER_MARGIN, INTENT_ROUTER_MAX_WORDS
+
+#queries that look like they contain more than one request are always decomposed by the LLM
+MULTI_INTENT_PATTERN=re.compile(r"\b(and|also|then|plus|as well as)\b|\?.*\?",re.IGNORECASE)
+
+#function to scale a vector to unit length so cosine similarity is a dot product
+def _normalize(vector:list[float])->list[float]:
+    norm=math.sqrt(sum(v*v for v in vector)) or 1.0
+    return [v/norm for v in vector]
+
+#Routes short single-intent queries by comparing their embedding with labeled exemplars.
+#It only answers when the best intent clears the threshold and beats the runner-up by the margin.
+class EmbeddingIntentRouter(IntentRouterPort):
+    def __init__(
+        self,
+        embedding_model:Embeddings,
+        exemplars:dict[str,list[str]]=INTENT_EXEMPLARS,
+        threshold:float=INTENT_ROUTER_THRESHOLD,
+        margin:float=INTENT_ROUTER_MARGIN,
+        max_words:int=INTENT_ROUTER_MAX_WORDS,
+    ):
+        self.embedding_model=embedding_model
+        self.exemplars=exemplars
+        self.threshold=threshold
+        self.margin=margin
+        self.max_words=max_words
+        self._lock=threading.Lock()
+        self._index:Optional[list[tuple[str,list[float]]]]=None
+
+    def warm_up(self)->None:
+        """
+        Embed the exemplars once, safe to call more than once.
+        """
+        if self._index is not None:
+            return
+        with self._lock:
+            if self._index is not None:
+                return
+            labels=[intent for intent,texts in self.exemplars.items() for _ in texts]
+            texts=[text for texts in self.exemplars.values() for text in texts]
+            vectors=self.embedding_model.embed_documents(texts)
+            self._index=[(label,_normalize(vector)) for label,vector in zip(labels,vectors)]
+
+    #function to score every intent by its closest exemplar, returns (intent, score) sorted best first
+    def classify(self,query:str)->list[tuple[str,float]]:
+        self.warm_up()
+        query_vector=_normalize(self.embedding_model.embed_query(query))
+        scores:dict[str,float]={}
+        for label,vector in self._index:
+            score=sum(q*v for q,v in zip(query_vector,vector))
+            if score>scores.get(label,-1.0):
+                scores[label]=score
+        return sorted(scores.items(),key=lambda item: item[1],reverse=True)
+
+    async def route(self,query:str)->Optional[SupervisorTaskIntent]:
+        query=(query or "").strip()
+        if not query or len(query.split())>self.max_words or MULTI_INTENT_PATTERN.search(query):
+            return None
+        try:
+            ranked=await asyncio.to_thread(self.classify,query)
+        except Exception as e:
+            print(f"Intent router failed, falling back to decomposition: {e}")
+            return None
+        if not ranked:
+            return None
+
+        intent,best=ranked[0]
+        runner_up=ranked[1][1] if len(ranked)>1 else -1.0
+        if best<self.threshold or best-runner_up<self.margin:
+            return None
+
+        return SupervisorTaskIntent(task=[
+            TaskIntent(
+                agent=INTENT_AGENTS[intent],
+                intent=intent,
+                decomposed_query=query,
+                action=INTENT_ACTIONS.get(intent),
+                status="pending",
+                result=None,
+            )
+        ])
@@ -0,0 +1,104 @@
+import asyncio
+from typing import Awaitable, Callable, Optional
+from infrastructure.redis.job_queue import dequeue_job, update_job
+from config import JOB_WORKER_CONCURRENCY, JOB_SHUTDOWN_TIMEOUT_SECONDS, JOB_DEQUEUE_RETRY_BACKOFF_SECONDS, JOB_DEQUEUE_MAX_BACKOFF_SECONDS
+
+#Pool of worker coroutines consuming the Redis job queue.
+#Each job payload is handed to the handler, its status is updated in Redis and pushed through notify.
+class JobWorkerPool:
+    def __init__(
+        self,
+        handler:Callable[[dict],Awaitable[str]],
+        notify:Optional[Callable[[dict],Awaitable[None]]]=None,
+        concurrency:int=JOB_WORKER_CONCURRENCY,
+        retry_backoff:float=JOB_DEQUEUE_RETRY_BACKOFF_SECONDS,
+        max_backoff:float=JOB_DEQUEUE_MAX_BACKOFF_SECONDS,
+    ):
+        self.handler=handler
+        self.notify=notify
+        self.concurrency=concurrency
+        self.retry_backoff=retry_backoff
+        self.max_backoff=max_backoff
+        self._workers:list[asyncio.Task]=[]
+        self._running_jobs:set[asyncio.Task]=set()
+        self._stopping=False
+
+    def start(self)->None:
+        self._stopping=False
+        if not self._workers:
+            self._workers=[asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+
+    async def _publish(self,job_id:str,**fields)->None:
+        job=await update_job(job_id,**fields)
+        if self.notify and job:
+            try:
+                await self.notify(job)
+            except Exception as e:
+                print(f"Error notifying job update for {job_id}: {e}")
+
+    async def _worker(self)->None:
+        failures=0
+        while not self._stopping:
+            try:
+                item=await dequeue_job()
+            except Exception as e:
+                failures+=1
+                delay=min(self.retry_backoff*(2**(failures-1)),self.max_backoff)
+                print(f"Error dequeuing job (attempt {failures}), retrying in {delay:.1f}s:", str(e) or type(e).__name__)
+                await asyncio.sleep(delay)
+                continue
+            failures=0
+            if item is None:
+                continue
+            job=asyncio.create_task(self.run_job(item["job_id"],item["payload"]))
+            self._running_jobs.add(job)
+            try:
+                #shielded so that stopping the pool lets the current job finish
+                await asyncio.shield(job)
+            except asyncio.CancelledError:
+                if not job.done():
+                    raise
+            finally:
+                if job.done():
+                    self._running_jobs.discard(job)
+
+    async def run_job(self,job_id:str,payload:Optional[dict])->None:
+        """
+        Run one job and record its outcome.
+        args:
+            job_id (str): Unique identifier of the job.
+            payload (Optional[dict]): Payload submitted with the job, None if it expired in the queue.
+        """
+        if payload is None:
+            await self._publish(job_id,status="failed",error="The job expired before a worker could run it")
+            return
+        await self._publish(job_id,status="running")
+        try:
+            result=await self.handler(payload)
+            await self._publish(job_id,status="completed",result=result)
+        except asyncio.CancelledError:
+            await self._publish(job_id,status="failed",error="The job was interrupted by a server shutdown")
+            raise
+        except Exception as e:
+            print(f"Error running job {job_id}: {e}")
+            await self._publish(job_id,status="failed",error="Failed to process the query")
+
+    async def close(self,timeout:float=JOB_SHUTDOWN_TIMEOUT_SECONDS)->None:
+        """
+        Stop taking new jobs and give running jobs up to the timeout to finish, called on shutdown.
+        args:
+            timeout (float): Maximum number of seconds to wait for running jobs.
+        """
+        self._stopping=True
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers,return_exceptions=True)
+        self._workers=[]
+
+        running=[job for job in self._running_jobs if not job.done()]
+        if running:
+            _,pending=await asyncio.wait(running,timeout=timeout)
+            for job in pending:
+                job.cancel()
+            await asyncio.gather(*pending,return_exceptions=True)
+        self._running_jobs.clear()
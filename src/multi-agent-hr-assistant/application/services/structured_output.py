@@ -0,0 +1,96 @@
+import json
+from functools import lru_cache
+from typing import Any, Sequence
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from pydantic import TypeAdapter
+from config import STRUCTURED_OUTPUT_JSON_MODE, STRUCTURED_OUTPUT_REPAIR_RETRIES
+
+#request kwargs that switch the provider to JSON mode, the reply is then always a single JSON object
+JSON_MODE_KWARGS={"response_format":{"type":"json_object"}}
+
+REPAIR_PROMPT=(
+    "Your previous reply could not be used: {error}\n"
+    "Reply again with ONLY a JSON object that matches this JSON schema, no markdown and no explanation:\n{schema}"
+)
+
+#Raised when the reply still does not match the schema after the repair retries
+class StructuredOutputError(ValueError):
+    pass
+
+@lru_cache(maxsize=None)
+def _type_adapter(schema:Any)->TypeAdapter:
+    return TypeAdapter(schema)
+
+#function to remove markdown code fences some models still wrap around JSON
+def _strip_code_fences(raw:str)->str:
+    raw=raw.strip()
+    if raw.startswith("```"):
+        lines=[l for l in raw.split("\n") if not l.strip().startswith("```")]
+        raw="\n".join(lines).strip()
+    return raw
+
+def parse_structured_output(content:str,schema:Any)->Any:
+    """
+    Parse a model reply and validate it against a Pydantic model or type.
+    args:
+        content (str): Text content of the model reply.
+        schema (Any): Pydantic model or type the reply must match.
+    returns:
+        Any: The validated value.
+    """
+    raw=_strip_code_fences(content or "")
+    if not raw:
+        raise ValueError("Model returned an empty response")
+    return _type_adapter(schema).validate_python(json.loads(raw))
+
+#Groq rejects JSON mode generations that are not valid JSON with a json_validate_failed error, those are repaired too
+def _is_json_mode_failure(error:Exception)->bool:
+    return "json_validate_failed" in str(error)
+
+def _repair_messages(messages:Sequence[BaseMessage],content:str,error:Exception,schema:Any)->list[BaseMessage]:
+    repaired=list(messages)
+    if content:
+        repaired.append(AIMessage(content=content))
+    repaired.append(HumanMessage(content=REPAIR_PROMPT.format(
+        error=str(error)[:500],
+        schema=json.dumps(_type_adapter(schema).json_schema()),
+    )))
+    return repaired
+
+async def ainvoke_structured(
+    llm:BaseChatModel,
+    messages:Sequence[BaseMessage],
+    schema:Any,
+    json_mode:bool=STRUCTURED_OUTPUT_JSON_MODE,
+    repair_retries:int=STRUCTURED_OUTPUT_REPAIR_RETRIES,
+)->tuple[Any,AIMessage]:
+    """
+    Invoke the model in JSON mode and validate the reply, with a bounded schema-repair retry.
+    args:
+        llm (BaseChatModel): Model to invoke.
+        messages (Sequence[BaseMessage]): Prompt messages.
+        schema (Any): Pydantic model or type the reply must match.
+        json_mode (bool): Whether to request JSON mode from the provider.
+        repair_retries (int): Number of extra calls that show the model its validation error.
+    returns:
+        tuple[Any, AIMessage]: The validated value and the raw model reply.
+    """
+    kwargs=JSON_MODE_KWARGS if json_mode else {}
+    error=None
+    for attempt in range(repair_retries+1):
+        content=""
+        try:
+            response=await llm.ainvoke(messages,**kwargs)
+            content=response.content
+            return parse_structured_output(content,schema),response
+        except ValueError as e:
+            error=e
+        except Exception as e:
+            if not _is_json_mode_failure(e):
+                raise
+            error=e
+        print(f"Structured output attempt {attempt+1} failed: {error}")
+        if attempt<repair_retries:
+            messages=_repair_messages(messages,content,error,schema)
+    raise StructuredOutputError(f"Model reply did not match {getattr(schema,'__name__',schema)}: {error}")
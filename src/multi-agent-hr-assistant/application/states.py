@@ -13,6 +13,9 @@ class SupervisorState(BaseModel):
     user_query: UserQuery
     messages: Annotated[Sequence[BaseMessage], add_messages] = []
 
+    #Compacted earlier conversation (rolling summary + recent turns) handed to the Clerk and Librarian
+    conversation_context: list[BaseMessage] = []
+
     #Current working agent and identified intent
     active_agent: Optional[AgentName] = "Supervisor"
     identified_intent: list[TaskIntent] = []
@@ -44,6 +47,9 @@ class ClerkState(BaseModel):
     #next Step for the Clerk Agent to take, can be "clerk_inner_model_node", "hitl_intervention_node" or "final_response_node"
     next_step: Optional[Literal["inner","final","hitl"]] = None
 
+    #final response to be returned to the Supervisor
+    response: Optional[str] = None
+
 #pydantic model for Librarian State
 class LibrarianState(BaseModel):
     #General State for Librarian Agent
@@ -1,23 +1,58 @@
-from application.agents.supervisor import SupervisorAgent
-from infrastructure.adapters.supervisor_clerk_graph_executor import SupervisorClerkGraphExecutor
-from infrastructure.adapters.Supervisor_librarian_graph_executor import SupervisorLibrarianGraphExecutor
+from __future__ import annotations
+from typing import TYPE_CHECKING, AsyncIterator
+from langchain_core.messages import AIMessageChunk
 from application.states import SupervisorState
-from infrastructure.llm_providers.groq_provider import create_model_instance
-from domain.ports import ClerkGraphExecutionPort, LibrarianGraphExecutionPort
-from domain.entities import UserQuery
-class SupervisorWorkflow:
-    def __init__(self,supervisor_state:SupervisorState):
-        self.supervisor_state=supervisor_state
-        self.llm_model=create_model_instance()
-        self.SupervisorClerkGraphExecutorPort: ClerkGraphExecutionPort = SupervisorClerkGraphExecutor(None)
-        self.SupervisorLibrarianGraphExecutorPort: LibrarianGraphExecutionPort = SupervisorLibrarianGraphExecutor(None)
-        self.supervisor_agent_instance=SupervisorAgent(self.llm_model,self.SupervisorClerkGraphExecutorPort,self.SupervisorLibrarianGraphExecutorPort)
+if TYPE_CHECKING:
+    from application.registry import AgentRegistry
+
+#Only tokens from the synthesis LLM call are streamed to the user, the other nodes produce internal JSON
+STREAMED_NODE="Supervisor_result_node"
 
-        self.compiled_supervisor_graph=self.supervisor_agent_instance.create_supervisor_agent_graph()
-    async def process_user_query(self,user_query:UserQuery)->str:
+class SupervisorWorkflow:
+    def __init__(self,registry:AgentRegistry):
+        #The compiled Supervisor graph is shared by every request, only the state is per request
+        self.compiled_supervisor_graph=registry.supervisor_graph
+        self.conversation_compactor=registry.conversation_compactor
+    async def process_user_query(self,supervisor_state:SupervisorState)->str:
         try:
             #Invoking the Supervisor Agent to process the user query and execute the respective agent graphs based on the identified intents in the user query
-            result=await self.compiled_supervisor_graph.ainvoke(self.supervisor_state)
+            result=await self.compiled_supervisor_graph.ainvoke(supervisor_state)
             return result["final_response"]
         except Exception as e:
-            raise RuntimeError(f"Failed to process user query in workflow: {str(e)}")
\ No newline at end of file
+            raise RuntimeError(f"Failed to process user query in workflow: {str(e)}")
+
+    async def stream_user_query(self,supervisor_state:SupervisorState)->AsyncIterator[dict]:
+        """
+        Run the Supervisor graph and yield the final response as it is generated.
+        args:
+            supervisor_state (SupervisorState): State for this request.
+        yields:
+            dict: {"type": "token", "content": str} for every synthesis token, then
+                  {"type": "final", "content": str} with the complete response.
+        """
+        final_response=None
+        streamed=False
+        try:
+            async for mode,chunk in self.compiled_supervisor_graph.astream(
+                supervisor_state,
+                stream_mode=["messages","values"],
+            ):
+                if mode=="messages":
+                    message,metadata=chunk
+                    if (
+                        metadata.get("langgraph_node")==STREAMED_NODE
+                        and isinstance(message,AIMessageChunk)
+                        and message.content
+                    ):
+                        streamed=True
+                        yield {"type":"token","content":message.content}
+                elif mode=="values":
+                    final_response=chunk.get("final_response")
+        except Exception as e:
+            raise RuntimeError(f"Failed to process user query in workflow: {str(e)}")
+
+        final_response=final_response or ""
+        #responses that skip the synthesis LLM call (e.g. general chat) are sent as a single chunk
+        if not streamed and final_response:
+            yield {"type":"token","content":final_response}
+        yield {"type":"final","content":final_response}
@@ -8,5 +8,98 @@ load_dotenv('.env.local')
 url=os.getenv('SUPABASE_URL')
 key=os.getenv('SUPABASE_KEY')
 service_key=os.getenv('SUPABASE_SERVICE_KEY')
+jwt_secret=os.getenv('SUPABASE_JWT_SECRET')
 
-CLERK_API_KEY=os.getenv('MOCK_API_KEY_CLERK')
\ No newline at end of file
+CLERK_API_KEY=os.getenv('MOCK_API_KEY_CLERK')
+
+#Supabase data layer settings
+SUPABASE_MAX_WORKERS=int(os.getenv('SUPABASE_MAX_WORKERS', 16))
+SUPABASE_TIMEOUT_SECONDS=float(os.getenv('SUPABASE_TIMEOUT_SECONDS', 10))
+
+#Auth token verification cache settings
+AUTH_CACHE_TTL_SECONDS=float(os.getenv('AUTH_CACHE_TTL_SECONDS', 60))
+AUTH_CACHE_MAX_SIZE=int(os.getenv('AUTH_CACHE_MAX_SIZE', 10000))
+
+#Conversation history window settings
+CHAT_HISTORY_WINDOW=int(os.getenv('CHAT_HISTORY_WINDOW', 20))
+CHAT_HISTORY_CACHE_TTL_SECONDS=int(os.getenv('CHAT_HISTORY_CACHE_TTL_SECONDS', 86400))
+
+#Conversation compaction settings, token counts are approximated as characters/4
+CONTEXT_RECENT_MESSAGES=int(os.getenv('CONTEXT_RECENT_MESSAGES', 6))
+CONTEXT_TOKEN_BUDGET=int(os.getenv('CONTEXT_TOKEN_BUDGET', 1500))
+AGENT_PROMPT_HISTORY_TOKEN_BUDGET=int(os.getenv('AGENT_PROMPT_HISTORY_TOKEN_BUDGET', 2000))
+CONVERSATION_SUMMARY_TTL_SECONDS=int(os.getenv('CONVERSATION_SUMMARY_TTL_SECONDS', 2592000))
+
+#Write-behind queue for AI messages
+MESSAGE_WRITE_QUEUE_MAX_SIZE=int(os.getenv('MESSAGE_WRITE_QUEUE_MAX_SIZE', 1000))
+MESSAGE_WRITE_BATCH_SIZE=int(os.getenv('MESSAGE_WRITE_BATCH_SIZE', 50))
+MESSAGE_WRITE_FLUSH_INTERVAL_SECONDS=float(os.getenv('MESSAGE_WRITE_FLUSH_INTERVAL_SECONDS', 0.2))
+MESSAGE_WRITE_MAX_RETRIES=int(os.getenv('MESSAGE_WRITE_MAX_RETRIES', 3))
+MESSAGE_WRITE_RETRY_BACKOFF_SECONDS=float(os.getenv('MESSAGE_WRITE_RETRY_BACKOFF_SECONDS', 0.5))
+MESSAGE_WRITE_SHUTDOWN_TIMEOUT_SECONDS=float(os.getenv('MESSAGE_WRITE_SHUTDOWN_TIMEOUT_SECONDS', 10))
+
+#Background job mode for process_query, set JOB_WORKER_CONCURRENCY=0 on replicas that should only serve HTTP
+JOB_WORKER_CONCURRENCY=int(os.getenv('JOB_WORKER_CONCURRENCY', 4))
+JOB_TTL_SECONDS=int(os.getenv('JOB_TTL_SECONDS', 3600))
+#job payloads carry the caller's auth token for the Clerk tools, they are deleted when a worker takes the job
+#and expire if none does within this time
+JOB_PAYLOAD_TTL_SECONDS=int(os.getenv('JOB_PAYLOAD_TTL_SECONDS', 300))
+JOB_SHUTDOWN_TIMEOUT_SECONDS=float(os.getenv('JOB_SHUTDOWN_TIMEOUT_SECONDS', 30))
+#workers back off exponentially while Redis is unreachable, capped at the max
+JOB_DEQUEUE_RETRY_BACKOFF_SECONDS=float(os.getenv('JOB_DEQUEUE_RETRY_BACKOFF_SECONDS', 0.5))
+JOB_DEQUEUE_MAX_BACKOFF_SECONDS=float(os.getenv('JOB_DEQUEUE_MAX_BACKOFF_SECONDS', 10))
+
+#Multi-worker serving settings
+APP_ENV=os.getenv('APP_ENV', 'development')
+WEB_CONCURRENCY=int(os.getenv('WEB_CONCURRENCY', 4))
+SOCKETIO_REDIS_MANAGER_ENABLED=os.getenv('SOCKETIO_REDIS_MANAGER_ENABLED', 'true').lower()=='true'
+
+#Embedding intent router used before the decomposition LLM call
+INTENT_ROUTER_ENABLED=os.getenv('INTENT_ROUTER_ENABLED', 'true').lower()=='true'
+INTENT_ROUTER_THRESHOLD=float(os.getenv('INTENT_ROUTER_THRESHOLD', 0.75))
+INTENT_ROUTER_MARGIN=float(os.getenv('INTENT_ROUTER_MARGIN', 0.08))
+INTENT_ROUTER_MAX_WORDS=int(os.getenv('INTENT_ROUTER_MAX_WORDS', 20))
+
+#Decomposition result cache, bump DECOMPOSITION_CACHE_VERSION whenever the decomposition prompt changes
+DECOMPOSITION_CACHE_ENABLED=os.getenv('DECOMPOSITION_CACHE_ENABLED', 'true').lower()=='true'
+#GET /cache_stats exposes the cache internals of a worker, only turn it on for operators
+CACHE_STATS_ENDPOINT_ENABLED=os.getenv('CACHE_STATS_ENDPOINT_ENABLED', 'false').lower()=='true'
+DECOMPOSITION_CACHE_VERSION=os.getenv('DECOMPOSITION_CACHE_VERSION', 'v3')
+DECOMPOSITION_CACHE_TTL_SECONDS=int(os.getenv('DECOMPOSITION_CACHE_TTL_SECONDS', 86400))
+DECOMPOSITION_CACHE_LOCAL_MAX_SIZE=int(os.getenv('DECOMPOSITION_CACHE_LOCAL_MAX_SIZE', 2000))
+DECOMPOSITION_CACHE_LOCAL_TTL_SECONDS=float(os.getenv('DECOMPOSITION_CACHE_LOCAL_TTL_SECONDS', 300))
+
+#When the Supervisor runs the synthesis LLM call over task results:
+#auto passes a single completed task straight through, always synthesizes every mixed result, never joins results without the LLM
+SYNTHESIS_POLICY=os.getenv('SYNTHESIS_POLICY', 'auto').lower()
+if SYNTHESIS_POLICY not in {"auto","always","never"}:
+    raise ValueError(f"SYNTHESIS_POLICY must be one of auto, always or never, got '{SYNTHESIS_POLICY}'")
+
+#Agent run statuses written to Redis for observability only, results are passed in process
+AGENT_STATUS_TRACKING_ENABLED=os.getenv('AGENT_STATUS_TRACKING_ENABLED', 'false').lower()=='true'
+
+#Structured output for the classifier nodes, JSON mode plus a bounded schema-repair retry
+STRUCTURED_OUTPUT_JSON_MODE=os.getenv('STRUCTURED_OUTPUT_JSON_MODE', 'true').lower()=='true'
+STRUCTURED_OUTPUT_REPAIR_RETRIES=int(os.getenv('STRUCTURED_OUTPUT_REPAIR_RETRIES', 1))
+
+#Backoff between retries of the Clerk and Librarian final response LLM calls
+AGENT_LLM_RETRY_BACKOFF_SECONDS=float(os.getenv('AGENT_LLM_RETRY_BACKOFF_SECONDS', 0.5))
+
+#Clerk classifies and extracts task details in one LLM call, the per-task call only fills incomplete tasks
+CLERK_BATCHED_EXTRACTION=os.getenv('CLERK_BATCHED_EXTRACTION', 'true').lower()=='true'
+
+#Clerk replies for tool-only outcomes (balance checks, tickets) are rendered from templates without an LLM call
+CLERK_TEMPLATED_RESPONSES=os.getenv('CLERK_TEMPLATED_RESPONSES', 'true').lower()=='true'
+
+#Shared pooled HTTP client used by the Clerk API adapters
+HTTP_CONNECT_TIMEOUT_SECONDS=float(os.getenv('HTTP_CONNECT_TIMEOUT_SECONDS', 3))
+HTTP_READ_TIMEOUT_SECONDS=float(os.getenv('HTTP_READ_TIMEOUT_SECONDS', 10))
+HTTP_MAX_CONNECTIONS=int(os.getenv('HTTP_MAX_CONNECTIONS', 50))
+HTTP_MAX_KEEPALIVE_CONNECTIONS=int(os.getenv('HTTP_MAX_KEEPALIVE_CONNECTIONS', 20))
+HTTP_KEEPALIVE_EXPIRY_SECONDS=float(os.getenv('HTTP_KEEPALIVE_EXPIRY_SECONDS', 30))
+
+#Leave balance cache read by /leave_balance, which the Clerk balance tool also calls.
+#Balances drop when an admin accepts a leave ticket in Supabase, outside this app, so the TTL
+#is the only bound on how long a balance stays stale after an approval
+LEAVE_BALANCE_CACHE_ENABLED=os.getenv('LEAVE_BALANCE_CACHE_ENABLED', 'true').lower()=='true'
+LEAVE_BALANCE_CACHE_TTL_SECONDS=int(os.getenv('LEAVE_BALANCE_CACHE_TTL_SECONDS', 60))
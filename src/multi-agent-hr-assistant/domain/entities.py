@@ -1,6 +1,6 @@
-from pydantic import BaseModel,Field
-from domain.intents import IntentType, LibrarianActionType,TicketType,AgentName
-from typing import Optional,Literal, Union,TypeAlias
+from pydantic import BaseModel,Field,model_validator
+from domain.intents import IntentType, AgentActionType, ClerkActionType, LibrarianActionType,TicketType,AgentName
+from typing import Annotated, Any, Optional,Literal, Union,TypeAlias,get_args
 #pydantic model to represent user query
 class UserQuery(BaseModel):
     query:str=Field(description="query string from the user which needs to be answered")
@@ -40,7 +40,7 @@ class GeneralInformationResponse(BaseModel):
 
 class GeneralInformationClassification(BaseModel):
     action:Literal["general_information"]=Field(description="action type for general information query")
-    details:GeneralInformationResponse=Field(description="details containing the specific informational response relevant to the user's query")
+    details:Optional[GeneralInformationResponse]=Field(description="details containing the specific informational response relevant to the user's query, null at classification stage and populated by the Inner Model Node",default=None)
 
 ClerkClassificationState:TypeAlias=Union[
     TicketCreationClassification,
@@ -48,9 +48,30 @@ ClerkClassificationState:TypeAlias=Union[
     GeneralInformationClassification
 ]
 
+#single Clerk task told apart by its action, used to validate the Inner Model Node output
+ClerkTaskOutput:TypeAlias=Annotated[ClerkClassificationState,Field(discriminator="action")]
+
+#function to wrap a bare list or a single task object under the key the model expects,
+#models in JSON mode often return the task itself instead of the wrapping object
+def _wrap_tasks(data:Any,key:str,aliases:tuple[str,...])->Any:
+    if isinstance(data,list):
+        return {key:data}
+    if isinstance(data,dict) and key not in data:
+        for alias in aliases:
+            if alias in data:
+                return {**{k:v for k,v in data.items() if k!=alias},key:data[alias]}
+        if "action" in data or "intent" in data:
+            return {key:[data]}
+    return data
+
 #pydantic model for Multiple Tasks output of Clerk Agent
 class ClerkMultipleTasksOutput(BaseModel):
-    tasks:list[ClerkClassificationState]=Field(description="list of classified tasks by the Clerk Agent in structured format")
+    tasks:list[ClerkTaskOutput]=Field(description="list of classified tasks by the Clerk Agent in structured format")
+
+    @model_validator(mode="before")
+    @classmethod
+    def coerce_tasks(cls,data:Any)->Any:
+        return _wrap_tasks(data,"tasks",("task",))
 
 #pydantic model for Saving state of Agent on Redis Server
 class AgentState(BaseModel):
@@ -62,15 +83,49 @@ class AgentState(BaseModel):
 
 #pydantic model for Supervisor to handle multi-intent queries
 class TaskIntent(BaseModel):
+    id:Optional[str]=Field(description="unique identifier of the task within the decomposition, referenced by depends_on",default=None)
+    depends_on:list[str]=Field(description="ids of the tasks whose results this task needs before it can run",default_factory=list)
     agent:AgentName=Field(description="name of the agent responsible for handling this intent")
     intent:IntentType=Field(description="identified intent for this task")
     decomposed_query:str=Field(description="decomposed query for the agent to handle this specific intent")
     status:Literal["pending","running","waiting_for_human","completed","error"]=Field(description="current status of the task",default="pending")
     result:Optional[str]=Field(description="result of the task execution, can contain tool execution results or final response from the agent",default=None)
+    action:Optional[AgentActionType]=Field(description="action for the assigned agent when the intent leaves no doubt, the agent then skips its own classification",default=None)
+
+    #an action that does not belong to the assigned agent is dropped so the agent classifies the task itself
+    @model_validator(mode="after")
+    def drop_foreign_action(self):
+        allowed={"Clerk":get_args(ClerkActionType),"Librarian":get_args(LibrarianActionType)}.get(self.agent,())
+        if self.action not in allowed:
+            self.action=None
+        return self
 
 class SupervisorTaskIntent(BaseModel):
      task:list[TaskIntent]=Field(description="list of identified intents for the Supervisor Agent to handle in structured format")
 
+     @model_validator(mode="before")
+     @classmethod
+     def coerce_tasks(cls,data:Any)->Any:
+         return _wrap_tasks(data,"task",("tasks",))
+
+     #tasks without an id get one from their position so that dependencies can always be resolved.
+     #Duplicate ids are rejected, depends_on could not tell which task it points at
+     @model_validator(mode="after")
+     def assign_task_ids(self):
+         given=[task.id for task in self.task if task.id]
+         duplicates=sorted({task_id for task_id in given if given.count(task_id)>1})
+         if duplicates:
+             raise ValueError(f"task ids must be unique, duplicated: {', '.join(duplicates)}")
+         taken=set(given)
+         for index,task in enumerate(self.task,start=1):
+             if task.id:
+                 continue
+             while f"t{index}" in taken:
+                 index+=1
+             task.id=f"t{index}"
+             taken.add(task.id)
+         return self
+
 
 #pydantic model for librarian agent for getting pending tasks
 class LibrarianTask(BaseModel):
@@ -81,4 +136,9 @@ class LibrarianTask(BaseModel):
     hitl_response:Optional[bool]=Field(description="flag to indicate if the user has made the confirmation regarding the update policy or not",default=None)
 
 class LibrarianTaskIntent(BaseModel):
-    task:list[LibrarianTask]=Field(description="list of tasks assigned to the Librarian Agent in structured format based on the identified intent and routing decision by the Supervisor Agent")
\ No newline at end of file
+    task:list[LibrarianTask]=Field(description="list of tasks assigned to the Librarian Agent in structured format based on the identified intent and routing decision by the Supervisor Agent")
+
+    @model_validator(mode="before")
+    @classmethod
+    def coerce_tasks(cls,data:Any)->Any:
+        return _wrap_tasks(data,"task",("tasks",))
\ No newline at end of file
@@ -35,6 +35,11 @@ LibrarianActionType=Literal[
     "update_policy",
 ]
 
+AgentActionType=Literal[ClerkActionType,LibrarianActionType]
+
+#Librarian actions that change the policy store, only allowed for admins that uploaded a document
+LIBRARIAN_ADMIN_ACTIONS: set[str] = {"upload_policy", "update_policy", "delete_policy"}
+
 TicketType=Literal[
     "complaint",
     "help",
@@ -45,4 +50,75 @@ TicketStatusType=Literal[
     "in_progress",
     "accepted",
     "rejected",
-]
\ No newline at end of file
+]
+
+#Agent that handles each intent when a query is routed without the decomposition LLM call
+INTENT_AGENTS: dict[str, str] = {
+    "Policy_Query": "Librarian",
+    "Leave_Request": "Clerk",
+    "Complaint_filing": "Clerk",
+    "Clarification": "Supervisor",
+    "General_Chat": "Supervisor",
+}
+
+#Agent action implied by an intent without another classification call, intents that can map to
+#several actions (a Leave_Request may be a balance check or a leave ticket) are left to the agent
+INTENT_ACTIONS: dict[str, str] = {
+    "Policy_Query": "retrieve_policy",
+    "Complaint_filing": "ticket_creation",
+}
+
+#Labeled exemplars for the embedding intent router.
+#Clarification has no exemplars on purpose, ambiguous queries are always left to the decomposition LLM.
+INTENT_EXEMPLARS: dict[str, list[str]] = {
+    "General_Chat": [
+        "hi",
+        "hello",
+        "hey there",
+        "good morning",
+        "good evening",
+        "how are you",
+        "thanks",
+        "thank you so much",
+        "thanks for your help",
+        "you are awesome",
+        "bye",
+        "see you later",
+        "have a nice day",
+        "what's up",
+    ],
+    "Policy_Query": [
+        "what is the company leave policy",
+        "how many sick days do we get per year",
+        "what is the work from home policy",
+        "explain the maternity leave policy",
+        "what are the rules for overtime pay",
+        "when is payroll processed each month",
+        "what benefits are employees entitled to",
+        "what does the code of conduct say about dress code",
+        "is there a policy on carrying forward unused leave",
+        "what is the notice period for resignation",
+        "how does the health insurance policy work",
+        "what are the official company holidays",
+    ],
+    "Leave_Request": [
+        "I want to apply for leave",
+        "apply for 3 days of leave next week",
+        "I need to take two days off",
+        "request sick leave for tomorrow",
+        "book annual leave from monday to friday",
+        "I would like to take a vacation next month",
+        "please file a leave request for me",
+        "I need a day off on friday",
+    ],
+    "Complaint_filing": [
+        "I want to file a complaint against my manager",
+        "I am being harassed at work",
+        "report discrimination by a colleague",
+        "my coworker is bullying me",
+        "I want to report misconduct",
+        "I experienced unfair treatment from my supervisor",
+        "raise a complaint about workplace harassment",
+        "report an ethics violation",
+    ],
+}
@@ -1,5 +1,7 @@
+import asyncio
 from abc import ABC,abstractmethod
-from domain.entities import TicketCreation
+from typing import Optional
+from domain.entities import SupervisorTaskIntent, TaskIntent, TicketCreation
 from application.states import ClerkState, LibrarianState
 #Interface for the Clerk Agent 
 class LeaveBalancePort(ABC):
@@ -15,6 +17,20 @@ class LeaveBalancePort(ABC):
             int: leave balance in days
         """
         pass
+
+    #async variant used by the Clerk graph, by default the blocking call runs in a worker thread
+    async def aget_leave_balance(self, token:str)->int:
+        """
+        Method to get leave balance for the current logged in user without blocking the event loop
+        Args:
+            token (str): Authentication token of the user for whom to fetch the leave balance
+        Returns:
+            int: leave balance in days
+        Raises:
+            Exception: implementations raise when the balance cannot be fetched instead of returning 0
+        """
+        return await asyncio.to_thread(self.get_leave_balance, token)
+
 class TicketCreationPort(ABC):
     #abstract method to create a ticket
     @abstractmethod
@@ -29,27 +45,39 @@ class TicketCreationPort(ABC):
         """
         pass
 
+    #async variant used by the Clerk graph, by default the blocking call runs in a worker thread
+    async def acreate_ticket(self,ticket_data:TicketCreation,token:str)->bool:
+        """
+        Method to create a ticket without blocking the event loop
+        Args:
+            ticket_data (TicketCreation): data required to create a ticket
+            token (str): Authentication token of the user for whom to create the ticket
+        Returns:
+            bool: True if ticket creation is successful, False otherwise
+        """
+        return await asyncio.to_thread(self.create_ticket,ticket_data,token)
+
 class ClerkGraphExecutionPort(ABC):
     @abstractmethod
-    async def execute_clerk_agent_graph(self,state:ClerkState)->bool:
+    async def execute_clerk_agent_graph(self,state:ClerkState)->str:
         """
         Method to execute the Clerk Agent State Graph
         Args:
             state (ClerkState): Current state of the Clerk Agent
         Returns:
-            bool: True if execution is successful, False otherwise
+            str: Final response of the Clerk Agent
         """
         pass
 
 class LibrarianGraphExecutionPort(ABC):
     @abstractmethod
-    async def execute_librarian_agent_graph(self,state:LibrarianState)->bool:
+    async def execute_librarian_agent_graph(self,state:LibrarianState)->str:
         """
         Method to execute the Librarian Agent State Graph
         Args:
             state (LibrarianState): Current state of the Librarian Agent
         Returns:
-            bool: True if execution is successful, False otherwise
+            str: Final response of the Librarian Agent
         """
         pass
 
@@ -177,4 +205,66 @@ class VectorStorePort(ABC):
         Returns:
             bool: True if deletion is successful, False otherwise
         """
-        pass
\ No newline at end of file
+        pass
+class ConversationSummaryPort(ABC):
+    @abstractmethod
+    async def get_summary(self,conversation_id:str)->dict:
+        """
+        Method to get the rolling summary of a conversation
+        Args:
+            conversation_id (str): Unique identifier of the conversation
+        Returns:
+            dict: {"summary": str, "until": created_at of the last summarized message}, empty if none is stored
+        """
+        pass
+
+    @abstractmethod
+    async def save_summary(self,conversation_id:str,summary:str,until:str)->bool:
+        """
+        Method to save the rolling summary of a conversation
+        Args:
+            conversation_id (str): Unique identifier of the conversation
+            summary (str): Updated summary text
+            until (str): created_at of the last message folded into the summary
+        Returns:
+            bool: True if saving is successful, False otherwise
+        """
+        pass
+
+class IntentRouterPort(ABC):
+    @abstractmethod
+    async def route(self,query:str)->Optional[SupervisorTaskIntent]:
+        """
+        Method to classify a single-intent query without the decomposition LLM call
+        Args:
+            query (str): User query to classify
+        Returns:
+            Optional[SupervisorTaskIntent]: One task for the query if the router is confident, None to fall back to the LLM
+        """
+        pass
+
+class DecompositionCachePort(ABC):
+    @abstractmethod
+    async def get(self,query:str,is_admin:bool,has_uploaded_text:bool)->Optional[list[TaskIntent]]:
+        """
+        Method to get a cached decomposition of a query
+        Args:
+            query (str): User query
+            is_admin (bool): Whether the user has admin privileges
+            has_uploaded_text (bool): Whether the query came with uploaded text
+        Returns:
+            Optional[list[TaskIntent]]: Fresh pending tasks for the query, None on a miss
+        """
+        pass
+
+    @abstractmethod
+    async def set(self,query:str,is_admin:bool,has_uploaded_text:bool,tasks:list[TaskIntent])->None:
+        """
+        Method to cache the decomposition of a query
+        Args:
+            query (str): User query
+            is_admin (bool): Whether the user has admin privileges
+            has_uploaded_text (bool): Whether the query came with uploaded text
+            tasks (list[TaskIntent]): Tasks produced by the decomposition
+        """
+        pass
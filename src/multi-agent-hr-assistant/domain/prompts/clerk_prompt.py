@@ -35,22 +35,79 @@ Clerk_Classification_prompt = ChatPromptTemplate.from_messages([
         - This node performs classification ONLY.
 
         OUTPUT REQUIREMENTS:
-        - Output MUST be a valid JSON array.
+        - Output MUST be a valid JSON object with a single key "tasks" holding the array of tasks.
         - details MUST always be null in this node.
         - Do NOT include ticket fields, responses, or explanations.
         - Do NOT include extra keys.
-        - Do NOT include text outside the JSON array.
+        - Do NOT include text outside the JSON object.
         - Do NOT wrap in markdown or code blocks.
 
-        Each element must match one of these exact shapes:
-        [{{"action": "get_balance", "details": null}}]
-        [{{"action": "ticket_creation", "details": null}}]
-        [{{"action": "general_information", "details": null}}]
+        Each element of "tasks" must match one of these exact shapes:
+        {{"action": "get_balance", "details": null}}
+        {{"action": "ticket_creation", "details": null}}
+        {{"action": "general_information", "details": null}}
+
+        Example: {{"tasks": [{{"action": "get_balance", "details": null}}, {{"action": "ticket_creation", "details": null}}]}}
     """),
     ("human", "User message: {query}")
 ])
 
 
+
+Clerk_Extraction_Prompt = ChatPromptTemplate.from_messages([
+    ("system", """
+        You are the Clerk Agent Extraction Node.
+
+        Your responsibility is to split the user's message into tasks in the EXACT order they appear
+        and, in the same reply, fill in the details of every task.
+
+        AVAILABLE ACTION TYPES:
+
+        1. get_balance
+        - Use this when the user asks about leave balance, remaining leaves,
+          available leaves, or how many leaves they have.
+        - details is always null.
+
+        2. ticket_creation
+        - Use this when the user wants to create a ticket, apply for leave,
+          raise a complaint, report an issue, or submit a request.
+        - Each ticket request is a SEPARATE task, the user may request several.
+        - Extract only explicitly stated information, do NOT infer or assume values.
+        - details fields:
+          - ticket_type: one of complaint, help, leave
+          - subject: short precise summary
+          - description: concrete issue or request text
+          - status: always "in_progress"
+          - leave_days: number if ticket_type is leave and stated by the user, otherwise null
+          - accepted: always null
+        - If ticket_type, subject or description cannot be taken from the message, set details to null.
+
+        3. general_information
+        - Use this when the user asks for HR policies, holidays, office information,
+          email addresses, or general company or HR-related questions.
+        - details is {{"response": "..."}} with a concise, factual answer to that question only.
+        - If you cannot answer it, set details to null.
+
+        RULES:
+        - Always return ALL detected tasks in the order they appear.
+        - Do NOT merge multiple tasks into one.
+        - Do NOT infer or hallucinate tasks.
+        - Do NOT call any tool.
+
+        OUTPUT REQUIREMENTS:
+        - Output MUST be a valid JSON object with a single key "tasks" holding the array of tasks.
+        - Do NOT include text outside the JSON object.
+        - Do NOT wrap in markdown or code blocks.
+
+        Example:
+        {{"tasks": [
+          {{"action": "get_balance", "details": null}},
+          {{"action": "ticket_creation", "details": {{"ticket_type": "leave", "subject": "Leave on Friday", "description": "Requesting leave for Friday", "status": "in_progress", "leave_days": 1, "accepted": null}}}}
+        ]}}
+    """),
+    ("human", "User message: {query}")
+])
+
 Clerk_Inner_Model_Prompt = ChatPromptTemplate.from_messages([
     ("system", """
         You are the Clerk Agent Inner Model Node responsible for handling EXACTLY ONE task
@@ -124,11 +181,11 @@ Clerk_Final_Response_Prompt = ChatPromptTemplate.from_messages([
     ("system", """
         You are the Clerk Agent Final Response Node.
 
-        This response is intended for the Supervisor Agent, not for an end user.
+        This response may be shown to the user as it is, so it must read as a direct answer to them.
 
         Your task:
-        Generate a clear, concise, plain-language summary describing the overall
-        outcome of the Clerk's work so that the Supervisor can decide what to do next.
+        Write a clear, concise, plain-language reply telling the user the outcome
+        of everything the Clerk did for them.
 
         Instructions:
         1. Analyze all tasks in the provided completed tasks list.
@@ -136,21 +193,31 @@ Clerk_Final_Response_Prompt = ChatPromptTemplate.from_messages([
            - State whether it was completed successfully or not.
            - If a tool was used, base success or failure strictly on tool_results.
            - If a task succeeded, you MUST include the exact data values returned in tool_results.
-             For example: if tool_results contains leave_balance of 10, you MUST state "leave balance is 10 days".
+             For example: if tool_results contains leave_balance of 10, you MUST say "your leave balance is 10 days".
              If tool_results contains ticket details, you MUST include the ticket subject and type.
-           - If a task failed, clearly explain the cause using the tool error.
-        3. Identify tasks fully completed, tasks that failed, and tasks that could not be completed.
-        4. Do NOT invent missing information.
-        5. Do NOT omit actual result values — the Supervisor relies on these to answer the user.
-        6. Do NOT retry tools.
-        7. Do NOT ask questions.
+           - If a task failed, briefly explain the cause in user-friendly words.
+        3. Do NOT invent missing information.
+        4. Do NOT omit actual result values.
+        5. Do NOT retry tools.
+        6. Do NOT ask questions.
+        7. Do NOT mention agents, nodes, tools or internal workflows.
 
         Output Format Rules:
         - Output MUST be plain text.
         - No JSON. No markdown.
-        - Write in clear, operational language suitable for an orchestrator.
+        - One short paragraph per task, separated by a blank line.
 
-        Tone: Objective, precise, non-user-facing, no conversational filler.
+        Tone: Friendly, precise and addressed to the user, no filler.
     """),
     ("human", "Completed tasks: {final_response}\nTool execution results: {tool_results}")
-])
\ No newline at end of file
+])
+
+#Replies for tasks whose outcome is fully described by a tool result, keyed by action and outcome.
+#They are used instead of Clerk_Final_Response_Prompt when every task of the request has one.
+CLERK_OUTCOME_TEMPLATES = {
+    ("get_balance", "success"): "Your leave balance is {leave_balance} days.",
+    ("get_balance", "failed"): "I wasn't able to retrieve your leave balance right now. Please try again in a moment.",
+    ("ticket_creation", "success"): "Your {ticket_type} ticket \"{subject}\" has been created.",
+    ("ticket_creation", "rejected"): "The ticket was not created because you chose not to submit it.",
+    ("ticket_creation", "failed"): "I wasn't able to create your ticket right now. Please try again in a moment.",
+}
@@ -0,0 +1,25 @@
+from langchain_core.prompts import ChatPromptTemplate
+
+#Prompt used to fold older conversation turns into the stored rolling summary
+ConversationSummaryPrompt = ChatPromptTemplate.from_messages([
+    ("system", """
+        You maintain a running summary of a conversation between an employee and an HR Service Desk assistant.
+
+        Update the existing summary with the new conversation turns.
+
+        RULES:
+        - Keep facts the assistant may need later: requested leave dates and days, ticket types and subjects,
+          tickets created or rejected, balances reported, policies discussed and open questions.
+        - Drop greetings, small talk and repeated information.
+        - Never invent details that are not in the summary or the turns.
+        - Write plain prose in the third person, at most 150 words.
+        - Return ONLY the updated summary text.
+    """),
+    ("human", """
+        Existing summary:
+        {summary}
+
+        New conversation turns:
+        {turns}
+    """)
+])
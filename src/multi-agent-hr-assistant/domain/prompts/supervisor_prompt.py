@@ -55,18 +55,33 @@ SupervisorDecompositionPrompt = ChatPromptTemplate.from_messages([
         5. If clarification is required, create ONE Clarification task.
         6. If the entire query is General_Chat, create ONE General_Chat task.
         7. Social/conversational messages always use General_Chat, never Clarification.
-        8. If multiple parts belong to the SAME operational task, merge into a single TaskIntent.
-        9. Do NOT split a single workflow into multiple tasks.
-        10. Only create separate tasks when intents are operationally independent.
+        8. If multiple parts describe the SAME operation (e.g. the dates and the reason of one leave request), merge them into a single TaskIntent.
+        9. Split a workflow into one task per step when a step needs the outcome of an earlier one, and link them with depends_on.
+        10. Never create two tasks for the same operation.
+        11. Give every task a short unique id: "t1", "t2", ...
+        12. If a task can only be done with the result of another task, list that task's id in depends_on.
+            Example: "check my balance and apply for 3 days of leave if I have enough" becomes
+            t1 (Clerk, check balance) and t2 (Clerk, apply for 3 days of leave, depends_on ["t1"]).
+        13. Leave depends_on empty for tasks that can run on their own, they are executed in parallel.
+        14. Never create circular dependencies.
+        15. Set action ONLY when the task leaves no doubt about what the agent must do, otherwise set it to null:
+            - Clerk: "get_balance" (leave balance), "ticket_creation" (apply for leave, file a complaint, raise a ticket)
+              or "general_information" (an HR question the Clerk answers).
+            - Librarian: "retrieve_policy" for policy questions. For admins with an uploaded document,
+              "upload_policy", "update_policy" or "delete_policy" only when the query says which one.
+            - Supervisor tasks always use null.
 
         OUTPUT FORMAT — return ONLY this JSON object, no markdown, no explanation:
 
         {{
         "task": [
             {{
+            "id": "t1",
+            "depends_on": [],
             "agent": "Supervisor or Clerk or Librarian",
             "intent": "Policy_Query or Leave_Request or Complaint_filing or Clarification or General_Chat",
             "decomposed_query": "<string>",
+            "action": "<action or null>",
             "status": "pending",
             "result": null
             }}
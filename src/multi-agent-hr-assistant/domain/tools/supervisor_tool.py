@@ -1,20 +1,21 @@
 from domain.ports import ClerkGraphExecutionPort, LibrarianGraphExecutionPort
+from application.states import ClerkState, LibrarianState
 from langchain.tools import tool
 
-def make_supervisor_execute_clerk_graph_tool(executor: ClerkGraphExecutionPort):
+def make_supervisor_execute_clerk_graph_tool(executor: ClerkGraphExecutionPort, state: ClerkState):
     @tool(
         "execute_clerk_graph",
         description="Use this tool to execute the Clerk Agent State Graph for handling HR related queries."
     )
-    async def execute_clerk_graph() -> bool:
-        return await executor.execute_clerk_agent_graph()
+    async def execute_clerk_graph() -> str:
+        return await executor.execute_clerk_agent_graph(state)
     return execute_clerk_graph
 
-def make_supervisor_execute_librarian_graph_tool(executor: LibrarianGraphExecutionPort):
+def make_supervisor_execute_librarian_graph_tool(executor: LibrarianGraphExecutionPort, state: LibrarianState):
     @tool(
         "execute_librarian_graph",
         description="Use this tool to execute the Librarian Agent State Graph for handling document retrieval, insertion and updation related queries."
     )
-    async def execute_librarian_graph() -> bool:
-        return await executor.execute_librarian_agent_graph()
-    return execute_librarian_graph
\ No newline at end of file
+    async def execute_librarian_graph() -> str:
+        return await executor.execute_librarian_agent_graph(state)
+    return execute_librarian_graph
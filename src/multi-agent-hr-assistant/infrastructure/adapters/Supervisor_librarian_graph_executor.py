@@ -1,74 +1,36 @@
-from domain.ports import LibrarianGraphExecutionPort
+from domain.ports import LibrarianGraphExecutionPort, LibrarianRetrievalPort, LibrarianInsertionPort, LibrarianUpdatePort
 from application.states import LibrarianState
-from infrastructure.llm_providers.groq_provider import create_model_instance
-from infrastructure.adapters.librarian_retrieval_adapter import LibrarianRetrievalAdapter
-from infrastructure.adapters.librarian_insertion_adapter import LibrarianInsertionAdapter
-from infrastructure.adapters.librarian_updation_adapter import LibrarianUpdateAdapter
 from application.agents.librarian import LibrarianAgent
-from infrastructure.redis.redis_client import get_agent_state_for_final_response, save_agent_state_for_final_response
+from langchain_core.language_models.chat_models import BaseChatModel
+from infrastructure.redis.redis_client import save_agent_status
 from domain.entities import AgentState
-from application.services.ingestion import IngestionService
-from infrastructure.adapters.chroma_store import ChromaVectorStore
-from infrastructure.adapters.redis_store import RedisDocumentStore
+from config import AGENT_STATUS_TRACKING_ENABLED
 class SupervisorLibrarianGraphExecutor(LibrarianGraphExecutionPort):
-    def __init__(self,state:LibrarianState):
-        self.librarian_state=state
-        self.chroma_store=ChromaVectorStore()
-        self.redis_store=RedisDocumentStore()
-        self.ingestion_service=IngestionService(self.redis_store,self.chroma_store)
-
-    #function to update the state of librarian
-    def update_librarian_state(self,state:LibrarianState):
-        self.librarian_state=state
-
-    #Method to execute the Librarian Agent State Graph
-    async def execute_librarian_agent_graph(self)->bool:
-        agent_state=None
+    def __init__(self,llm_model:BaseChatModel,retrieval_port:LibrarianRetrievalPort,insertion_port:LibrarianInsertionPort,updation_port:LibrarianUpdatePort,track_status:bool=AGENT_STATUS_TRACKING_ENABLED):
+        self.librarian_agent=LibrarianAgent(llm_model,retrieval_port,insertion_port,updation_port)
+        self.track_status=track_status
+
+        #Compiling the Librarian Agent Graph once, every execution only supplies its own LibrarianState
+        self.librarian_graph=self.librarian_agent.create_librarian_agent_graph()
+
+    #Method to record the outcome of a run in Redis when status tracking is enabled
+    async def _record_status(self,state:LibrarianState,status:str,final_response:str="",error:str=None)->None:
+        if not self.track_status:
+            return
+        await save_agent_status(AgentState(
+            user_id=state.user_query.user_id,
+            key=state.user_query.conversation_id,
+            agent_name="Librarian",
+            state={"status":status,"final_response":final_response,"error":error}
+        ))
+
+    #Method to execute the Librarian Agent State Graph, the final response is returned in process
+    async def execute_librarian_agent_graph(self,state:LibrarianState)->str:
         try:
-            llm_model=create_model_instance("llama-3.3-70b-versatile")
-            retrieval_port=LibrarianRetrievalAdapter()
-            insertion_port=LibrarianInsertionAdapter(self.ingestion_service)
-            updation_port=LibrarianUpdateAdapter(self.ingestion_service)
-            librarian_agent=LibrarianAgent(llm_model,retrieval_port,insertion_port,updation_port)
-
-            #Creating the Librarian Agent Graph
-            librarian_graph=librarian_agent.create_librarian_agent_graph()
-            
-            #Agent State to be saved in Redis before execution
-            agent_state=AgentState(
-                user_id=self.librarian_state.user_query.user_id,
-                key=self.librarian_state.user_query.conversation_id,
-                agent_name="Librarian",
-                state={
-                    "status":"initialized",
-                    "final_response":"",
-                    "error":None
-                }
-            )
-
-            #calling the Redis function to save the initial state of the Librarian Agent before execution
-            save_agent_state_for_final_response(agent_state)
-
-            agent_state.state["status"]="running"
-            save_agent_state_for_final_response(agent_state)
-
-            #Executing the Librarian Agent Graph
-            await librarian_graph.ainvoke(self.librarian_state)
-
-            existing=get_agent_state_for_final_response(
-                self.librarian_state.user_query.user_id,
-                self.librarian_state.user_query.conversation_id,
-                "Librarian"
-            )
-            
-            agent_state.state={ **existing,"status":"completed"}
-            
-            save_agent_state_for_final_response(agent_state)
-
-            return True
+            final_state=await self.librarian_graph.ainvoke(state)
+            response=final_state.get("response") or ""
+            await self._record_status(state,"completed",final_response=response)
+            return response
         except Exception as e:
-            if agent_state:
-                agent_state.state["status"]="error"
-                agent_state.state["error"]=str(e)
-                save_agent_state_for_final_response(agent_state)
-            raise RuntimeError(f"Failed to execute Librarian Agent Graph: {str(e)}")
\ No newline at end of file
+            await self._record_status(state,"error",error=str(e))
+            raise RuntimeError(f"Failed to execute Librarian Agent Graph: {str(e)}")
@@ -1,9 +1,9 @@
 from domain.ports import VectorStorePort
-from infrastructure.vector_store.chroma_client import create_chroma_instance
+from langchain_chroma import Chroma
 
 class ChromaVectorStore(VectorStorePort):
-    def __init__(self):
-        self.vector_store=create_chroma_instance()
+    def __init__(self,vector_store:Chroma):
+        self.vector_store=vector_store
 
     def upsert_embeddings(self, chunks: list, metadata: list, ids: list) -> bool:
         """
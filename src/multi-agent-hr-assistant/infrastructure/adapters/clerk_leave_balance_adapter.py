@@ -1,10 +1,14 @@
 from domain.ports import LeaveBalancePort
+from typing import Optional
+import httpx
 import requests
-from config import CLERK_API_KEY
+from config import CLERK_API_KEY, HTTP_CONNECT_TIMEOUT_SECONDS, HTTP_READ_TIMEOUT_SECONDS
+from infrastructure.http.http_client import get_http_client
 #Adapter class to interact with Clerk Leave Balance API
 class ClerkLeaveBalanceAdapter(LeaveBalancePort):
-    def __init__(self):
+    def __init__(self, http_client:Optional[httpx.AsyncClient]=None):
         self.api_key = CLERK_API_KEY
+        self.http_client = http_client
     def get_leave_balance(self, token:str) -> int:
         """
         Method to get leave balance for the current logged in user
@@ -14,10 +18,33 @@ class ClerkLeaveBalanceAdapter(LeaveBalancePort):
             int: leave balance in days
         """
         try:
-            response = requests.get(f"{self.api_key}/leave_balance", headers={"Authorization": f"Bearer {token}"})
+            response = requests.get(
+                f"{self.api_key}/leave_balance",
+                headers={"Authorization": f"Bearer {token}"},
+                timeout=(HTTP_CONNECT_TIMEOUT_SECONDS, HTTP_READ_TIMEOUT_SECONDS),
+            )
             response.raise_for_status()
             data = response.json()
             return data.get("leave_balance", 0)
         except requests.RequestException:
             print("Error fetching leave balance from Clerk API")
-            return 0
\ No newline at end of file
+            return 0
+
+    async def aget_leave_balance(self, token:str) -> int:
+        """
+        Method to get leave balance for the current logged in user through the shared pooled HTTP client
+        Args:
+            token (str): Authentication token of the user for whom to fetch the leave balance
+        Returns:
+            int: leave balance in days
+        Raises:
+            httpx.HTTPError: if the Clerk API cannot be reached or returns an error, an outage is never reported as a zero balance
+            ValueError: if the response has no leave balance
+        """
+        client = self.http_client or get_http_client()
+        response = await client.get(f"{self.api_key}/leave_balance", headers={"Authorization": f"Bearer {token}"})
+        response.raise_for_status()
+        balance = response.json().get("leave_balance")
+        if balance is None:
+            raise ValueError("Clerk API response has no leave_balance")
+        return balance
@@ -1,12 +1,16 @@
 from domain.ports import TicketCreationPort
 from domain.entities import TicketCreation
-from config import CLERK_API_KEY
+from config import CLERK_API_KEY, HTTP_CONNECT_TIMEOUT_SECONDS, HTTP_READ_TIMEOUT_SECONDS
+from infrastructure.http.http_client import get_http_client
+from typing import Optional
+import httpx
 import requests
 
 #Adapter class to interact with Clerk Ticket Creation API
 class ClerkTicketCreationAdapter(TicketCreationPort):
-    def __init__(self):
+    def __init__(self,http_client:Optional[httpx.AsyncClient]=None):
         self.clerk_api_key=CLERK_API_KEY
+        self.http_client=http_client
 
     def create_ticket(self,ticket_data:TicketCreation,token:str) -> bool:
         """
@@ -19,10 +23,34 @@ class ClerkTicketCreationAdapter(TicketCreationPort):
         """
         try:
             ticket_data_dict=ticket_data.model_dump()
-            response=requests.post(f"{self.clerk_api_key}/ticket_creation",json=ticket_data_dict,headers={"Authorization": f"Bearer {token}"})
+            response=requests.post(
+                f"{self.clerk_api_key}/ticket_creation",
+                json=ticket_data_dict,
+                headers={"Authorization": f"Bearer {token}"},
+                timeout=(HTTP_CONNECT_TIMEOUT_SECONDS,HTTP_READ_TIMEOUT_SECONDS),
+            )
             response.raise_for_status()
             data=response.json()
             return data.get("status",False)
         except Exception as e:
             print(f"Error creating ticket: {e}")
-            return False
\ No newline at end of file
+            return False
+
+    async def acreate_ticket(self,ticket_data:TicketCreation,token:str) -> bool:
+        """
+        Method to create a ticket through the shared pooled HTTP client
+        Args:
+            ticket_data (TicketCreation): data required to create a ticket
+            token (str): Authentication token of the user for whom to create the ticket
+        Returns:
+            bool: True if ticket creation is successful, False otherwise
+        """
+        try:
+            client=self.http_client or get_http_client()
+            response=await client.post(f"{self.clerk_api_key}/ticket_creation",json=ticket_data.model_dump(),headers={"Authorization": f"Bearer {token}"})
+            response.raise_for_status()
+            data=response.json()
+            return data.get("status",False)
+        except Exception as e:
+            print(f"Error creating ticket: {e}")
+            return False
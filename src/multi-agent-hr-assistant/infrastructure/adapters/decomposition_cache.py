@@ -0,0 +1,65 @@
+import re
+from hashlib import sha256
+from typing import Optional
+from domain.entities import TaskIntent
+from domain.ports import DecompositionCachePort
+from infrastructure.cache.lru_ttl_cache import LRUTTLCache
+from infrastructure.redis.decomposition_cache import get_cached_decomposition, save_cached_decomposition
+from config import DECOMPOSITION_CACHE_VERSION, DECOMPOSITION_CACHE_LOCAL_MAX_SIZE, DECOMPOSITION_CACHE_LOCAL_TTL_SECONDS
+
+#function to normalize a query so trivially different spellings share a cache entry
+def normalize_query(query:str)->str:
+    query=re.sub(r"\s+"," ",(query or "").strip().lower())
+    return query.rstrip(" ?!.")
+
+#Two-level decomposition cache: an in-process LRU in front of Redis.
+#Decompositions of queries that came with uploaded text are never cached, they depend on the document.
+class RedisDecompositionCache(DecompositionCachePort):
+    def __init__(self,local_cache:Optional[LRUTTLCache]=None,version:str=DECOMPOSITION_CACHE_VERSION):
+        self.local_cache=local_cache or LRUTTLCache(
+            max_size=DECOMPOSITION_CACHE_LOCAL_MAX_SIZE,
+            ttl_seconds=DECOMPOSITION_CACHE_LOCAL_TTL_SECONDS,
+        )
+        self.version=version
+        self.redis_hits=0
+        self.redis_misses=0
+
+    def _cache_key(self,query:str,is_admin:bool,has_uploaded_text:bool)->str:
+        raw=f"{self.version}|admin={bool(is_admin)}|uploaded={bool(has_uploaded_text)}|{normalize_query(query)}"
+        return sha256(raw.encode("utf-8")).hexdigest()
+
+    #every hit builds new TaskIntent objects because the executor mutates status and result in place
+    def _to_tasks(self,tasks:list[dict])->list[TaskIntent]:
+        return [TaskIntent(**task) for task in tasks]
+
+    async def get(self,query:str,is_admin:bool,has_uploaded_text:bool)->Optional[list[TaskIntent]]:
+        if has_uploaded_text:
+            return None
+        cache_key=self._cache_key(query,is_admin,has_uploaded_text)
+
+        tasks=self.local_cache.get(cache_key)
+        if tasks is not None:
+            return self._to_tasks(tasks)
+
+        tasks=await get_cached_decomposition(cache_key)
+        if tasks is None:
+            self.redis_misses+=1
+            return None
+        self.redis_hits+=1
+        self.local_cache.set(cache_key,tasks)
+        return self._to_tasks(tasks)
+
+    async def set(self,query:str,is_admin:bool,has_uploaded_text:bool,tasks:list[TaskIntent])->None:
+        if has_uploaded_text or not tasks:
+            return
+        cache_key=self._cache_key(query,is_admin,has_uploaded_text)
+        #only the plan is cached, never the outcome of a previous run
+        plan=[task.model_dump(exclude={"status","result"}) for task in tasks]
+        self.local_cache.set(cache_key,plan)
+        await save_cached_decomposition(cache_key,plan)
+
+    def stats(self)->dict:
+        return {
+            "local":self.local_cache.stats(),
+            "redis":{"hits":self.redis_hits,"misses":self.redis_misses},
+        }
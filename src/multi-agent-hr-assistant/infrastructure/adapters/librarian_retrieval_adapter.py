@@ -1,9 +1,9 @@
 from domain.ports import LibrarianRetrievalPort
-from infrastructure.vector_store.chroma_client import create_chroma_instance
+from langchain_chroma import Chroma
 
 class LibrarianRetrievalAdapter(LibrarianRetrievalPort):
-    def __init__(self):
-        self.vector_store_client = create_chroma_instance()
+    def __init__(self, vector_store: Chroma):
+        self.vector_store_client = vector_store
 
     def retrieve_document(self, query: str) -> list[str]:
         """
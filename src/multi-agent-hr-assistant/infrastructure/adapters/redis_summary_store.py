@@ -0,0 +1,9 @@
+from domain.ports import ConversationSummaryPort
+from infrastructure.redis.conversation_summary_cache import get_conversation_summary,save_conversation_summary
+
+class RedisConversationSummaryStore(ConversationSummaryPort):
+    async def get_summary(self, conversation_id: str) -> dict:
+        return await get_conversation_summary(conversation_id)
+
+    async def save_summary(self, conversation_id: str, summary: str, until: str) -> bool:
+        return await save_conversation_summary(conversation_id, summary, until)
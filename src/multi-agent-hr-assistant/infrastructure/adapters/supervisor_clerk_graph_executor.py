@@ -1,64 +1,36 @@
-from domain.ports import ClerkGraphExecutionPort
+from domain.ports import ClerkGraphExecutionPort, LeaveBalancePort, TicketCreationPort
 from application.states import ClerkState
 from application.agents.clerk import ClerkAgent
-from infrastructure.llm_providers.groq_provider import create_model_instance
-from infrastructure.adapters.clerk_leave_balance_adapter import ClerkLeaveBalanceAdapter
-from infrastructure.adapters.clerk_ticket_creation_adapter import ClerkTicketCreationAdapter
-from infrastructure.redis.redis_client import get_agent_state_for_final_response, save_agent_state_for_final_response
+from langchain_core.language_models.chat_models import BaseChatModel
+from infrastructure.redis.redis_client import save_agent_status
 from domain.entities import AgentState
+from config import AGENT_STATUS_TRACKING_ENABLED
 class SupervisorClerkGraphExecutor(ClerkGraphExecutionPort):
-    def __init__(self,state:ClerkState):
-        self.clerk_state=state
-    
+    def __init__(self,llm_model:BaseChatModel,leave_balance_port:LeaveBalancePort,ticket_creation_port:TicketCreationPort,track_status:bool=AGENT_STATUS_TRACKING_ENABLED):
+        self.clerk_agent=ClerkAgent(llm_model,leave_balance_port,ticket_creation_port)
+        self.track_status=track_status
 
-    #function to update the state of clerk
-    def update_clerk_state(self,state:ClerkState):
-        self.clerk_state=state
-    #Method to execute the Clerk Agent State Graph
-    async def execute_clerk_agent_graph(self)->bool:
-        agent_state=None
-        try:
-            llm_model=create_model_instance("openai/gpt-oss-20b")
-            leave_balance_port=ClerkLeaveBalanceAdapter()
-            ticket_creation_port=ClerkTicketCreationAdapter()
-            clerk_agent=ClerkAgent(llm_model,leave_balance_port,ticket_creation_port)
-
-            #Creating the Clerk Agent Graph
-            clerk_graph=clerk_agent.create_clerk_agent_graph()
-            
-            #Agent State to be saved in Redis before execution
-            agent_state=AgentState(
-                user_id=self.clerk_state.user_query.user_id,
-                key=self.clerk_state.user_query.conversation_id,
-                agent_name="Clerk",
-                state={
-                    "status":"initialized",
-                    "final_response":"",
-                    "error":None
-                }
-            )
-
-            #calling the Redis function to save the initial state of the Clerk Agent before execution
-            save_agent_state_for_final_response(agent_state)
+        #Compiling the Clerk Agent Graph once, every execution only supplies its own ClerkState
+        self.clerk_graph=self.clerk_agent.create_clerk_agent_graph()
 
-            agent_state.state["status"]="running"
-            save_agent_state_for_final_response(agent_state)
+    #Method to record the outcome of a run in Redis when status tracking is enabled
+    async def _record_status(self,state:ClerkState,status:str,final_response:str="",error:str=None)->None:
+        if not self.track_status:
+            return
+        await save_agent_status(AgentState(
+            user_id=state.user_query.user_id,
+            key=state.user_query.conversation_id,
+            agent_name="Clerk",
+            state={"status":status,"final_response":final_response,"error":error}
+        ))
 
-            #Executing the Clerk Agent Graph
-            await clerk_graph.ainvoke(self.clerk_state)
-
-            existing = get_agent_state_for_final_response(
-                self.clerk_state.user_query.user_id,
-                self.clerk_state.user_query.conversation_id,
-                "Clerk"
-            )
-            agent_state.state = {**existing, "status": "completed"}
-            save_agent_state_for_final_response(agent_state)
-
-            return True
+    #Method to execute the Clerk Agent State Graph, the final response is returned in process
+    async def execute_clerk_agent_graph(self,state:ClerkState)->str:
+        try:
+            final_state=await self.clerk_graph.ainvoke(state)
+            response=final_state.get("response") or ""
+            await self._record_status(state,"completed",final_response=response)
+            return response
         except Exception as e:
-            if agent_state:
-                agent_state.state["status"]="error"
-                agent_state.state["error"]=str(e)
-                save_agent_state_for_final_response(agent_state)
-            raise RuntimeError(f"Failed to execute Clerk Agent Graph: {str(e)}")
\ No newline at end of file
+            await self._record_status(state,"error",error=str(e))
+            raise RuntimeError(f"Failed to execute Clerk Agent Graph: {str(e)}")
@@ -0,0 +1,59 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+#In-process LRU cache where every entry also expires after a time-to-live
+class LRUTTLCache:
+    def __init__(self,max_size:int=1024,ttl_seconds:float=60):
+        self.max_size=max_size
+        self.ttl_seconds=ttl_seconds
+        self._entries:OrderedDict[Hashable,tuple[float,Any]]=OrderedDict()
+        self._lock=threading.Lock()
+        self.hits=0
+        self.misses=0
+
+    def get(self,key:Hashable)->Optional[Any]:
+        """
+        Return the cached value for the key, or None if it is missing or expired.
+        """
+        with self._lock:
+            entry=self._entries.get(key)
+            if entry is None:
+                self.misses+=1
+                return None
+            expires_at,value=entry
+            if expires_at<=time.monotonic():
+                del self._entries[key]
+                self.misses+=1
+                return None
+            self._entries.move_to_end(key)
+            self.hits+=1
+            return value
+
+    def set(self,key:Hashable,value:Any,ttl_seconds:Optional[float]=None)->None:
+        """
+        Store the value, evicting the least recently used entry when the cache is full.
+        args:
+            ttl_seconds (float): optional per-entry TTL, defaults to the cache TTL.
+        """
+        ttl=self.ttl_seconds if ttl_seconds is None else min(ttl_seconds,self.ttl_seconds)
+        if ttl<=0:
+            return
+        with self._lock:
+            self._entries[key]=(time.monotonic()+ttl,value)
+            self._entries.move_to_end(key)
+            while len(self._entries)>self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self,key:Hashable)->None:
+        with self._lock:
+            self._entries.pop(key,None)
+
+    def clear(self)->None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self)->dict:
+        with self._lock:
+            return {"size":len(self._entries),"hits":self.hits,"misses":self.misses}
@@ -0,0 +1,37 @@
+import httpx
+from typing import Optional
+from config import (
+    HTTP_CONNECT_TIMEOUT_SECONDS,
+    HTTP_READ_TIMEOUT_SECONDS,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    HTTP_KEEPALIVE_EXPIRY_SECONDS,
+)
+
+#Process-wide async HTTP client, its connection pool keeps connections alive between tool calls
+_http_client:Optional[httpx.AsyncClient]=None
+
+#function to build a client with bounded connections and explicit timeouts
+def create_http_client(**kwargs)->httpx.AsyncClient:
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(HTTP_READ_TIMEOUT_SECONDS,connect=HTTP_CONNECT_TIMEOUT_SECONDS),
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+        **kwargs,
+    )
+
+def get_http_client()->httpx.AsyncClient:
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client=create_http_client()
+    return _http_client
+
+#function to close the shared client, called on shutdown
+async def close_http_client()->None:
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client=None
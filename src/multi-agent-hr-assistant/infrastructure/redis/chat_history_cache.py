@@ -0,0 +1,73 @@
+import json
+from typing import Optional
+from redis.exceptions import WatchError
+from infrastructure.redis.redis_config import get_shared_async_redis_client
+from config import CHAT_HISTORY_WINDOW, CHAT_HISTORY_CACHE_TTL_SECONDS
+
+#Capped Redis list per conversation holding the most recent CHAT_HISTORY_WINDOW messages.
+#Every write bumps a version counter so a cache fill that raced with a write is discarded.
+
+def _history_key(conversation_id:str)->str:
+    return f"chat_history:{conversation_id}"
+
+def _version_key(conversation_id:str)->str:
+    return f"chat_history_version:{conversation_id}"
+
+#function to keep only the fields needed to rebuild the conversation
+def _to_cache_entry(message:dict)->str:
+    return json.dumps({
+        "id": message.get("id"),
+        "type": message.get("type"),
+        "content": message.get("content"),
+        "created_at": message.get("created_at"),
+    })
+
+#function to read the cached history window, returns (messages or None on miss, version seen)
+async def get_cached_chat_history(conversation_id:str)->tuple[Optional[list], Optional[str]]:
+    try:
+        redis=get_shared_async_redis_client()
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.get(_version_key(conversation_id))
+            pipe.exists(_history_key(conversation_id))
+            pipe.lrange(_history_key(conversation_id), 0, -1)
+            version, exists, entries = await pipe.execute()
+        if not exists:
+            return None, version
+        return [json.loads(entry) for entry in entries], version
+    except Exception as e:
+        print("Error reading chat history from Redis:", str(e))
+        return None, None
+
+#function to fill the cache from Postgres, skipped if a message was written since the version was read
+async def cache_chat_history(conversation_id:str, messages:list, version_seen:Optional[str])->None:
+    if not messages:
+        return
+    try:
+        redis=get_shared_async_redis_client()
+        async with redis.pipeline(transaction=True) as pipe:
+            await pipe.watch(_version_key(conversation_id))
+            if await pipe.get(_version_key(conversation_id)) != version_seen:
+                await pipe.unwatch()
+                return
+            pipe.multi()
+            pipe.delete(_history_key(conversation_id))
+            pipe.rpush(_history_key(conversation_id), *[_to_cache_entry(m) for m in messages[-CHAT_HISTORY_WINDOW:]])
+            pipe.expire(_history_key(conversation_id), CHAT_HISTORY_CACHE_TTL_SECONDS)
+            await pipe.execute()
+    except WatchError:
+        pass
+    except Exception as e:
+        print("Error caching chat history in Redis:", str(e))
+
+#function to append a saved message to the cached window, only if the window is already cached
+async def append_cached_chat_message(conversation_id:str, message:dict)->None:
+    try:
+        redis=get_shared_async_redis_client()
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.incr(_version_key(conversation_id))
+            pipe.expire(_version_key(conversation_id), CHAT_HISTORY_CACHE_TTL_SECONDS)
+            pipe.rpushx(_history_key(conversation_id), _to_cache_entry(message))
+            pipe.ltrim(_history_key(conversation_id), -CHAT_HISTORY_WINDOW, -1)
+            await pipe.execute()
+    except Exception as e:
+        print("Error appending chat message to Redis:", str(e))
@@ -0,0 +1,35 @@
+import json
+from infrastructure.redis.redis_config import get_shared_async_redis_client
+from config import CONVERSATION_SUMMARY_TTL_SECONDS
+
+#Rolling conversation summary per conversation, stored as {"summary", "until"} where until is the
+#created_at of the last message folded into the summary.
+
+def _summary_key(conversation_id:str)->str:
+    return f"conversation_summary:{conversation_id}"
+
+#function to read the stored summary, returns an empty dict if none is stored
+async def get_conversation_summary(conversation_id:str)->dict:
+    try:
+        redis=get_shared_async_redis_client()
+        summary_json=await redis.get(_summary_key(conversation_id))
+        if summary_json:
+            return json.loads(summary_json)
+        return {}
+    except Exception as e:
+        print("Error retrieving conversation summary from Redis:", str(e))
+        return {}
+
+#function to store the summary
+async def save_conversation_summary(conversation_id:str, summary:str, until:str)->bool:
+    try:
+        redis=get_shared_async_redis_client()
+        await redis.set(
+            _summary_key(conversation_id),
+            json.dumps({"summary": summary, "until": until}),
+            ex=CONVERSATION_SUMMARY_TTL_SECONDS,
+        )
+        return True
+    except Exception as e:
+        print("Error saving conversation summary to Redis:", str(e))
+        return False
@@ -0,0 +1,29 @@
+import json
+from typing import Optional
+from infrastructure.redis.redis_config import get_shared_async_redis_client
+from config import DECOMPOSITION_CACHE_TTL_SECONDS
+
+def _decomposition_key(cache_key:str)->str:
+    return f"decomposition:{cache_key}"
+
+#function to read a cached decomposition, returns the list of task dicts or None on a miss
+async def get_cached_decomposition(cache_key:str)->Optional[list]:
+    try:
+        redis=get_shared_async_redis_client()
+        tasks_json=await redis.get(_decomposition_key(cache_key))
+        if tasks_json:
+            return json.loads(tasks_json)
+        return None
+    except Exception as e:
+        print("Error retrieving decomposition from Redis:", str(e))
+        return None
+
+#function to cache a decomposition
+async def save_cached_decomposition(cache_key:str, tasks:list)->bool:
+    try:
+        redis=get_shared_async_redis_client()
+        await redis.set(_decomposition_key(cache_key), json.dumps(tasks), ex=DECOMPOSITION_CACHE_TTL_SECONDS)
+        return True
+    except Exception as e:
+        print("Error saving decomposition to Redis:", str(e))
+        return False
@@ -0,0 +1,76 @@
+import json
+import time
+from typing import Optional
+from infrastructure.redis.redis_config import get_shared_async_redis_client
+from config import JOB_TTL_SECONDS, JOB_PAYLOAD_TTL_SECONDS
+
+#Redis-backed queue of process_query jobs.
+#Job ids are pushed on a list consumed by the job workers, the status of each job lives in a hash with a TTL.
+#Payloads are kept apart under a short TTL because they hold the caller's auth token.
+JOB_QUEUE_KEY="process_query_jobs"
+
+def _job_key(job_id:str)->str:
+    return f"job:{job_id}"
+
+def _job_payload_key(job_id:str)->str:
+    return f"job_payload:{job_id}"
+
+#function to record a job as queued and push its payload on the queue
+async def enqueue_job(job_id:str, payload:dict, user_id:str, conversation_id:str)->bool:
+    try:
+        redis=get_shared_async_redis_client()
+        now=str(time.time())
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.hset(_job_key(job_id), mapping={
+                "job_id": job_id,
+                "status": "queued",
+                "user_id": user_id,
+                "conversation_id": conversation_id,
+                "created_at": now,
+                "updated_at": now,
+            })
+            pipe.expire(_job_key(job_id), JOB_TTL_SECONDS)
+            pipe.set(_job_payload_key(job_id), json.dumps(payload), ex=JOB_PAYLOAD_TTL_SECONDS)
+            pipe.rpush(JOB_QUEUE_KEY, job_id)
+            await pipe.execute()
+        return True
+    except Exception as e:
+        print("Error enqueuing job in Redis:", str(e))
+        return False
+
+#function to wait for the next job, returns None if no job arrived within the timeout.
+#The payload is deleted as it is read, it is None if it expired before a worker took the job.
+#Redis errors are raised so the workers can back off instead of polling again straight away
+async def dequeue_job(timeout:int=1)->Optional[dict]:
+    redis=get_shared_async_redis_client()
+    item=await redis.blpop(JOB_QUEUE_KEY, timeout=timeout)
+    if not item:
+        return None
+    job_id=item[1]
+    payload=await redis.getdel(_job_payload_key(job_id))
+    return {"job_id": job_id, "payload": json.loads(payload) if payload else None}
+
+#function to update the status fields of a job, returns the updated job
+async def update_job(job_id:str, **fields)->dict:
+    try:
+        redis=get_shared_async_redis_client()
+        mapping={k: v for k, v in fields.items() if v is not None}
+        mapping["updated_at"]=str(time.time())
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.hset(_job_key(job_id), mapping=mapping)
+            pipe.expire(_job_key(job_id), JOB_TTL_SECONDS)
+            pipe.hgetall(_job_key(job_id))
+            *_, job=await pipe.execute()
+        return job
+    except Exception as e:
+        print("Error updating job in Redis:", str(e))
+        return {}
+
+#function to get the status of a job, returns an empty dict if it does not exist or has expired
+async def get_job(job_id:str)->dict:
+    try:
+        redis=get_shared_async_redis_client()
+        return await redis.hgetall(_job_key(job_id))
+    except Exception as e:
+        print("Error retrieving job from Redis:", str(e))
+        return {}
@@ -0,0 +1,38 @@
+from typing import Optional
+from infrastructure.redis.redis_config import get_shared_async_redis_client
+from config import LEAVE_BALANCE_CACHE_TTL_SECONDS
+
+def _leave_balance_key(user_id:str)->str:
+    return f"leave_balance:{user_id}"
+
+#function to read the cached leave balance of a user, returns None on a miss
+async def get_cached_leave_balance(user_id:str)->Optional[int]:
+    try:
+        redis=get_shared_async_redis_client()
+        balance=await redis.get(_leave_balance_key(user_id))
+        if balance is not None:
+            return int(balance)
+        return None
+    except Exception as e:
+        print("Error retrieving leave balance from Redis:", str(e))
+        return None
+
+#function to cache the leave balance of a user
+async def save_cached_leave_balance(user_id:str, balance:int)->bool:
+    try:
+        redis=get_shared_async_redis_client()
+        await redis.set(_leave_balance_key(user_id), int(balance), ex=LEAVE_BALANCE_CACHE_TTL_SECONDS)
+        return True
+    except Exception as e:
+        print("Error saving leave balance to Redis:", str(e))
+        return False
+
+#function to drop the cached leave balance of a user, called whenever a leave ticket is created
+async def invalidate_leave_balance(user_id:str)->bool:
+    try:
+        redis=get_shared_async_redis_client()
+        await redis.delete(_leave_balance_key(user_id))
+        return True
+    except Exception as e:
+        print("Error deleting leave balance from Redis:", str(e))
+        return False
@@ -1,29 +1,18 @@
-from infrastructure.redis.redis_config import get_redis_client
+from infrastructure.redis.redis_config import get_redis_client, get_shared_async_redis_client
 from domain.entities import AgentState
 import json
 redis=get_redis_client()
 
-#function to save agent state to Redis
-def save_agent_state_for_final_response(agent_state:AgentState):
+#function to record the status of an agent run for observability, a single SET on the shared async client
+async def save_agent_status(agent_state:AgentState):
     try:
-        redis.set(
+        await get_shared_async_redis_client().set(
             f"user_id:{agent_state.user_id}:conversation_id:{agent_state.key}:state:agent:{agent_state.agent_name}",
             json.dumps(agent_state.state),
             ex=600
         )
     except Exception as e:
-        print("Error saving agent state to Redis:", str(e))
-
-#function to retrieve agent state from Redis
-def get_agent_state_for_final_response(user_id:str, key:str, agent_name:str) -> dict:
-    try:
-        state_json = redis.get(f"user_id:{user_id}:conversation_id:{key}:state:agent:{agent_name}")
-        if state_json:
-            return json.loads(state_json)
-        return {}
-    except Exception as e:
-        print("Error retrieving agent state from Redis:", str(e))
-        return {}
+        print("Error saving agent status to Redis:", str(e))
 
 #function to save the state of the agent for HITL intervention to Redis
 def save_agent_state_for_hitl_intervention(agent_state:AgentState):
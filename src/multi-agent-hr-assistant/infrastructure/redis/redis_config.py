@@ -1,4 +1,5 @@
 import os
+from urllib.parse import quote
 import redis
 import redis.asyncio as aioredis
 
@@ -14,9 +15,21 @@ redis_client = redis.Redis(
     socket_keepalive=True,
 )
 
+#shared async client for request-path commands, its connection pool is reused across calls
+async_redis_client = aioredis.Redis(
+    host=REDIS_HOST,
+    port=REDIS_PORT,
+    password=REDIS_PASSWORD,
+    decode_responses=True,
+    socket_keepalive=True,
+)
+
 def get_redis_client() -> redis.Redis:
     return redis_client
 
+def get_shared_async_redis_client() -> aioredis.Redis:
+    return async_redis_client
+
 def get_async_redis_client() -> aioredis.Redis:
     return aioredis.Redis(
         host=REDIS_HOST,
@@ -24,4 +37,9 @@ def get_async_redis_client() -> aioredis.Redis:
         password=REDIS_PASSWORD,
         decode_responses=True,
         socket_keepalive=True,
-    )
\ No newline at end of file
+    )
+
+#function to build the Redis URL, used by clients that only accept a URL such as the Socket.IO manager
+def get_redis_url(db: int = 0) -> str:
+    credentials = f":{quote(REDIS_PASSWORD, safe='')}@" if REDIS_PASSWORD else ""
+    return f"redis://{credentials}{REDIS_HOST}:{REDIS_PORT}/{db}"
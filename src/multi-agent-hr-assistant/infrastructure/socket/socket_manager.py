@@ -1,11 +1,40 @@
 import socketio
+from socketio.exceptions import ConnectionRefusedError
+from infrastructure.redis.redis_config import get_redis_url
+from infrastructure.redis.job_queue import get_job
+from infrastructure.supabase.supabase_client import is_chat_owned_by_user
+from infrastructure.supabase.token_verifier import verify_auth_token
+from config import SOCKETIO_REDIS_MANAGER_ENABLED
 
-socket_manager = socketio.AsyncServer(async_mode='asgi', cors_allowed_origins=[])
+def create_client_manager(enabled: bool = SOCKETIO_REDIS_MANAGER_ENABLED):
+    # With several worker processes every emit goes through Redis, so a client receives it
+    # whichever worker it is connected to
+    if not enabled:
+        return None
+    return socketio.AsyncRedisManager(get_redis_url(), channel="socketio", redis_options={"socket_keepalive": True})
+
+
+client_manager = create_client_manager()
+
+socket_manager = socketio.AsyncServer(async_mode='asgi', cors_allowed_origins=[], client_manager=client_manager)
 
 socket_app = socketio.ASGIApp(socket_manager)
 
+
+def user_room(user_id: str) -> str:
+    return f"user:{user_id}"
+
+
 @socket_manager.event
-async def connect(sid, environ):
+async def connect(sid, environ, auth=None):
+    # Every socket must authenticate, it is then placed in the room of its user
+    token = (auth or {}).get("token")
+    user = await verify_auth_token(token)
+    if not user:
+        raise ConnectionRefusedError("Invalid auth token")
+
+    await socket_manager.save_session(sid, {"user_id": user.id})
+    await socket_manager.enter_room(sid, user_room(user.id))
     print(f"Client connected: {sid}")
 
 @socket_manager.event
@@ -14,20 +43,43 @@ async def disconnect(sid):
 
 @socket_manager.event
 async def join_room(sid, room):
+    """
+    Joins a conversation or job room after checking that it belongs to the user of the socket.
+    """
+    session = await socket_manager.get_session(sid)
+    user_id = session.get("user_id")
+    kind, _, resource_id = str(room).partition(":")
+
+    if kind == "conversation" and resource_id:
+        allowed = await is_chat_owned_by_user(resource_id, user_id)
+    elif kind == "job" and resource_id:
+        allowed = (await get_job(resource_id)).get("user_id") == user_id
+    else:
+        allowed = False
+
+    if not allowed:
+        print(f"Client {sid} was refused room: {room}")
+        return {"ok": False}
+
     await socket_manager.enter_room(sid, room)
     print(f"Client {sid} joined room: {room}")
+    return {"ok": True}
 
 async def broadcast_hitl_event(user_id: str, conversation_id: str, agent_name: str, event_data: dict):
     """
-    Broadcasts a HITL event directly to connected Socket.IO clients.
+    Sends a HITL event to the sockets of the user that owns the conversation.
     """
     channel = f"HITL_Intervention_Channel:{user_id}:{conversation_id}:{agent_name}"
-    # print(f"[SOCKET] Broadcasting HITL event to channel '{channel}'")
+    # print(f"[SOCKET] Emitting HITL event to channel '{channel}'")
     # print(f"[SOCKET] Payload being emitted: {event_data}")
 
+    await socket_manager.emit(channel, event_data, room=user_room(user_id))
 
-    await socket_manager.emit(channel, event_data)
+    print(f"[SOCKET] Emit complete for channel '{channel}'")
 
-    await socket_manager.emit('message', {"channel": channel, "event_data": event_data})
 
-    print(f"[SOCKET] Emit complete for channel '{channel}'")
\ No newline at end of file
+async def emit_job_update(job: dict):
+    """
+    Pushes the status of a background job to the clients that joined its room.
+    """
+    await socket_manager.emit("job_update", job, room=f"job:{job.get('job_id')}")
@@ -0,0 +1,130 @@
+import asyncio
+import uuid
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Optional
+from config import (
+    MESSAGE_WRITE_QUEUE_MAX_SIZE,
+    MESSAGE_WRITE_BATCH_SIZE,
+    MESSAGE_WRITE_FLUSH_INTERVAL_SECONDS,
+    MESSAGE_WRITE_MAX_RETRIES,
+    MESSAGE_WRITE_RETRY_BACKOFF_SECONDS,
+    MESSAGE_WRITE_SHUTDOWN_TIMEOUT_SECONDS,
+)
+
+#function to get the timestamp stored in created_at, every message row is stamped with the app clock
+#so direct inserts and queued rows are ordered on the same clock
+def message_timestamp()->str:
+    return datetime.now(timezone.utc).isoformat()
+
+#Write-behind queue for message inserts.
+#Rows get their id and created_at when they are queued, so the caller can use them straight away
+#and a retried batch can be upserted on id without creating duplicates.
+class MessageWriteBehindQueue:
+    def __init__(
+        self,
+        insert_batch:Callable[[list[dict]],Awaitable[bool]],
+        max_size:int=MESSAGE_WRITE_QUEUE_MAX_SIZE,
+        batch_size:int=MESSAGE_WRITE_BATCH_SIZE,
+        flush_interval:float=MESSAGE_WRITE_FLUSH_INTERVAL_SECONDS,
+        max_retries:int=MESSAGE_WRITE_MAX_RETRIES,
+        retry_backoff:float=MESSAGE_WRITE_RETRY_BACKOFF_SECONDS,
+    ):
+        self.insert_batch=insert_batch
+        self.batch_size=batch_size
+        self.flush_interval=flush_interval
+        self.max_retries=max_retries
+        self.retry_backoff=retry_backoff
+        self._queue:asyncio.Queue=asyncio.Queue(maxsize=max_size)
+        #rows that are queued or being written, readable before they reach the database
+        self._pending:dict[str,dict]={}
+        self._worker:Optional[asyncio.Task]=None
+
+    def start(self)->None:
+        if self._worker is None or self._worker.done():
+            self._worker=asyncio.create_task(self._run())
+
+    async def enqueue(self,message_data:dict)->dict:
+        """
+        Queue a message insert and return the row as it will be stored.
+        Waits for space when the buffer is full so callers are slowed down instead of rows being dropped.
+        args:
+            message_data (dict): Columns of the message row.
+        returns:
+            dict: The row including its generated id and created_at.
+        """
+        row={
+            "id": str(uuid.uuid4()),
+            "created_at": message_timestamp(),
+            **message_data,
+        }
+        self._pending[row["id"]]=row
+        await self._queue.put(row)
+        return row
+
+    #function to list the rows of a conversation that are not in the database yet, oldest first
+    def pending(self,chat_id:str)->list[dict]:
+        return [row for row in self._pending.values() if row.get("chat_id")==chat_id]
+
+    async def _run(self)->None:
+        loop=asyncio.get_running_loop()
+        while True:
+            batch=[await self._queue.get()]
+            deadline=loop.time()+self.flush_interval
+            while len(batch)<self.batch_size:
+                timeout=deadline-loop.time()
+                if timeout<=0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(),timeout=timeout))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await self._flush(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    #function to write one batch, retried with exponential backoff
+    async def _flush(self,batch:list[dict])->bool:
+        for attempt in range(1,self.max_retries+1):
+            try:
+                if await self.insert_batch(batch):
+                    self._forget(batch)
+                    return True
+            except Exception as e:
+                print(f"Error writing message batch (attempt {attempt}/{self.max_retries}):", str(e) or type(e).__name__)
+            if attempt<self.max_retries:
+                await asyncio.sleep(self.retry_backoff*(2**(attempt-1)))
+        print(f"Dropping {len(batch)} messages after {self.max_retries} failed write attempts")
+        self._forget(batch)
+        return False
+
+    def _forget(self,batch:list[dict])->None:
+        for row in batch:
+            self._pending.pop(row["id"],None)
+
+    async def close(self,timeout:float=MESSAGE_WRITE_SHUTDOWN_TIMEOUT_SECONDS)->None:
+        """
+        Flush the queued rows and stop the worker, called on shutdown.
+        args:
+            timeout (float): Maximum number of seconds to wait for the queue to drain.
+        """
+        if self._worker is None or self._worker.done():
+            #no worker is running, write whatever is left directly
+            while not self._queue.empty():
+                batch=[self._queue.get_nowait() for _ in range(min(self.batch_size,self._queue.qsize()))]
+                await self._flush(batch)
+                for _ in batch:
+                    self._queue.task_done()
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(),timeout=timeout)
+        except asyncio.TimeoutError:
+            print(f"Timed out flushing messages on shutdown, {self._queue.qsize()} still queued")
+        finally:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker=None
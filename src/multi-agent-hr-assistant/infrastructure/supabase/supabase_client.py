@@ -1,55 +1,139 @@
-from supabase import create_client,Client
-from config import key,url,service_key
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+from supabase import create_client,Client,ClientOptions
+from config import key,url,service_key,SUPABASE_MAX_WORKERS,SUPABASE_TIMEOUT_SECONDS,CHAT_HISTORY_WINDOW,LEAVE_BALANCE_CACHE_ENABLED
+from infrastructure.redis.chat_history_cache import get_cached_chat_history,cache_chat_history,append_cached_chat_message
+from infrastructure.redis.leave_balance_cache import get_cached_leave_balance,save_cached_leave_balance,invalidate_leave_balance
+from infrastructure.supabase.message_write_behind import MessageWriteBehindQueue,message_timestamp
 
-supabase:Client=create_client(url,key)
-_service_supabase:Client=create_client(url,service_key)
+T=TypeVar("T")
+
+#Both clients are created once and reused, so every call goes over the same pooled HTTP connections
+_client_options=ClientOptions(postgrest_client_timeout=SUPABASE_TIMEOUT_SECONDS)
+supabase:Client=create_client(url,key,options=_client_options)
+_service_supabase:Client=create_client(url,service_key,options=_client_options)
+
+#Bounded pool used to run the blocking Supabase calls off the event loop
+_supabase_executor=ThreadPoolExecutor(max_workers=SUPABASE_MAX_WORKERS,thread_name_prefix="supabase")
+
+#function to run a blocking Supabase call in the bounded thread pool with a per-call timeout
+async def _run_blocking(func:Callable[[],T],timeout:float=SUPABASE_TIMEOUT_SECONDS)->T:
+    loop=asyncio.get_running_loop()
+    return await asyncio.wait_for(loop.run_in_executor(_supabase_executor,func),timeout=timeout)
+
+#function to release the thread pool on shutdown
+def shutdown_supabase_executor():
+    _supabase_executor.shutdown(wait=False,cancel_futures=True)
 
 #function to get user details from supabase using auth token
-def get_user_from_token(token:str):
+async def get_user_from_token(token:str):
     try:
-        response=supabase.auth.get_user(token)
+        response=await _run_blocking(lambda: supabase.auth.get_user(token))
         return response.user
     except Exception as e:
-        print("Error retrieving user from token:", str(e))
+        print("Error retrieving user from token:", str(e) or type(e).__name__)
         return None
-    
-#function to get the previous chat history using user_id and conversation_id
-def get_chat_history(conversation_id:str)->list:
+
+#function to get a window of the chat history, oldest first.
+#The latest window is served from the Redis cache, older pages are read with keyset pagination on created_at.
+async def get_chat_history(conversation_id:str,limit:int=CHAT_HISTORY_WINDOW,before:Optional[str]=None)->list:
+    version_seen=None
+    if before is None and limit<=CHAT_HISTORY_WINDOW:
+        cached,version_seen=await get_cached_chat_history(conversation_id)
+        if cached is not None:
+            return cached[-limit:]
     try:
-        response=supabase.table("messages").select("*").eq("chat_id", conversation_id).order("created_at", desc=False).execute()
-        return response.data
+        def query():
+            request=supabase.table("messages").select("id,content,type,created_at").eq("chat_id", conversation_id)
+            if before is not None:
+                request=request.lt("created_at", before)
+            return request.order("created_at", desc=True).limit(limit).execute()
+
+        response=await _run_blocking(query)
+        history=list(reversed(response.data))
+        if before is None:
+            #messages still in the write-behind queue are not in Postgres yet
+            stored_ids={msg.get("id") for msg in history}
+            queued=[msg for msg in _message_writer.pending(conversation_id) if msg["id"] not in stored_ids]
+            if queued:
+                history=sorted(history+queued,key=lambda msg: msg.get("created_at") or "")[-limit:]
+        if before is None and limit>=CHAT_HISTORY_WINDOW:
+            await cache_chat_history(conversation_id,history,version_seen)
+        return history
     except Exception as e:
-        print("Error retrieving chat history:", str(e))
+        print("Error retrieving chat history:", str(e) or type(e).__name__)
         return []
-    
-#function to save messages to the database
-def save_message_to_db(message_data:dict)->bool:
+
+#function to save messages to the database, returns the inserted row or None on failure
+async def save_message_to_db(message_data:dict)->Optional[dict]:
     try:
-        response=_service_supabase.table("messages").insert(message_data).execute()
-        return len(response.data)>0
+        #stamped here rather than by now() in Postgres, queued AI rows use the same clock
+        message_data={"created_at": message_timestamp(), **message_data}
+        response=await _run_blocking(lambda: _service_supabase.table("messages").insert(message_data).execute())
+        if not response.data:
+            return None
+        saved=response.data[0]
+        await append_cached_chat_message(message_data["chat_id"],saved)
+        return saved
     except Exception as e:
-        print("Error saving message to database:", str(e))
-        return False
+        print("Error saving message to database:", str(e) or type(e).__name__)
+        return None
 
-def is_chat_owned_by_user(chat_id:str,user_id:str)->bool:
+#function to insert a batch of messages in one call, upserting on id so a retried batch is not duplicated
+async def _insert_messages_batch(rows:list[dict])->bool:
+    response=await _run_blocking(
+        lambda: _service_supabase.table("messages").upsert(rows,on_conflict="id",ignore_duplicates=True).execute()
+    )
+    return response is not None
+
+_message_writer=MessageWriteBehindQueue(_insert_messages_batch)
+
+#function to queue a message insert, returns the row as it will be stored
+async def enqueue_message_to_db(message_data:dict)->dict:
+    row=await _message_writer.enqueue(message_data)
+    await append_cached_chat_message(message_data["chat_id"],row)
+    return row
+
+#function to start the background message writer, called on startup
+def start_message_writer():
+    _message_writer.start()
+
+#function to flush the queued messages, called on shutdown before the executor is released
+async def close_message_writer():
+    await _message_writer.close()
+
+async def is_chat_owned_by_user(chat_id:str,user_id:str)->bool:
     try:
-        response=_service_supabase.table("chats").select("chat_id").eq("chat_id", chat_id).eq("user_id", user_id).limit(1).execute()
+        response=await _run_blocking(
+            lambda: _service_supabase.table("chats").select("chat_id").eq("chat_id", chat_id).eq("user_id", user_id).limit(1).execute()
+        )
         return len(response.data)>0
     except Exception as e:
-        print("Error validating chat ownership:", str(e))
+        print("Error validating chat ownership:", str(e) or type(e).__name__)
         return False
 
-#function to get the leave balance for a user using user_id
-async def fetch_user_leave_balance(user_id:str)->int:
+#function to get the leave balance for a user using user_id, returns None if the user has no balance row.
+#Errors are raised instead of being reported as a zero balance, only real balances are cached
+async def fetch_user_leave_balance(user_id:str)->Optional[int]:
+    if LEAVE_BALANCE_CACHE_ENABLED:
+        cached_balance=await get_cached_leave_balance(user_id)
+        if cached_balance is not None:
+            return cached_balance
     try:
-        response=_service_supabase.table("leave_balance").select("balance").eq("user_id", user_id).maybe_single().execute()
-        if response.data:
-            return response.data.get("balance", 0)
-        return 0
+        response=await _run_blocking(
+            lambda: _service_supabase.table("leave_balance").select("balance").eq("user_id", user_id).maybe_single().execute()
+        )
     except Exception as e:
-        print("Error retrieving leave balance:", str(e))
-        return 0
-    
+        print("Error retrieving leave balance:", str(e) or type(e).__name__)
+        raise
+    balance=response.data.get("balance") if response and response.data else None
+    if balance is None:
+        return None
+    if LEAVE_BALANCE_CACHE_ENABLED:
+        await save_cached_leave_balance(user_id, balance)
+    return balance
+
 #function to create a ticket in the database
 async def create_ticket_in_db(ticket_data:dict)->bool:
     try:
@@ -57,8 +141,13 @@ async def create_ticket_in_db(ticket_data:dict)->bool:
             k: v for k, v in ticket_data.items()
             if k not in {"accepted"} and v is not None
         }
-        response=_service_supabase.table("tickets").insert(db_payload).execute()
-        return len(response.data)>0
+        response=await _run_blocking(lambda: _service_supabase.table("tickets").insert(db_payload).execute())
+        created=len(response.data)>0
+        #creating a ticket does not change the balance, only its acceptance does (handle_ticket_update in setup.sql).
+        #The key is still dropped so the user's next check after filing a leave request reads the database
+        if created and ticket_data.get("ticket_type")=="leave" and ticket_data.get("user_id"):
+            await invalidate_leave_balance(ticket_data["user_id"])
+        return created
     except Exception as e:
-        print("Error creating ticket in database:", str(e))
-        return False
\ No newline at end of file
+        print("Error creating ticket in database:", str(e) or type(e).__name__)
+        return False
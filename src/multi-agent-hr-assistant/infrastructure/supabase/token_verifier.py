@@ -0,0 +1,74 @@
+import time
+from hashlib import sha256
+from typing import Any, Awaitable, Callable, Optional
+import jwt
+from config import jwt_secret,AUTH_CACHE_TTL_SECONDS,AUTH_CACHE_MAX_SIZE
+from infrastructure.cache.lru_ttl_cache import LRUTTLCache
+from infrastructure.supabase.supabase_client import get_user_from_token
+
+#Verifies Supabase access tokens locally and caches the token -> user lookup.
+#The remote Supabase call is only made on a cache miss, which also acts as the revocation check
+#because every entry expires after the cache TTL.
+class TokenVerifier:
+    def __init__(
+        self,
+        remote_lookup:Callable[[str],Awaitable[Any]],
+        secret:Optional[str]=None,
+        cache:Optional[LRUTTLCache]=None,
+    ):
+        self.remote_lookup=remote_lookup
+        self.secret=secret
+        self.cache=cache or LRUTTLCache(max_size=AUTH_CACHE_MAX_SIZE,ttl_seconds=AUTH_CACHE_TTL_SECONDS)
+
+    #function to validate the token locally, returns the claims or None if the token is invalid or expired
+    def _validate_locally(self,token:str)->Optional[dict]:
+        try:
+            if self.secret:
+                return jwt.decode(
+                    token,
+                    self.secret,
+                    algorithms=["HS256"],
+                    audience="authenticated",
+                    options={"require":["exp","sub"]},
+                )
+            #without the JWT secret only the expiry can be checked here, the signature is checked remotely
+            return jwt.decode(token,options={"verify_signature":False,"verify_exp":True,"require":["exp"]})
+        except jwt.InvalidTokenError as e:
+            print("Rejected auth token during local validation:", str(e))
+            return None
+
+    async def verify(self,token:str):
+        """
+        Return the Supabase user for the token, or None if the token is invalid.
+        args:
+            token (str): Supabase access token sent by the client.
+        """
+        if not token:
+            return None
+
+        claims=self._validate_locally(token)
+        if claims is None:
+            return None
+
+        cache_key=sha256(token.encode("utf-8")).hexdigest()
+        user=self.cache.get(cache_key)
+        if user is not None:
+            return user
+
+        user=await self.remote_lookup(token)
+        if user is None:
+            return None
+
+        #never keep a user cached past the expiry of the token itself
+        self.cache.set(cache_key,user,ttl_seconds=claims["exp"]-time.time())
+        return user
+
+    def invalidate(self,token:str)->None:
+        self.cache.delete(sha256(token.encode("utf-8")).hexdigest())
+
+
+token_verifier=TokenVerifier(get_user_from_token,secret=jwt_secret)
+
+#function to verify an auth token through the shared verifier
+async def verify_auth_token(token:str):
+    return await token_verifier.verify(token)
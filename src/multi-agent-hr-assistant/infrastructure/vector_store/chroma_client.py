@@ -1,14 +1,63 @@
+import threading
+from typing import Optional
 from langchain_chroma import Chroma
 from langchain_huggingface import HuggingFaceEmbeddings
 
-#function to create the instance of the vector store
-def create_chroma_instance(persist_dir:str='./data/policies')->Chroma:
-    #creating Hugging Face Embedding model
-    embedding_model=HuggingFaceEmbeddings(model_name="sentence-transformers/all-mpnet-base-v2")
+EMBEDDING_MODEL_NAME="sentence-transformers/all-mpnet-base-v2"
 
+#function to create the instance of the vector store
+def create_chroma_instance(embedding_model:HuggingFaceEmbeddings,persist_dir:str='./data/policies')->Chroma:
     vector_store=Chroma(
         collection_name='policy_docs',
         embedding_function=embedding_model,
         persist_directory=persist_dir,
     )
-    return vector_store
\ No newline at end of file
+    return vector_store
+
+#Process-wide provider for the embedding model and the Chroma handle.
+#The embedding model is loaded once and shared by every adapter that needs it.
+class VectorStoreProvider:
+    def __init__(self,model_name:str=EMBEDDING_MODEL_NAME,persist_dir:str='./data/policies'):
+        self.model_name=model_name
+        self.persist_dir=persist_dir
+        self._lock=threading.Lock()
+        self._embedding_model:Optional[HuggingFaceEmbeddings]=None
+        self._vector_store:Optional[Chroma]=None
+
+    def start(self)->None:
+        """
+        Load the embedding model and open the Chroma collection, safe to call more than once.
+        """
+        if self._vector_store is not None:
+            return
+        with self._lock:
+            if self._vector_store is not None:
+                return
+            embedding_model=HuggingFaceEmbeddings(model_name=self.model_name)
+            #running one embedding so the first request does not pay for lazy initialisation
+            embedding_model.embed_query("warm up")
+            self._embedding_model=embedding_model
+            self._vector_store=create_chroma_instance(embedding_model,self.persist_dir)
+
+    def get_embedding_model(self)->HuggingFaceEmbeddings:
+        self.start()
+        return self._embedding_model
+
+    def get_vector_store(self)->Chroma:
+        self.start()
+        return self._vector_store
+
+    def close(self)->None:
+        """
+        Release the embedding model and the Chroma handle.
+        """
+        with self._lock:
+            self._vector_store=None
+            self._embedding_model=None
+
+
+_vector_store_provider=VectorStoreProvider()
+
+#function to get the process-wide vector store provider
+def get_vector_store_provider()->VectorStoreProvider:
+    return _vector_store_provider
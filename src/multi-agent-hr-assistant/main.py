@@ -3,25 +3,35 @@ import os
 sys.path.insert(0, os.path.dirname(__file__))
 
 from fastapi import FastAPI, Header, HTTPException, status
+from fastapi.responses import StreamingResponse
 from starlette.middleware.cors import CORSMiddleware
 from domain.entities import UserQuery, TicketCreation
 from infrastructure.supabase.supabase_client import (
-    get_user_from_token,
     fetch_user_leave_balance,
     create_ticket_in_db,
     get_chat_history,
     save_message_to_db,
+    enqueue_message_to_db,
+    start_message_writer,
+    close_message_writer,
     is_chat_owned_by_user,
+    shutdown_supabase_executor,
 )
+from infrastructure.supabase.token_verifier import verify_auth_token, token_verifier
 from infrastructure.redis.redis_client import publish_event
+from infrastructure.redis.job_queue import enqueue_job, get_job
+from infrastructure.http.http_client import close_http_client
 import asyncio
 import socketio as sio_module
-from infrastructure.socket.socket_manager import socket_manager
-from infrastructure.socket.redis_to_socket_bridge import start_redis_to_socket_bridge as redis_to_socket_bridge
+from infrastructure.socket.socket_manager import socket_manager, emit_job_update
 import json
+import uuid
 from application.states import SupervisorState
 from application.workflow import SupervisorWorkflow
-from langchain_core.messages import HumanMessage, AIMessage
+from application.registry import init_agent_registry, close_agent_registry, get_agent_registry
+from application.services.job_worker_pool import JobWorkerPool
+from config import CACHE_STATS_ENDPOINT_ENABLED
+from langchain_core.messages import HumanMessage
 
 app = FastAPI()
 
@@ -34,22 +44,47 @@ combined_app = CORSMiddleware(
 )
 
 
+workflow: SupervisorWorkflow = None
+job_workers: JobWorkerPool = None
+
+
 @app.on_event("startup")
 async def startup_event():
-    asyncio.create_task(redis_to_socket_bridge())
+    global workflow, job_workers
+    # Build the LLM clients, adapters, embedding model and compiled agent graphs once for the whole process
+    registry = await asyncio.to_thread(init_agent_registry)
+    workflow = SupervisorWorkflow(registry)
+    start_message_writer()
+    job_workers = JobWorkerPool(_run_query_job, notify=emit_job_update)
+    job_workers.start()
 
-@app.post("/process_query")
-async def process_query(user_query: UserQuery) -> dict:
-    user = get_user_from_token(user_query.auth_token)
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    # Let the running jobs finish before the registry and the writers are released
+    if job_workers:
+        await job_workers.close()
+    close_agent_registry()
+    await close_http_client()
+    # Flush the queued AI messages while the Supabase executor is still available
+    await close_message_writer()
+    shutdown_supabase_executor()
+
+
+async def _authorize_chat(token: str, conversation_id: str):
+    user = await verify_auth_token(token)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid auth token")
 
-    user_query.user_id = user.id
-
-    if not is_chat_owned_by_user(user_query.conversation_id, user.id):
+    if not await is_chat_owned_by_user(conversation_id, user.id):
         raise HTTPException(status_code=403, detail="You do not have access to this chat")
+    return user
+
 
-    saved = save_message_to_db({
+async def _persist_user_message(authorization: asyncio.Task, user_query: UserQuery) -> dict:
+    # Never write into a chat before its ownership has been confirmed
+    await authorization
+    saved = await save_message_to_db({
         "chat_id": user_query.conversation_id,
         "content": user_query.query,
         "type": "user",
@@ -58,40 +93,207 @@ async def process_query(user_query: UserQuery) -> dict:
     })
     if not saved:
         raise HTTPException(status_code=500, detail="Failed to save user message")
+    return saved
+
+
+async def _fetch_chat_history(authorization: asyncio.Task, conversation_id: str) -> list:
+    # The history read fills the shared Redis cache, so it also waits for ownership to be confirmed
+    await authorization
+    return await get_chat_history(conversation_id)
+
+
+async def _run_preflight(user_query: UserQuery):
+    """
+    Runs auth + ownership, then the user message persistence and the history fetch concurrently.
+    If any step fails the remaining ones are cancelled and the error is raised.
+    """
+    authorization = asyncio.create_task(_authorize_chat(user_query.auth_token, user_query.conversation_id))
+    persistence = asyncio.create_task(_persist_user_message(authorization, user_query))
+    history = asyncio.create_task(_fetch_chat_history(authorization, user_query.conversation_id))
+    try:
+        return await asyncio.gather(authorization, persistence, history)
+    except BaseException:
+        for task in (authorization, persistence, history):
+            task.cancel()
+        raise
+
 
-    # Fetch previous chat history and convert to LangChain message format
-    chat_history = get_chat_history(user_query.conversation_id)
-    chat_messages = [
-        HumanMessage(content=msg["content"]) if msg["type"] == "user"
-        else AIMessage(content=msg["content"])
-        for msg in chat_history
-    ]
+async def _accept_query(user_query: UserQuery) -> tuple[list[dict], dict]:
+    """
+    Runs the pre-flight steps for a query.
+    Returns the previous messages of the conversation and the saved user message.
+    """
+    user, saved, chat_history = await _run_preflight(user_query)
+    user_query.user_id = user.id
+
+    # The history fetch runs alongside the insert, so the current message is dropped from it if present
+    # and appended explicitly.
+    previous_messages = [msg for msg in chat_history if msg.get("id") != saved.get("id")]
+    return previous_messages, saved
+
+
+async def _build_supervisor_state(user_query: UserQuery, previous_messages: list[dict]) -> SupervisorState:
+    # Earlier turns are compacted into the rolling summary plus the last few turns
+    conversation_context = await workflow.conversation_compactor.build_context(
+        user_query.conversation_id, previous_messages
+    )
+    chat_messages = conversation_context + [HumanMessage(content=user_query.query)]
 
-    # Initialise and run the Supervisor workflow
-    supervisor_state = SupervisorState(user_query=user_query, messages=chat_messages)
-    workflow = SupervisorWorkflow(supervisor_state)
-    final_response = await workflow.process_user_query(user_query)
+    return SupervisorState(
+        user_query=user_query,
+        messages=chat_messages,
+        conversation_context=conversation_context,
+    )
 
-    save_message_to_db({
+
+async def _prepare_supervisor_state(user_query: UserQuery) -> tuple[SupervisorState, list[dict]]:
+    """
+    Runs the pre-flight steps and builds the Supervisor state for this request.
+    Returns the state and the stored messages of the conversation including the current one.
+    """
+    previous_messages, saved = await _accept_query(user_query)
+    supervisor_state = await _build_supervisor_state(user_query, previous_messages)
+    return supervisor_state, previous_messages + [saved]
+
+
+async def _persist_ai_response(user_query: UserQuery, conversation_messages: list[dict], final_response: str):
+    # The AI message is written behind in a batch, the response does not wait for the insert
+    queued_response = await enqueue_message_to_db({
         "chat_id": user_query.conversation_id,
         "content": final_response,
         "type": "ai",
     })
 
+    # Fold the turns that fell out of the recent window into the summary once the response is ready
+    workflow.conversation_compactor.schedule_refresh(
+        user_query.conversation_id,
+        conversation_messages + [queued_response],
+    )
+
+
+@app.post("/process_query")
+async def process_query(user_query: UserQuery) -> dict:
+    supervisor_state, conversation_messages = await _prepare_supervisor_state(user_query)
+
+    # Run the shared Supervisor workflow with this request's state
+    final_response = await workflow.process_user_query(supervisor_state)
+    await _persist_ai_response(user_query, conversation_messages, final_response)
+
     return {"final_response": final_response}
 
 
+def _sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.post("/process_query/stream")
+async def process_query_stream(user_query: UserQuery) -> StreamingResponse:
+    """
+    Same as /process_query, but the final response is streamed as Server-Sent Events:
+    "token" events carry the synthesized text as it is generated, "done" carries the full response.
+    """
+    # Auth and ownership errors are raised here, before the stream starts
+    supervisor_state, conversation_messages = await _prepare_supervisor_state(user_query)
+
+    async def event_stream():
+        try:
+            async for event in workflow.stream_user_query(supervisor_state):
+                if event["type"] == "token":
+                    yield _sse_event("token", {"content": event["content"]})
+                else:
+                    final_response = event["content"]
+                    await _persist_ai_response(user_query, conversation_messages, final_response)
+                    yield _sse_event("done", {"final_response": final_response})
+        except Exception as e:
+            print(f"Error streaming response: {e}")
+            yield _sse_event("error", {"detail": "Failed to process the query"})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _run_query_job(payload: dict) -> str:
+    """
+    Runs the agent pipeline for a job accepted by /process_query/jobs and persists the response.
+    """
+    user_query = UserQuery(**payload["user_query"])
+    supervisor_state = await _build_supervisor_state(user_query, payload["previous_messages"])
+    final_response = await workflow.process_user_query(supervisor_state)
+    await _persist_ai_response(user_query, payload["previous_messages"] + [payload["saved_message"]], final_response)
+    return final_response
+
+
+@app.post("/process_query/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def submit_query_job(user_query: UserQuery) -> dict:
+    """
+    Accepts a query and runs it in the background job workers.
+    Progress is pushed as "job_update" events to the "job:{job_id}" Socket.IO room, GET /jobs/{job_id} is the fallback.
+    Jobs are delivered at most once: a job taken off the queue by a worker that dies mid-run is not retried,
+    its status stays "running" until the job hash expires.
+    The payload keeps the caller's auth token because the Clerk tools call /leave_balance and /ticket_creation
+    on the user's behalf. It is deleted when a worker takes the job and expires after JOB_PAYLOAD_TTL_SECONDS.
+    """
+    # Auth, ownership and the user message insert still happen before the job is accepted
+    previous_messages, saved = await _accept_query(user_query)
+
+    job_id = str(uuid.uuid4())
+    queued = await enqueue_job(
+        job_id,
+        {
+            "user_query": user_query.model_dump(),
+            "previous_messages": previous_messages,
+            "saved_message": saved,
+        },
+        user_id=user_query.user_id,
+        conversation_id=user_query.conversation_id,
+    )
+    if not queued:
+        raise HTTPException(status_code=503, detail="Failed to queue the query")
+    return {"job_id": job_id, "status": "queued"}
+
+
+@app.get("/jobs/{job_id}")
+async def get_job_status(job_id: str, authorization: str = Header(None)) -> dict:
+    if not authorization:
+        raise HTTPException(status_code=401, detail="Authorization header missing")
+
+    token = authorization.replace("Bearer ", "")
+    user = await verify_auth_token(token)
+    if not user:
+        raise HTTPException(status_code=401, detail="Invalid auth token")
+
+    job = await get_job(job_id)
+    if not job or job.get("user_id") != user.id:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return {
+        "job_id": job_id,
+        "status": job.get("status"),
+        "result": job.get("result"),
+        "error": job.get("error"),
+    }
+
+
 @app.get("/leave_balance")
 async def get_leave_balance_endpoint(authorization: str = Header(None)) -> dict:
     if not authorization:
         raise HTTPException(status_code=401, detail="Authorization header missing")
 
     token = authorization.replace("Bearer ", "")
-    user = get_user_from_token(token)
+    user = await verify_auth_token(token)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid auth token")
 
-    balance = await fetch_user_leave_balance(user.id)
+    # A missing row or a failed lookup is an error for the caller, never a balance of 0 days
+    try:
+        balance = await fetch_user_leave_balance(user.id)
+    except Exception:
+        raise HTTPException(status_code=503, detail="Leave balance is temporarily unavailable")
+    if balance is None:
+        raise HTTPException(status_code=404, detail="No leave balance found for this user")
     return {"leave_balance": balance}
 
 
@@ -104,7 +306,7 @@ async def create_ticket_endpoint(
         raise HTTPException(status_code=401, detail="Authorization header missing")
 
     token = authorization.replace("Bearer ", "")
-    user = get_user_from_token(token)
+    user = await verify_auth_token(token)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid auth token")
 
@@ -114,6 +316,28 @@ async def create_ticket_endpoint(
     return {"status": created_ticket}
 
 
+@app.get("/cache_stats")
+async def cache_stats(authorization: str = Header(None)) -> dict:
+    # End users have no use for the cache internals, the endpoint is off unless operators enable it
+    if not CACHE_STATS_ENDPOINT_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+    if not authorization:
+        raise HTTPException(status_code=401, detail="Authorization header missing")
+
+    token = authorization.replace("Bearer ", "")
+    user = await verify_auth_token(token)
+    if not user:
+        raise HTTPException(status_code=401, detail="Invalid auth token")
+
+    # Hit/miss counters of the in-process caches of this worker
+    decomposition_cache = get_agent_registry().decomposition_cache
+    return {
+        "decomposition": decomposition_cache.stats() if decomposition_cache else None,
+        "auth_tokens": token_verifier.cache.stats(),
+    }
+
+
 @app.post("/hitl_response", status_code=status.HTTP_202_ACCEPTED)
 async def hitl_response(
     response_data: dict,
@@ -129,7 +353,7 @@ async def hitl_response(
     if not conversation_id:
         raise HTTPException(status_code=400, detail="conversation_id is required in the response data")
 
-    user = get_user_from_token(token)
+    user = await verify_auth_token(token)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid auth token")
 
@@ -140,4 +364,15 @@ async def hitl_response(
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("main:combined_app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    from config import APP_ENV, WEB_CONCURRENCY
+
+    # Auto-reload is only for development, production runs WEB_CONCURRENCY worker processes.
+    # Socket.IO emits reach every worker through the Redis client manager.
+    is_development = APP_ENV == "development"
+    uvicorn.run(
+        "main:combined_app",
+        host="0.0.0.0",
+        port=int(os.getenv("PORT", 8000)),
+        reload=is_development,
+        workers=1 if is_development else WEB_CONCURRENCY,
+    )
\ No newline at end of file
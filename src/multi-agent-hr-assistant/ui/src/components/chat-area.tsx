@@ -153,7 +153,8 @@ export function ChatArea({ chatId, initialMessages = [] }: ChatAreaProps) {
             const { data: { session } } = await supabase.auth.getSession()
             if (!session?.access_token) throw new Error("No active session. Please log in again.")
 
-            const response = await fetch(`${process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000'}/process_query`, {
+            // Stream the final response token by token into a placeholder AI message
+            const response = await fetch(`${process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000'}/process_query/stream`, {
                 method: "POST",
                 headers: { "Content-Type": "application/json" },
                 body: JSON.stringify({
@@ -167,21 +168,45 @@ export function ChatArea({ chatId, initialMessages = [] }: ChatAreaProps) {
                 })
             })
 
-            if (!response.ok) {
+            if (!response.ok || !response.body) {
                 const errData = await response.json().catch(() => ({}))
                 throw new Error(errData?.error || "Backend returned an error")
             }
 
-            const data = await response.json()
-            const aiResponse: string = data.final_response || "Sorry, I couldn't process your request."
+            const aiMsgId = Date.now() + 1
+            setMessages(prev => [...prev, { id: aiMsgId, content: "", type: 'ai', created_at: new Date().toISOString() }])
+            const setAiContent = (update: (content: string) => string) =>
+                setMessages(prev => prev.map(m => m.id === aiMsgId ? { ...m, content: update(m.content) } : m))
+
+            const reader = response.body.getReader()
+            const decoder = new TextDecoder()
+            let buffer = ""
+            let finished = false
+
+            while (!finished) {
+                const { value, done } = await reader.read()
+                if (done) break
+                buffer += decoder.decode(value, { stream: true })
+
+                // Server-Sent Events are separated by a blank line
+                const events = buffer.split("\n\n")
+                buffer = events.pop() || ""
+
+                for (const rawEvent of events) {
+                    const event = rawEvent.match(/^event: (.*)$/m)?.[1]
+                    const data = JSON.parse(rawEvent.match(/^data: (.*)$/m)?.[1] || "{}")
 
-            const aiMsg: Message = { 
-                id: Date.now() + 1, 
-                content: aiResponse, 
-                type: 'ai', 
-                created_at: new Date().toISOString() 
+                    if (event === "token") {
+                        setAiContent(content => content + data.content)
+                    } else if (event === "done") {
+                        setAiContent(() => data.final_response || "Sorry, I couldn't process your request.")
+                        finished = true
+                    } else if (event === "error") {
+                        setAiContent(() => "Sorry, I couldn't process your request.")
+                        throw new Error(data.detail || "Backend returned an error")
+                    }
+                }
             }
-            setMessages(prev => [...prev, aiMsg])
         }
         
     } catch (error) {
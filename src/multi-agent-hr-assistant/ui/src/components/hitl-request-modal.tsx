@@ -9,7 +9,7 @@ import { Textarea } from "@/components/ui/textarea"
 import { useSocket } from "@/components/socket-provider" 
 import { toast } from "sonner"
 import { createClient } from "@/lib/supabase/client"
-import { HITLEventPayload, TicketCreationDetails, TicketCreationClassification, SocketMessagePayload, LibrarianTask } from "@/types/hitl"
+import { HITLEventPayload, TicketCreationDetails, TicketCreationClassification, LibrarianTask } from "@/types/hitl"
 
 interface HITLRequestModalProps {
   userId: string
@@ -77,20 +77,14 @@ export function HITLRequestModal({ userId, conversationId }: HITLRequestModalPro
       handleHITLEventRef.current?.(data, clerkChannel)
     const librarianHandler = (data: HITLEventPayload | undefined) =>
       handleHITLEventRef.current?.(data, librarianChannel)
-    const messageHandler = (data: SocketMessagePayload) => {
-      if (data?.channel === clerkChannel || data?.channel === librarianChannel) {
-        handleHITLEventRef.current?.(data.event_data, data.channel)
-      }
-    }
 
+    // HITL events are only sent to the sockets of this user, the channel name selects the conversation
     socket.on(clerkChannel, clerkHandler)
     socket.on(librarianChannel, librarianHandler)
-    socket.on("message", messageHandler)
 
     return () => {
       socket.off(clerkChannel, clerkHandler)
       socket.off(librarianChannel, librarianHandler)
-      socket.off("message", messageHandler)
     }
   }, [socket, userId, conversationId])
 
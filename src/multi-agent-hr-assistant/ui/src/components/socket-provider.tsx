@@ -2,6 +2,7 @@
 
 import { createContext, useContext, useEffect, useRef, useState } from "react";
 import { io, Socket } from "socket.io-client";
+import { createClient } from "@/lib/supabase/client";
 
 type SocketContextType = {
   socket: Socket | null;
@@ -24,12 +25,22 @@ export const SocketProvider = ({ children }: { children: React.ReactNode }) => {
 
   useEffect(() => {
     if (!socketRef.current) {
+      const supabase = createClient();
       socketRef.current = io(
         process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000",
         {
           path: "/socket.io",
           addTrailingSlash: false,
           autoConnect: true,
+          // The backend runs several worker processes, long-polling would need sticky sessions
+          transports: ["websocket"],
+          // The backend authenticates every socket and places it in the room of its user.
+          // Called on every (re)connect so a refreshed token is always sent.
+          auth: (cb) => {
+            supabase.auth.getSession().then(({ data: { session } }) => {
+              cb({ token: session?.access_token ?? "" });
+            });
+          },
         },
       );
       
@@ -10,6 +10,11 @@ from pathlib import Path
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src", "multi-agent-hr-assistant"))
 
+# Placeholder credentials so modules that create their clients at import time can be loaded
+os.environ.setdefault("SUPABASE_URL", "https://test.supabase.co")
+os.environ.setdefault("SUPABASE_KEY", "test_key")
+os.environ.setdefault("SUPABASE_SERVICE_KEY", "test_service_key")
+
 from domain.entities import UserQuery, TicketCreation, Supervisor_structured_output
 from domain.intents import IntentType, TicketType, AgentName
 from application.states import ClerkState, LibrarianState, SupervisorState
@@ -125,6 +130,7 @@ def mock_leave_balance_port():
     """Fixture for a mock LeaveBalancePort."""
     mock_port = Mock()
     mock_port.get_leave_balance = Mock(return_value=15)
+    mock_port.aget_leave_balance = AsyncMock(return_value=15)
     return mock_port
 
 
@@ -133,6 +139,7 @@ def mock_ticket_creation_port():
     """Fixture for a mock TicketCreationPort."""
     mock_port = Mock()
     mock_port.create_ticket = Mock(return_value=True)
+    mock_port.acreate_ticket = AsyncMock(return_value=True)
     return mock_port
 
 
@@ -102,6 +102,77 @@ class TestClerkLeaveBalanceAdapter:
             assert 'Authorization' in call_args.kwargs['headers'] or 'Authorization' in str(call_args)
 
 
+class TestClerkAdaptersAsync:
+    """Test cases for the async adapter methods on the pooled HTTP client."""
+
+    async def test_aget_leave_balance_reuses_client(self):
+        """Test that balance calls go through the injected client with the bearer token."""
+        import httpx
+
+        seen = []
+
+        def handler(request):
+            seen.append(request.headers["Authorization"])
+            return httpx.Response(200, json={"leave_balance": 12})
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            with patch('infrastructure.adapters.clerk_leave_balance_adapter.CLERK_API_KEY', 'https://api.test.com'):
+                adapter = ClerkLeaveBalanceAdapter(http_client=client)
+                balances = [await adapter.aget_leave_balance("token_1"), await adapter.aget_leave_balance("token_2")]
+
+        assert balances == [12, 12]
+        assert seen == ["Bearer token_1", "Bearer token_2"]
+
+    async def test_aget_leave_balance_error_raises(self):
+        """Test that HTTP errors are raised instead of being reported as a zero balance."""
+        import httpx
+
+        transport = httpx.MockTransport(lambda request: httpx.Response(503))
+        async with httpx.AsyncClient(transport=transport) as client:
+            with patch('infrastructure.adapters.clerk_leave_balance_adapter.CLERK_API_KEY', 'https://api.test.com'):
+                with pytest.raises(httpx.HTTPStatusError):
+                    await ClerkLeaveBalanceAdapter(http_client=client).aget_leave_balance("token")
+
+    async def test_acreate_ticket(self, sample_ticket_creation):
+        """Test that ticket creation posts the ticket and reads the status."""
+        import httpx
+        import json
+        from infrastructure.adapters.clerk_ticket_creation_adapter import ClerkTicketCreationAdapter
+
+        def handler(request):
+            assert json.loads(request.content)["subject"] == sample_ticket_creation.subject
+            return httpx.Response(200, json={"status": True})
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            with patch('infrastructure.adapters.clerk_ticket_creation_adapter.CLERK_API_KEY', 'https://api.test.com'):
+                result = await ClerkTicketCreationAdapter(http_client=client).acreate_ticket(sample_ticket_creation, "token")
+
+        assert result is True
+
+    async def test_port_default_async_variant_runs_sync_method(self):
+        """Test that ports without an async implementation still work through the default variant."""
+        from domain.ports import LeaveBalancePort
+
+        class StaticBalance(LeaveBalancePort):
+            def get_leave_balance(self, token):
+                return 7
+
+        assert await StaticBalance().aget_leave_balance("token") == 7
+
+    def test_shared_client_is_pooled(self):
+        """Test that the shared client is created once with bounded connections and timeouts."""
+        import asyncio
+        from infrastructure.http import http_client
+
+        client = http_client.get_http_client()
+        try:
+            assert http_client.get_http_client() is client
+            assert client.timeout.connect == http_client.HTTP_CONNECT_TIMEOUT_SECONDS
+            assert client.timeout.read == http_client.HTTP_READ_TIMEOUT_SECONDS
+        finally:
+            asyncio.run(http_client.close_http_client())
+
+
 class TestLeaveBalancePortInterface:
     """Test cases for LeaveBalancePort interface."""
 
@@ -156,3 +227,45 @@ class TestAdapterIntegration:
                 assert balance1 == 20
                 assert balance2 == 20
                 assert mock_get.call_count == 2
+
+
+class TestSupervisorClerkGraphExecutor:
+    """Test cases for the shared Clerk graph executor."""
+
+    def test_graph_compiled_once_and_reused(self, mock_llm_model, mock_leave_balance_port, mock_ticket_creation_port, sample_clerk_state):
+        """Test that each execution reuses the graph compiled at construction time."""
+        import asyncio
+        from unittest.mock import AsyncMock
+        from infrastructure.adapters.supervisor_clerk_graph_executor import SupervisorClerkGraphExecutor
+
+        executor = SupervisorClerkGraphExecutor(mock_llm_model, mock_leave_balance_port, mock_ticket_creation_port)
+        compiled_graph = executor.clerk_graph
+        executor.clerk_graph = Mock(ainvoke=AsyncMock(return_value={}))
+        other_state = sample_clerk_state.model_copy(update={"user_query": sample_clerk_state.user_query.model_copy(update={"conversation_id": "conv_999"})})
+
+        asyncio.run(executor.execute_clerk_agent_graph(sample_clerk_state))
+        asyncio.run(executor.execute_clerk_agent_graph(other_state))
+
+        assert compiled_graph is not None
+        assert executor.clerk_graph.ainvoke.await_count == 2
+        assert executor.clerk_graph.ainvoke.await_args_list[0].args[0] is sample_clerk_state
+        assert executor.clerk_graph.ainvoke.await_args_list[1].args[0] is other_state
+
+    def test_returns_response_without_redis(self, mock_llm_model, mock_leave_balance_port, mock_ticket_creation_port, sample_clerk_state):
+        """Test that the final response is returned in process and Redis is only written when tracking is on."""
+        import asyncio
+        from unittest.mock import AsyncMock
+        from infrastructure.adapters.supervisor_clerk_graph_executor import SupervisorClerkGraphExecutor
+
+        executor = SupervisorClerkGraphExecutor(mock_llm_model, mock_leave_balance_port, mock_ticket_creation_port, track_status=False)
+        executor.clerk_graph = Mock(ainvoke=AsyncMock(return_value={"response": "Your leave balance is 10 days."}))
+
+        with patch('infrastructure.adapters.supervisor_clerk_graph_executor.save_agent_status', new_callable=AsyncMock) as save_status:
+            response = asyncio.run(executor.execute_clerk_agent_graph(sample_clerk_state))
+            save_status.assert_not_awaited()
+
+            executor.track_status = True
+            asyncio.run(executor.execute_clerk_agent_graph(sample_clerk_state))
+
+        assert response == "Your leave balance is 10 days."
+        assert save_status.await_args.args[0].state == {"status": "completed", "final_response": "Your leave balance is 10 days.", "error": None}
@@ -12,6 +12,8 @@ from domain.entities import (
     UserQuery, 
     TicketCreationClassification, 
     GetBalanceClassification,
+    GeneralInformationClassification,
+    TicketCreation,
 )
 from langchain_core.messages import AIMessage, HumanMessage
 
@@ -30,7 +32,7 @@ class TestClerkAgent:
         assert agent.leave_balance_port is not None
         assert agent.ticket_creation_port is not None
 
-    def test_clerk_outer_model_node_success(self, mock_llm_model, mock_leave_balance_port, mock_ticket_creation_port, sample_clerk_state):
+    async def test_clerk_outer_model_node_success(self, mock_llm_model, mock_leave_balance_port, mock_ticket_creation_port, sample_clerk_state):
         """Test Clerk outer model node with successful classification."""
         # Mock LLM response with classification result
         mock_response = Mock()
@@ -38,7 +40,7 @@ class TestClerkAgent:
             "action": "get_balance",
             "details": None
         })
-        mock_llm_model.invoke.return_value = mock_response
+        mock_llm_model.ainvoke.return_value = mock_response
 
         agent = ClerkAgent(
             llm_model=mock_llm_model,
@@ -46,13 +48,13 @@ class TestClerkAgent:
             ticket_creation_port=mock_ticket_creation_port
         )
 
-        result = agent.Clerk_Outer_Model_Node(sample_clerk_state)
+        result = await agent.Clerk_Outer_Model_Node(sample_clerk_state)
 
         assert "messages" in result
         assert "pending_tasks" in result
         assert isinstance(result["pending_tasks"], deque)
 
-    def test_clerk_outer_model_node_with_markdown(self, mock_llm_model, mock_leave_balance_port, mock_ticket_creation_port, sample_clerk_state):
+    async def test_clerk_outer_model_node_with_markdown(self, mock_llm_model, mock_leave_balance_port, mock_ticket_creation_port, sample_clerk_state):
         """Test Clerk outer model node with markdown-formatted JSON."""
         # Mock LLM response with markdown formatting
         mock_response = Mock()
@@ -66,7 +68,7 @@ class TestClerkAgent:
     }
 }
 ```"""
-        mock_llm_model.invoke.return_value = mock_response
+        mock_llm_model.ainvoke.return_value = mock_response
 
         agent = ClerkAgent(
             llm_model=mock_llm_model,
@@ -74,14 +76,14 @@ class TestClerkAgent:
             ticket_creation_port=mock_ticket_creation_port
         )
 
-        result = agent.Clerk_Outer_Model_Node(sample_clerk_state)
+        result = await agent.Clerk_Outer_Model_Node(sample_clerk_state)
 
         assert "pending_tasks" in result
 
-    def test_clerk_outer_model_node_error_handling(self, mock_llm_model, mock_leave_balance_port, mock_ticket_creation_port, sample_clerk_state):
+    async def test_clerk_outer_model_node_error_handling(self, mock_llm_model, mock_leave_balance_port, mock_ticket_creation_port, sample_clerk_state):
         """Test Clerk outer model node error handling."""
         # Mock LLM error
-        mock_llm_model.invoke.side_effect = Exception("LLM Error")
+        mock_llm_model.ainvoke.side_effect = Exception("LLM Error")
 
         agent = ClerkAgent(
             llm_model=mock_llm_model,
@@ -89,7 +91,7 @@ class TestClerkAgent:
             ticket_creation_port=mock_ticket_creation_port
         )
 
-        result = agent.Clerk_Outer_Model_Node(sample_clerk_state)
+        result = await agent.Clerk_Outer_Model_Node(sample_clerk_state)
 
         # Should return empty pending_tasks on error
         assert result["pending_tasks"] == deque()
@@ -175,6 +177,123 @@ class TestClerkAgent:
 
         assert result["next_step"] == "hitl"
 
+    async def test_clerk_outer_model_node_batched_extraction(self, mock_llm_model, mock_leave_balance_port, mock_ticket_creation_port, sample_clerk_state):
+        """Test that batched extraction classifies and fills details in one call."""
+        mock_llm_model.ainvoke.return_value = Mock(content=json.dumps({"tasks": [
+            {"action": "get_balance", "details": None},
+            {"action": "ticket_creation", "details": {"ticket_type": "help", "subject": "Laptop", "description": "Laptop is broken"}},
+        ]}))
+        agent = ClerkAgent(mock_llm_model, mock_leave_balance_port, mock_ticket_creation_port, batched_extraction=True)
+
+        result = await agent.Clerk_Outer_Model_Node(sample_clerk_state)
+
+        prompt = mock_llm_model.ainvoke.call_args.args[0]
+        assert "Extraction Node" in prompt[-2].content
+        assert result["pending_tasks"][1].details.subject == "Laptop"
+
+    async def test_clerk_inner_model_node_skips_extracted_tasks(self, mock_llm_model, mock_leave_balance_port, mock_ticket_creation_port, sample_clerk_state):
+        """Test that complete tasks skip the LLM and incomplete ones fall back to the per-task call."""
+        mock_llm_model.ainvoke.return_value = Mock(content=json.dumps({
+            "action": "ticket_creation",
+            "details": {"ticket_type": "complaint", "subject": "Noise", "description": "Office is too loud"},
+        }))
+        agent = ClerkAgent(mock_llm_model, mock_leave_balance_port, mock_ticket_creation_port)
+        sample_clerk_state.pending_tasks = deque([
+            TicketCreationClassification(action="ticket_creation", details=TicketCreation(ticket_type="help", subject="Laptop", description="Laptop is broken")),
+            TicketCreationClassification(action="ticket_creation", details=None),
+        ])
+
+        first = await agent.Clerk_Inner_Model_Node(sample_clerk_state)
+        mock_llm_model.ainvoke.assert_not_awaited()
+
+        sample_clerk_state.pending_tasks = first["pending_tasks"]
+        sample_clerk_state.final_response = deque(first["final_response"])
+        second = await agent.Clerk_Inner_Model_Node(sample_clerk_state)
+
+        assert mock_llm_model.ainvoke.await_count == 1
+        assert [t.details.subject for t in second["final_response"]] == ["Laptop", "Noise"]
+        assert not second["pending_tasks"]
+
+    async def test_clerk_final_response_node_renders_tool_outcomes(self, mock_llm_model, mock_leave_balance_port, mock_ticket_creation_port, sample_clerk_state):
+        """Test that balance and ticket outcomes are rendered from templates in task order without the LLM."""
+        ticket = TicketCreation(ticket_type="help", subject="Laptop", description="Laptop is broken")
+        agent = ClerkAgent(mock_llm_model, mock_leave_balance_port, mock_ticket_creation_port)
+        sample_clerk_state.final_response = deque([
+            TicketCreationClassification(action="ticket_creation", details=ticket),
+            GetBalanceClassification(action="get_balance"),
+            TicketCreationClassification(action="ticket_creation", details=ticket),
+        ])
+        sample_clerk_state.tool_results = [
+            {"action": "ticket_creation", "success": True, "data": ticket, "error": None},
+            {"action": "get_balance", "success": True, "data": {"leave_balance": 12}, "error": None},
+            {"action": "ticket_creation", "success": False, "data": None, "error": "User rejected the ticket creation."},
+        ]
+
+        result = await agent.Clerk_Final_Response_Node(sample_clerk_state)
+
+        assert result["response"].split("\n\n") == [
+            'Your help ticket "Laptop" has been created.',
+            "Your leave balance is 12 days.",
+            "The ticket was not created because you chose not to submit it.",
+        ]
+        mock_llm_model.ainvoke.assert_not_awaited()
+
+    async def test_failed_balance_lookup_renders_failed_template(self, mock_llm_model, mock_leave_balance_port, mock_ticket_creation_port, sample_clerk_state):
+        """Test that a Clerk API outage is reported as a failure and not as a zero balance."""
+        import httpx
+
+        mock_leave_balance_port.aget_leave_balance = AsyncMock(side_effect=httpx.ConnectError("Clerk API down"))
+        agent = ClerkAgent(mock_llm_model, mock_leave_balance_port, mock_ticket_creation_port)
+        sample_clerk_state.final_response = deque([GetBalanceClassification(action="get_balance")])
+        sample_clerk_state.tool_results = []
+
+        await agent.Clerk_Tool_Execution_Node(sample_clerk_state)
+        result = await agent.Clerk_Final_Response_Node(sample_clerk_state)
+
+        assert sample_clerk_state.tool_results[0]["success"] is False
+        assert result["response"] == "I wasn't able to retrieve your leave balance right now. Please try again in a moment."
+        assert "0 days" not in result["response"]
+        mock_llm_model.ainvoke.assert_not_awaited()
+
+    def test_balance_result_without_balance_is_not_rendered_as_success(self, mock_llm_model, mock_leave_balance_port, mock_ticket_creation_port, sample_clerk_state):
+        """Test that a successful balance result missing its value uses the failed template."""
+        agent = ClerkAgent(mock_llm_model, mock_leave_balance_port, mock_ticket_creation_port)
+        sample_clerk_state.final_response = deque([GetBalanceClassification(action="get_balance")])
+        sample_clerk_state.tool_results = [{"action": "get_balance", "success": True, "data": {"leave_balance": None}, "error": None}]
+
+        assert agent._render_tool_outcomes(sample_clerk_state).startswith("I wasn't able to retrieve your leave balance")
+
+    async def test_clerk_final_response_node_uses_llm_for_free_text(self, mock_llm_model, mock_leave_balance_port, mock_ticket_creation_port, sample_clerk_state):
+        """Test that a general information task still goes through the LLM."""
+        mock_llm_model.ainvoke.return_value = Mock(content="Balance is 12 days and the office opens at 9.")
+        agent = ClerkAgent(mock_llm_model, mock_leave_balance_port, mock_ticket_creation_port)
+        sample_clerk_state.final_response = deque([
+            GetBalanceClassification(action="get_balance"),
+            GeneralInformationClassification(action="general_information", details={"response": "The office opens at 9."}),
+        ])
+        sample_clerk_state.tool_results = [{"action": "get_balance", "success": True, "data": {"leave_balance": 12}, "error": None}]
+
+        result = await agent.Clerk_Final_Response_Node(sample_clerk_state)
+
+        assert result["response"] == "Balance is 12 days and the office opens at 9."
+        mock_llm_model.ainvoke.assert_awaited_once()
+
+    async def test_clerk_final_response_node_retries_without_blocking(self, mock_llm_model, mock_leave_balance_port, mock_ticket_creation_port, sample_clerk_state):
+        """Test that the final response node awaits the LLM and retries after a failure."""
+        mock_llm_model.ainvoke.side_effect = [Exception("rate limited"), Mock(content="Your leave balance is 10 days.")]
+        agent = ClerkAgent(
+            llm_model=mock_llm_model,
+            leave_balance_port=mock_leave_balance_port,
+            ticket_creation_port=mock_ticket_creation_port
+        )
+
+        with patch("application.agents.clerk.AGENT_LLM_RETRY_BACKOFF_SECONDS", 0):
+            result = await agent.Clerk_Final_Response_Node(sample_clerk_state)
+
+        assert result["response"] == "Your leave balance is 10 days."
+        assert mock_llm_model.ainvoke.await_count == 2
+        mock_llm_model.invoke.assert_not_called()
+
 
 class TestLibrarianAgent:
     """Test cases for LibrarianAgent."""
@@ -198,14 +317,14 @@ class TestLibrarianAgent:
         assert agent.insertion_tool is not None
         assert agent.update_tool is not None
 
-    def test_librarian_model_node_success(self, mock_llm_model, sample_librarian_state):
+    async def test_librarian_model_node_success(self, mock_llm_model, sample_librarian_state):
         """Test Librarian model node with successful classification."""
         mock_response = Mock()
         mock_response.content = json.dumps({
             "action": "retrieve_policy",
             "query": "Get leave policy"
         })
-        mock_llm_model.invoke.return_value = mock_response
+        mock_llm_model.ainvoke.return_value = mock_response
 
         mock_retrieval = Mock()
         mock_insertion = Mock()
@@ -219,13 +338,13 @@ class TestLibrarianAgent:
             update_port=mock_update
         )
 
-        result = agent.librarian_model_node(sample_librarian_state)
+        result = await agent.librarian_model_node(sample_librarian_state)
 
         assert "action" in result
 
-    def test_librarian_model_node_error_handling(self, mock_llm_model, sample_librarian_state):
+    async def test_librarian_model_node_error_handling(self, mock_llm_model, sample_librarian_state):
         """Test Librarian model node error handling."""
-        mock_llm_model.invoke.side_effect = Exception("LLM Error")
+        mock_llm_model.ainvoke.side_effect = Exception("LLM Error")
 
         mock_retrieval = Mock()
         mock_insertion = Mock()
@@ -239,7 +358,7 @@ class TestLibrarianAgent:
             update_port=mock_update
         )
 
-        result = agent.librarian_model_node(sample_librarian_state)
+        result = await agent.librarian_model_node(sample_librarian_state)
 
         assert result == {}
 
@@ -292,6 +411,233 @@ class TestSupervisorAgent:
         assert agent is not None
 
 
+    async def test_supervisor_tool_node_runs_agents_concurrently(self, mock_async_llm_model, sample_supervisor_state):
+        """Test that Clerk and Librarian tasks of one step overlap and keep their order."""
+        import asyncio
+        from application.agents.supervisor import SupervisorAgent
+        from domain.entities import TaskIntent
+
+        running = []
+        both_running = asyncio.Event()
+
+        # each execution only finishes once the other one has started, so serialized tasks would never finish
+        async def slow_execution(state):
+            running.append(state)
+            if len(running) == 2:
+                both_running.set()
+            await both_running.wait()
+            return f"{state.__class__.__name__.replace('State', '')} done"
+
+        clerk_executor = Mock()
+        clerk_executor.execute_clerk_agent_graph = AsyncMock(side_effect=slow_execution)
+        librarian_executor = Mock()
+        librarian_executor.execute_librarian_agent_graph = AsyncMock(side_effect=slow_execution)
+        agent = SupervisorAgent(mock_async_llm_model, clerk_executor, librarian_executor)
+
+        sample_supervisor_state.identified_intent = [
+            TaskIntent(agent="Librarian", intent="Policy_Query", decomposed_query="Leave policy?", status="pending"),
+            TaskIntent(agent="Clerk", intent="Leave_Request", decomposed_query="Apply for leave", status="pending"),
+        ]
+
+        result = await asyncio.wait_for(agent.Supervisor_tool_node(sample_supervisor_state), timeout=1)
+
+        assert [t.result for t in result["identified_intent"]] == ["Librarian done", "Clerk done"]
+        assert all(t.status == "completed" for t in result["identified_intent"])
+
+    async def test_supervisor_tool_node_isolates_task_errors(self, mock_async_llm_model, sample_supervisor_state):
+        """Test that one failing task does not stop the others."""
+        from application.agents.supervisor import SupervisorAgent
+        from domain.entities import TaskIntent
+
+        clerk_executor = Mock()
+        clerk_executor.execute_clerk_agent_graph = AsyncMock(side_effect=RuntimeError("clerk down"))
+        librarian_executor = Mock()
+        librarian_executor.execute_librarian_agent_graph = AsyncMock(return_value="Policy answer")
+        agent = SupervisorAgent(mock_async_llm_model, clerk_executor, librarian_executor)
+
+        sample_supervisor_state.identified_intent = [
+            TaskIntent(agent="Clerk", intent="Leave_Request", decomposed_query="Apply for leave", status="pending"),
+            TaskIntent(agent="Librarian", intent="Policy_Query", decomposed_query="Leave policy?", status="pending"),
+        ]
+
+        result = await agent.Supervisor_tool_node(sample_supervisor_state)
+
+        clerk_task, librarian_task = result["identified_intent"]
+        assert clerk_task.status == "error"
+        assert librarian_task.status == "completed"
+        assert librarian_task.result == "Policy answer"
+
+    async def test_supervisor_tool_node_passes_upstream_results(self, mock_async_llm_model, sample_supervisor_state):
+        """Test that a dependent task runs after its dependency and receives its result."""
+        from application.agents.supervisor import SupervisorAgent
+        from domain.entities import TaskIntent
+
+        clerk_queries = []
+
+        async def record_query(state):
+            clerk_queries.append(state.user_query.query)
+            return "You have 12 days."
+
+        clerk_executor = Mock()
+        clerk_executor.execute_clerk_agent_graph = AsyncMock(side_effect=record_query)
+        agent = SupervisorAgent(mock_async_llm_model, clerk_executor, Mock())
+
+        sample_supervisor_state.identified_intent = [
+            TaskIntent(id="t2", depends_on=["t1"], agent="Clerk", intent="Leave_Request",
+                       decomposed_query="Apply for 3 days of leave if enough balance", status="pending"),
+            TaskIntent(id="t1", agent="Clerk", intent="Leave_Request",
+                       decomposed_query="Check leave balance", status="pending"),
+        ]
+
+        await agent.Supervisor_tool_node(sample_supervisor_state)
+
+        assert clerk_queries[0] == "Check leave balance"
+        assert "Check leave balance: You have 12 days." in clerk_queries[1]
+
+    async def test_supervisor_tool_node_skips_tasks_of_failed_or_cyclic_dependencies(self, mock_async_llm_model, sample_supervisor_state):
+        """Test that tasks depending on a failure or on a cycle are marked as errors without running."""
+        from application.agents.supervisor import SupervisorAgent
+        from domain.entities import TaskIntent
+
+        clerk_executor = Mock()
+        clerk_executor.execute_clerk_agent_graph = AsyncMock(side_effect=RuntimeError("clerk down"))
+        librarian_executor = Mock()
+        librarian_executor.execute_librarian_agent_graph = AsyncMock(return_value=True)
+        agent = SupervisorAgent(mock_async_llm_model, clerk_executor, librarian_executor)
+
+        sample_supervisor_state.identified_intent = [
+            TaskIntent(id="t1", agent="Clerk", intent="Leave_Request", decomposed_query="Check balance"),
+            TaskIntent(id="t2", depends_on=["t1"], agent="Librarian", intent="Policy_Query", decomposed_query="Explain"),
+            TaskIntent(id="t3", depends_on=["t4"], agent="Librarian", intent="Policy_Query", decomposed_query="A"),
+            TaskIntent(id="t4", depends_on=["t3"], agent="Librarian", intent="Policy_Query", decomposed_query="B"),
+        ]
+
+        result = await agent.Supervisor_tool_node(sample_supervisor_state)
+
+        assert [t.status for t in result["identified_intent"]] == ["error", "error", "error", "error"]
+        assert "(t1) failed" in result["identified_intent"][1].result
+        assert "circular" in result["identified_intent"][2].result
+        librarian_executor.execute_librarian_agent_graph.assert_not_awaited()
+
+    async def test_supervisor_hands_off_pre_classified_actions(self, mock_async_llm_model, sample_supervisor_state):
+        """Test that a pre-classified action reaches the agent state as its first task."""
+        from application.agents.supervisor import SupervisorAgent
+        from domain.entities import TaskIntent
+
+        clerk_executor = Mock()
+        clerk_executor.execute_clerk_agent_graph = AsyncMock(return_value="Balance is 15 days.")
+        librarian_executor = Mock()
+        librarian_executor.execute_librarian_agent_graph = AsyncMock(return_value="Policy answer")
+        agent = SupervisorAgent(mock_async_llm_model, clerk_executor, librarian_executor)
+
+        sample_supervisor_state.identified_intent = [
+            TaskIntent(agent="Clerk", intent="Leave_Request", decomposed_query="Check balance", action="get_balance"),
+            TaskIntent(agent="Librarian", intent="Policy_Query", decomposed_query="WFH policy?", action="retrieve_policy"),
+            TaskIntent(agent="Clerk", intent="Leave_Request", decomposed_query="Leave stuff"),
+        ]
+
+        await agent.Supervisor_tool_node(sample_supervisor_state)
+
+        clerk_states = [c.args[0] for c in clerk_executor.execute_clerk_agent_graph.await_args_list]
+        librarian_state = librarian_executor.execute_librarian_agent_graph.await_args.args[0]
+        assert [list(s.pending_tasks) for s in clerk_states] == [[GetBalanceClassification(action="get_balance")], []]
+        assert librarian_state.action[0].action == "retrieve_policy"
+        assert librarian_state.action[0].query == "WFH policy?"
+
+    async def test_supervisor_does_not_hand_off_policy_changes_for_non_admins(self, mock_async_llm_model, sample_supervisor_state):
+        """Test that an upload action from a non-admin is left for the Librarian to classify."""
+        from application.agents.supervisor import SupervisorAgent
+        from domain.entities import TaskIntent
+
+        librarian_executor = Mock()
+        librarian_executor.execute_librarian_agent_graph = AsyncMock(return_value="Policy answer")
+        agent = SupervisorAgent(mock_async_llm_model, Mock(), librarian_executor)
+
+        sample_supervisor_state.user_query.isAdmin = False
+        sample_supervisor_state.user_query.UploadedText = "New policy text"
+        sample_supervisor_state.identified_intent = [
+            TaskIntent(agent="Librarian", intent="Policy_Query", decomposed_query="Upload this policy", action="upload_policy"),
+        ]
+
+        await agent.Supervisor_tool_node(sample_supervisor_state)
+
+        assert librarian_executor.execute_librarian_agent_graph.await_args.args[0].action == []
+
+    def test_librarian_tool_node_refuses_upload_for_non_admin(self, mock_llm_model, sample_librarian_state):
+        """Test that a non-admin upload task never reaches the insertion port."""
+        from application.agents.librarian import LibrarianAgent
+        from domain.entities import LibrarianTask
+
+        insertion_port = Mock()
+        agent = LibrarianAgent(mock_llm_model, Mock(), insertion_port, Mock())
+        sample_librarian_state.user_query.UploadedText = "New policy text"
+        sample_librarian_state.action = [LibrarianTask(action="upload_policy", query="Upload this policy")]
+
+        result = agent.librarian_tool_execution_node(sample_librarian_state)
+
+        insertion_port.insert_document.assert_not_called()
+        assert result["action"][0].status == "error"
+
+    async def test_clerk_graph_starts_at_decision_node_for_hand_off(self, mock_llm_model, mock_leave_balance_port, mock_ticket_creation_port, sample_clerk_state):
+        """Test that a handed-off task skips the Clerk classification call."""
+        mock_llm_model.ainvoke.return_value = Mock(content="Your leave balance is 15 days.")
+        graph = ClerkAgent(mock_llm_model, mock_leave_balance_port, mock_ticket_creation_port, templated_responses=False).create_clerk_agent_graph()
+        sample_clerk_state.pending_tasks = deque([GetBalanceClassification(action="get_balance")])
+
+        result = await graph.ainvoke(sample_clerk_state)
+
+        assert result["response"] == "Your leave balance is 15 days."
+        assert mock_llm_model.ainvoke.await_count == 1
+        mock_leave_balance_port.aget_leave_balance.assert_awaited_once()
+
+    async def test_supervisor_result_node_passes_single_task_through(self, mock_async_llm_model, sample_supervisor_state):
+        """Test that a single completed agent task is returned without the synthesis LLM call."""
+        from application.agents.supervisor import SupervisorAgent
+        from domain.entities import TaskIntent
+
+        agent = SupervisorAgent(mock_async_llm_model, Mock(), Mock(), synthesis_policy="auto")
+        sample_supervisor_state.identified_intent = [
+            TaskIntent(agent="Clerk", intent="Leave_Request", decomposed_query="Check balance", status="completed", result="Your leave balance is 10 days."),
+        ]
+
+        result = await agent.Supervisor_result_node(sample_supervisor_state)
+
+        assert result["final_response"] == "Your leave balance is 10 days."
+        mock_async_llm_model.ainvoke.assert_not_awaited()
+
+    async def test_supervisor_result_node_synthesis_policy(self, mock_async_llm_model, sample_supervisor_state):
+        """Test that multiple results are synthesized under auto and joined under never."""
+        from application.agents.supervisor import SupervisorAgent
+        from domain.entities import TaskIntent
+
+        mock_async_llm_model.ainvoke.return_value = Mock(content="Synthesized")
+        sample_supervisor_state.identified_intent = [
+            TaskIntent(agent="Clerk", intent="Leave_Request", decomposed_query="Check balance", status="completed", result="Balance is 10 days."),
+            TaskIntent(agent="Librarian", intent="Policy_Query", decomposed_query="WFH policy", status="error", result="boom"),
+        ]
+
+        auto = await SupervisorAgent(mock_async_llm_model, Mock(), Mock(), synthesis_policy="auto").Supervisor_result_node(sample_supervisor_state)
+        never = await SupervisorAgent(mock_async_llm_model, Mock(), Mock(), synthesis_policy="never").Supervisor_result_node(sample_supervisor_state)
+
+        assert auto["final_response"] == "Synthesized"
+        assert never["final_response"].startswith("Balance is 10 days.\n\nI wasn't able to complete")
+        assert "boom" not in never["final_response"]
+        assert mock_async_llm_model.ainvoke.await_count == 1
+
+    async def test_supervisor_result_node_always_synthesizes(self, mock_async_llm_model, sample_supervisor_state):
+        """Test that the always policy keeps the synthesis call for a single task."""
+        from application.agents.supervisor import SupervisorAgent
+        from domain.entities import TaskIntent
+
+        mock_async_llm_model.ainvoke.return_value = Mock(content="Synthesized")
+        sample_supervisor_state.identified_intent = [
+            TaskIntent(agent="Librarian", intent="Policy_Query", decomposed_query="WFH policy", status="completed", result="Raw answer"),
+        ]
+
+        result = await SupervisorAgent(mock_async_llm_model, Mock(), Mock(), synthesis_policy="always").Supervisor_result_node(sample_supervisor_state)
+
+        assert result["final_response"] == "Synthesized"
+
 class TestAgentInteractionFlow:
     """Test cases for agent interaction flows."""
 
@@ -0,0 +1,33 @@
+"""
+Tests for the operator-only /cache_stats endpoint.
+"""
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from fastapi import HTTPException
+
+pytest.importorskip("langchain_chroma")
+
+import main
+
+
+class TestCacheStatsEndpoint:
+    """Test cases for the /cache_stats gate."""
+
+    async def test_disabled_endpoint_is_not_found_even_for_signed_in_users(self):
+        """Test that end users cannot read the cache internals unless operators enable the endpoint."""
+        with patch.object(main, "CACHE_STATS_ENDPOINT_ENABLED", False), \
+             patch.object(main, "verify_auth_token", AsyncMock(return_value=Mock(id="user_456"))) as verify:
+            with pytest.raises(HTTPException) as error:
+                await main.cache_stats("Bearer token_xyz")
+
+        assert error.value.status_code == 404
+        verify.assert_not_awaited()
+
+    async def test_enabled_endpoint_still_requires_a_token(self):
+        """Test that an enabled endpoint rejects requests without an Authorization header."""
+        with patch.object(main, "CACHE_STATS_ENDPOINT_ENABLED", True):
+            with pytest.raises(HTTPException) as error:
+                await main.cache_stats(None)
+
+        assert error.value.status_code == 401
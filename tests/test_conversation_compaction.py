@@ -0,0 +1,93 @@
+"""
+Tests for the rolling conversation summary used to cap prompt size.
+"""
+from unittest.mock import AsyncMock, Mock
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from application.services.conversation_compaction import (
+    SUMMARY_PREFIX,
+    ConversationCompactor,
+    trim_messages_to_budget,
+)
+
+
+def _rows(count):
+    return [
+        {
+            "id": f"m{i}",
+            "type": "user" if i % 2 == 0 else "ai",
+            "content": f"message {i}",
+            "created_at": f"2026-01-01T00:00:{i:02d}",
+        }
+        for i in range(count)
+    ]
+
+
+def _store(stored=None):
+    store = Mock()
+    store.get_summary = AsyncMock(return_value=stored or {})
+    store.save_summary = AsyncMock(return_value=True)
+    return store
+
+
+class TestTrimMessagesToBudget:
+    """Test cases for the token budget helper."""
+
+    def test_keeps_newest_messages_within_budget(self):
+        """Test that the oldest messages are dropped first."""
+        messages = [HumanMessage(content="a" * 40), AIMessage(content="b" * 40), HumanMessage(content="c" * 40)]
+
+        trimmed = trim_messages_to_budget(messages, token_budget=20)
+
+        assert [m.content[0] for m in trimmed] == ["b", "c"]
+
+    def test_summary_is_always_kept(self):
+        """Test that the leading summary survives trimming."""
+        summary = SystemMessage(content=SUMMARY_PREFIX + "earlier leave request")
+        messages = [summary, HumanMessage(content="x" * 400), AIMessage(content="latest")]
+
+        trimmed = trim_messages_to_budget(messages, token_budget=20)
+
+        assert trimmed[0] is summary
+        assert trimmed[-1].content == "latest"
+        assert len(trimmed) == 2
+
+
+class TestConversationCompactor:
+    """Test cases for ConversationCompactor."""
+
+    async def test_build_context_uses_summary_and_recent_turns(self):
+        """Test that the context is the summary plus turns newer than the summary."""
+        store = _store({"summary": "User asked about leave.", "until": "2026-01-01T00:00:05"})
+        compactor = ConversationCompactor(Mock(), store, recent_messages=3, token_budget=1000)
+
+        context = await compactor.build_context("conv_123", _rows(10))
+
+        assert isinstance(context[0], SystemMessage)
+        assert context[0].content.endswith("User asked about leave.")
+        assert [m.content for m in context[1:]] == ["message 7", "message 8", "message 9"]
+
+    async def test_refresh_folds_only_turns_outside_the_window(self):
+        """Test that the summary only absorbs unsummarized turns older than the recent window."""
+        llm = Mock()
+        llm.ainvoke = AsyncMock(return_value=Mock(content="Updated summary."))
+        store = _store({"summary": "Old summary.", "until": "2026-01-01T00:00:03"})
+        compactor = ConversationCompactor(llm, store, recent_messages=4, token_budget=1000)
+
+        updated = await compactor.refresh_summary("conv_123", _rows(10))
+
+        assert updated is True
+        prompt = llm.ainvoke.call_args[0][0][-1].content
+        assert "message 4" in prompt and "message 5" in prompt
+        assert "message 3" not in prompt and "message 6" not in prompt
+        store.save_summary.assert_awaited_once_with("conv_123", "Updated summary.", "2026-01-01T00:00:05")
+
+    async def test_refresh_skips_llm_for_short_conversations(self):
+        """Test that nothing is summarized while the conversation fits in the recent window."""
+        llm = Mock()
+        llm.ainvoke = AsyncMock()
+        compactor = ConversationCompactor(llm, _store(), recent_messages=6, token_budget=1000)
+
+        assert await compactor.refresh_summary("conv_123", _rows(4)) is False
+        llm.ainvoke.assert_not_awaited()
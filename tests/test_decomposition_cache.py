@@ -0,0 +1,98 @@
+"""
+Tests for the two-level decomposition cache.
+"""
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from domain.entities import TaskIntent
+from infrastructure.adapters import decomposition_cache as dc
+from infrastructure.adapters.decomposition_cache import RedisDecompositionCache, normalize_query
+
+
+@pytest.fixture
+def redis_store():
+    """Fixture replacing the Redis decomposition keys with a dict."""
+    store = {}
+
+    async def get_cached(key):
+        return store.get(key)
+
+    async def save_cached(key, tasks):
+        store[key] = tasks
+        return True
+
+    with patch.object(dc, "get_cached_decomposition", side_effect=get_cached), \
+         patch.object(dc, "save_cached_decomposition", side_effect=save_cached):
+        yield store
+
+
+def _tasks():
+    return [TaskIntent(id="t1", agent="Librarian", intent="Policy_Query", decomposed_query="What is the WFH policy?")]
+
+
+class TestRedisDecompositionCache:
+    """Test cases for RedisDecompositionCache."""
+
+    def test_normalize_query(self):
+        """Test that case, spacing and trailing punctuation do not change the key."""
+        assert normalize_query("  What is the   WFH policy?? ") == normalize_query("what is the wfh policy")
+
+    async def test_hit_returns_fresh_pending_tasks(self, redis_store):
+        """Test that a cached plan comes back as new pending TaskIntent objects."""
+        cache = RedisDecompositionCache()
+        tasks = _tasks()
+        await cache.set("What is the WFH policy?", False, False, tasks)
+        tasks[0].status = "completed"
+        tasks[0].result = "old answer"
+
+        first = await cache.get("what is the wfh policy", False, False)
+        first[0].status = "running"
+        second = await cache.get("what is the wfh policy", False, False)
+
+        assert second[0].status == "pending"
+        assert second[0].result is None
+        assert first[0] is not second[0]
+
+    async def test_admin_flag_is_part_of_the_key(self, redis_store):
+        """Test that admin and non-admin decompositions never mix."""
+        cache = RedisDecompositionCache()
+        await cache.set("update the leave policy", True, False, _tasks())
+
+        assert await cache.get("update the leave policy", False, False) is None
+
+    async def test_uploaded_text_is_never_cached(self, redis_store):
+        """Test that decompositions depending on uploaded text are not stored."""
+        cache = RedisDecompositionCache()
+        await cache.set("upload this policy", True, True, _tasks())
+
+        assert redis_store == {}
+        assert await cache.get("upload this policy", True, True) is None
+
+    async def test_redis_hit_fills_local_cache(self, redis_store):
+        """Test that a Redis hit is served locally afterwards and counted in the stats."""
+        await RedisDecompositionCache().set("hi", False, False, _tasks())
+        cache = RedisDecompositionCache()
+
+        await cache.get("hi", False, False)
+        await cache.get("hi", False, False)
+
+        stats = cache.stats()
+        assert stats["redis"] == {"hits": 1, "misses": 0}
+        assert stats["local"]["hits"] == 1
+
+
+class TestSupervisorDecompositionCache:
+    """Test cases for the cache in the Supervisor decomposition node."""
+
+    async def test_cache_hit_skips_llm(self, mock_async_llm_model, sample_supervisor_state):
+        """Test that a cached decomposition is used without calling the LLM."""
+        from application.agents.supervisor import SupervisorAgent
+        cache = Mock()
+        cache.get = AsyncMock(return_value=_tasks())
+        agent = SupervisorAgent(mock_async_llm_model, Mock(), Mock(), decomposition_cache=cache)
+
+        result = await agent.decompose_query_into_tasks(sample_supervisor_state)
+
+        assert result["identified_intent"][0].intent == "Policy_Query"
+        mock_async_llm_model.ainvoke.assert_not_awaited()
@@ -292,6 +292,11 @@ class TestLibrarianTaskIntent:
         task_intent = LibrarianTaskIntent(task=tasks)
         assert len(task_intent.task) == 2
 
+    def test_librarian_task_intent_coerces_single_task(self):
+        """Test that the single task object the librarian prompt returns is wrapped under task."""
+        task_intent = LibrarianTaskIntent.model_validate({"action": "retrieve_policy", "query": "Get leave policy"})
+        assert task_intent.task[0].query == "Get leave policy"
+
 
 class TestSupervisorStructuredOutput:
     """Test cases for Supervisor_structured_output entity."""
@@ -320,3 +325,65 @@ class TestClerkMultipleTasksOutput:
         ]
         output = ClerkMultipleTasksOutput(tasks=classifications)
         assert len(output.tasks) == 2
+
+    def test_clerk_multiple_tasks_output_coerces_model_replies(self):
+        """Test that a bare list or a single task object from the model is wrapped under tasks."""
+        from_list = ClerkMultipleTasksOutput.model_validate([{"action": "get_balance", "details": None}])
+        from_task = ClerkMultipleTasksOutput.model_validate({"action": "general_information", "details": None})
+
+        assert from_list.tasks[0].action == "get_balance"
+        assert from_task.tasks[0].action == "general_information"
+
+
+class TestTaskIntentAction:
+    """Test cases for the pre-classified agent action."""
+
+    def test_action_must_belong_to_the_agent(self):
+        """Test that an action of another agent is dropped and a matching one is kept."""
+        from domain.entities import TaskIntent
+
+        clerk = TaskIntent(agent="Clerk", intent="Leave_Request", decomposed_query="Balance", action="get_balance")
+        foreign = TaskIntent(agent="Clerk", intent="Leave_Request", decomposed_query="Balance", action="retrieve_policy")
+        supervisor = TaskIntent(agent="Supervisor", intent="General_Chat", decomposed_query="hi", action="get_balance")
+
+        assert clerk.action == "get_balance"
+        assert foreign.action is None
+        assert supervisor.action is None
+
+
+class TestSupervisorTaskIntentIds:
+    """Test cases for task ids used by dependencies."""
+
+    def test_missing_ids_are_assigned_from_position(self):
+        """Test that tasks without an id get t1, t2, ... and dependencies default to none."""
+        from domain.entities import SupervisorTaskIntent
+
+        result = SupervisorTaskIntent(task=[
+            {"agent": "Clerk", "intent": "Leave_Request", "decomposed_query": "Check balance"},
+            {"id": "apply", "depends_on": ["t1"], "agent": "Clerk", "intent": "Leave_Request", "decomposed_query": "Apply"},
+        ])
+
+        assert [t.id for t in result.task] == ["t1", "apply"]
+        assert result.task[0].depends_on == []
+        assert result.task[1].depends_on == ["t1"]
+
+    def test_duplicate_ids_are_rejected(self):
+        """Test that two tasks with the same id fail validation so depends_on stays unambiguous."""
+        from domain.entities import SupervisorTaskIntent
+
+        with pytest.raises(ValidationError, match="duplicated: t1"):
+            SupervisorTaskIntent(task=[
+                {"id": "t1", "agent": "Clerk", "intent": "Leave_Request", "decomposed_query": "Check balance"},
+                {"id": "t1", "agent": "Clerk", "intent": "Leave_Request", "decomposed_query": "Apply"},
+            ])
+
+    def test_assigned_ids_skip_ids_already_in_use(self):
+        """Test that a positional id is not reused when another task already has it."""
+        from domain.entities import SupervisorTaskIntent
+
+        result = SupervisorTaskIntent(task=[
+            {"agent": "Clerk", "intent": "Leave_Request", "decomposed_query": "Check balance"},
+            {"id": "t1", "agent": "Clerk", "intent": "Leave_Request", "decomposed_query": "Apply"},
+        ])
+
+        assert [t.id for t in result.task] == ["t2", "t1"]
@@ -172,12 +172,12 @@ class TestMessageFlow:
 class TestErrorRecovery:
     """Integration tests for error recovery and resilience."""
 
-    def test_clerk_error_recovery(self, mock_llm_model):
+    async def test_clerk_error_recovery(self, mock_llm_model):
         """Test Clerk agent error recovery."""
         from application.agents.clerk import ClerkAgent
         
         mock_llm_error = Mock()
-        mock_llm_error.invoke.side_effect = Exception("LLM Error")
+        mock_llm_error.ainvoke = AsyncMock(side_effect=Exception("LLM Error"))
         mock_leave = Mock()
         mock_ticket = Mock()
 
@@ -199,15 +199,15 @@ class TestErrorRecovery:
         )
 
         # Should handle error gracefully
-        result = agent.Clerk_Outer_Model_Node(state)
+        result = await agent.Clerk_Outer_Model_Node(state)
         assert "pending_tasks" in result
 
-    def test_librarian_error_recovery(self, mock_llm_model):
+    async def test_librarian_error_recovery(self, mock_llm_model):
         """Test Librarian agent error recovery."""
         from application.agents.librarian import LibrarianAgent
         
         mock_llm_error = Mock()
-        mock_llm_error.invoke.side_effect = Exception("LLM Error")
+        mock_llm_error.ainvoke = AsyncMock(side_effect=Exception("LLM Error"))
 
         agent = LibrarianAgent(
             mock_llm_error,
@@ -229,7 +229,7 @@ class TestErrorRecovery:
             response=None
         )
 
-        result = agent.librarian_model_node(state)
+        result = await agent.librarian_model_node(state)
         assert result == {}
 
     def test_supervisor_error_recovery(self, mock_async_llm_model):
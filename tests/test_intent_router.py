@@ -0,0 +1,106 @@
+"""
+Tests for the embedding-based fast-path intent router.
+"""
+from unittest.mock import AsyncMock, Mock
+
+from langchain_core.embeddings import Embeddings
+
+from application.services.intent_router import EmbeddingIntentRouter
+from domain.entities import SupervisorTaskIntent, TaskIntent
+
+
+class BagOfWordsEmbeddings(Embeddings):
+    """Tiny deterministic embedding: one dimension per vocabulary word."""
+
+    VOCAB = ["hello", "hi", "thanks", "policy", "leave", "apply", "complaint", "harassed", "weather"]
+
+    def __init__(self):
+        self.queries = []
+
+    def _embed(self, text):
+        words = text.lower().replace("?", "").split()
+        return [float(words.count(w)) for w in self.VOCAB] + [0.01]
+
+    def embed_documents(self, texts):
+        return [self._embed(t) for t in texts]
+
+    def embed_query(self, text):
+        self.queries.append(text)
+        return self._embed(text)
+
+
+EXEMPLARS = {
+    "General_Chat": ["hello", "hi", "thanks"],
+    "Policy_Query": ["what is the leave policy"],
+    "Leave_Request": ["apply for leave"],
+    "Complaint_filing": ["complaint i am harassed"],
+}
+
+
+class TestEmbeddingIntentRouter:
+    """Test cases for EmbeddingIntentRouter."""
+
+    async def test_confident_match_returns_single_task(self):
+        """Test that a close match is routed straight to the intent's agent."""
+        router = EmbeddingIntentRouter(BagOfWordsEmbeddings(), EXEMPLARS, threshold=0.7, margin=0.1)
+
+        result = await router.route("hello")
+
+        assert isinstance(result, SupervisorTaskIntent)
+        assert result.task[0].intent == "General_Chat"
+        assert result.task[0].agent == "Supervisor"
+        assert result.task[0].decomposed_query == "hello"
+
+    async def test_routed_policy_query_is_pre_classified(self):
+        """Test that an intent with a single possible action hands that action to the agent."""
+        router = EmbeddingIntentRouter(BagOfWordsEmbeddings(), EXEMPLARS, threshold=0.7, margin=0.1)
+
+        result = await router.route("what is the leave policy")
+
+        assert result.task[0].agent == "Librarian"
+        assert result.task[0].action == "retrieve_policy"
+
+    async def test_low_confidence_falls_back(self):
+        """Test that queries unlike every exemplar are left to the LLM."""
+        router = EmbeddingIntentRouter(BagOfWordsEmbeddings(), EXEMPLARS, threshold=0.7, margin=0.1)
+
+        assert await router.route("weather") is None
+
+    async def test_multi_intent_queries_skip_embedding(self):
+        """Test that queries with several requests are never routed locally."""
+        embeddings = BagOfWordsEmbeddings()
+        router = EmbeddingIntentRouter(embeddings, EXEMPLARS, threshold=0.1, margin=0.0)
+
+        assert await router.route("what is the leave policy and apply for leave") is None
+        assert embeddings.queries == []
+
+
+class TestSupervisorRouting:
+    """Test cases for the router in the Supervisor decomposition node."""
+
+    def _agent(self, llm, routed):
+        from application.agents.supervisor import SupervisorAgent
+        router = Mock()
+        router.route = AsyncMock(return_value=routed)
+        return SupervisorAgent(llm, Mock(), Mock(), intent_router=router), router
+
+    async def test_routed_query_skips_decomposition_llm(self, mock_async_llm_model, sample_supervisor_state):
+        """Test that a routed query never calls the decomposition LLM."""
+        routed = SupervisorTaskIntent(task=[TaskIntent(agent="Supervisor", intent="General_Chat", decomposed_query="hi")])
+        agent, _ = self._agent(mock_async_llm_model, routed)
+
+        result = await agent.decompose_query_into_tasks(sample_supervisor_state)
+
+        assert result["identified_intent"][0].intent == "General_Chat"
+        mock_async_llm_model.ainvoke.assert_not_awaited()
+
+    async def test_admin_queries_bypass_router(self, mock_async_llm_model, sample_supervisor_state):
+        """Test that admin requests always go through the full decomposition."""
+        mock_async_llm_model.ainvoke.return_value = Mock(content='{"task": []}')
+        agent, router = self._agent(mock_async_llm_model, None)
+        sample_supervisor_state.user_query.isAdmin = True
+
+        await agent.decompose_query_into_tasks(sample_supervisor_state)
+
+        router.route.assert_not_awaited()
+        mock_async_llm_model.ainvoke.assert_awaited_once()
@@ -0,0 +1,128 @@
+"""
+Tests for the background job worker pool.
+"""
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from application.services import job_worker_pool
+from application.services.job_worker_pool import JobWorkerPool
+
+
+@pytest.fixture
+def job_store():
+    """Fixture replacing the Redis job status hash with a dict."""
+    jobs = {}
+
+    async def update_job(job_id, **fields):
+        jobs.setdefault(job_id, {"job_id": job_id}).update({k: v for k, v in fields.items() if v is not None})
+        return dict(jobs[job_id])
+
+    with patch.object(job_worker_pool, "update_job", side_effect=update_job):
+        yield jobs
+
+
+class TestJobWorkerPool:
+    """Test cases for JobWorkerPool."""
+
+    async def test_completed_job_records_result_and_notifies(self, job_store):
+        """Test that a job moves through running to completed and every change is pushed."""
+        notify = AsyncMock()
+        pool = JobWorkerPool(AsyncMock(return_value="You have 12 days left."), notify=notify, concurrency=1)
+
+        await pool.run_job("job_1", {"user_query": {}})
+
+        assert job_store["job_1"]["status"] == "completed"
+        assert job_store["job_1"]["result"] == "You have 12 days left."
+        assert [c[0][0]["status"] for c in notify.await_args_list] == ["running", "completed"]
+
+    async def test_failed_job_hides_internal_error(self, job_store):
+        """Test that a failing handler marks the job failed without leaking the exception text."""
+        pool = JobWorkerPool(AsyncMock(side_effect=RuntimeError("groq key invalid")), concurrency=1)
+
+        await pool.run_job("job_1", {})
+
+        assert job_store["job_1"]["status"] == "failed"
+        assert "groq" not in job_store["job_1"]["error"]
+
+    async def test_expired_payload_fails_the_job(self, job_store):
+        """Test that a job whose payload expired in the queue is failed without running the handler."""
+        handler = AsyncMock()
+        pool = JobWorkerPool(handler, concurrency=1)
+
+        await pool.run_job("job_1", None)
+
+        handler.assert_not_awaited()
+        assert job_store["job_1"]["status"] == "failed"
+
+    async def test_workers_consume_queue_and_close_waits_for_running_job(self, job_store):
+        """Test that queued jobs are picked up and a running job finishes during shutdown."""
+        started = asyncio.Event()
+
+        async def handler(payload):
+            started.set()
+            await asyncio.sleep(0.05)
+            return payload["answer"]
+
+        queue = [{"job_id": "job_1", "payload": {"answer": "done"}}]
+
+        async def dequeue_job(timeout=1):
+            if queue:
+                return queue.pop(0)
+            await asyncio.sleep(0.01)
+            return None
+
+        with patch.object(job_worker_pool, "dequeue_job", side_effect=dequeue_job):
+            pool = JobWorkerPool(handler, concurrency=2)
+            pool.start()
+            await asyncio.wait_for(started.wait(), timeout=1)
+            await pool.close(timeout=1)
+
+        assert job_store["job_1"]["status"] == "completed"
+        assert job_store["job_1"]["result"] == "done"
+
+    async def test_worker_backs_off_while_redis_is_down(self, job_store):
+        """Test that dequeue errors are retried with backoff instead of a busy loop."""
+        calls = []
+
+        async def dequeue_job(timeout=1):
+            calls.append(1)
+            raise ConnectionError("redis down")
+
+        with patch.object(job_worker_pool, "dequeue_job", side_effect=dequeue_job):
+            pool = JobWorkerPool(AsyncMock(), concurrency=1, retry_backoff=0.02, max_backoff=0.04)
+            pool.start()
+            await asyncio.sleep(0.1)
+            await pool.close(timeout=1)
+
+        assert 1 < len(calls) < 10
+
+
+class TestJobQueuePayloads:
+    """Test cases for the job payloads kept apart from the queue."""
+
+    async def test_payload_has_a_ttl_and_is_deleted_on_dequeue(self):
+        """Test that the queue only holds the job id and the payload, with its token, is read once."""
+        import json
+        from unittest.mock import MagicMock
+        from infrastructure.redis import job_queue
+
+        pipe = MagicMock()
+        pipe.execute = AsyncMock()
+        pipe.__aenter__ = AsyncMock(return_value=pipe)
+        pipe.__aexit__ = AsyncMock(return_value=False)
+        payload = {"user_query": {"auth_token": "token_xyz"}}
+        redis = MagicMock()
+        redis.pipeline.return_value = pipe
+        redis.blpop = AsyncMock(return_value=(job_queue.JOB_QUEUE_KEY, "job_1"))
+        redis.getdel = AsyncMock(return_value=json.dumps(payload))
+
+        with patch.object(job_queue, "get_shared_async_redis_client", return_value=redis):
+            await job_queue.enqueue_job("job_1", payload, "user_456", "conv_123")
+            job = await job_queue.dequeue_job()
+
+        pipe.set.assert_called_once_with("job_payload:job_1", json.dumps(payload), ex=job_queue.JOB_PAYLOAD_TTL_SECONDS)
+        pipe.rpush.assert_called_once_with(job_queue.JOB_QUEUE_KEY, "job_1")
+        redis.getdel.assert_awaited_once_with("job_payload:job_1")
+        assert job == {"job_id": "job_1", "payload": payload}
@@ -0,0 +1,42 @@
+"""
+Tests for the /leave_balance endpoint called by the Clerk balance tool.
+"""
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from fastapi import HTTPException
+
+pytest.importorskip("langchain_chroma")
+
+import main
+
+
+class TestLeaveBalanceEndpoint:
+    """Test cases for the error statuses of /leave_balance."""
+
+    @pytest.fixture(autouse=True)
+    def signed_in(self):
+        """Fixture authenticating every request as the same user."""
+        with patch.object(main, "verify_auth_token", AsyncMock(return_value=Mock(id="user_456"))):
+            yield
+
+    async def test_returns_the_balance(self):
+        """Test that a stored balance is returned."""
+        with patch.object(main, "fetch_user_leave_balance", AsyncMock(return_value=12)):
+            assert await main.get_leave_balance_endpoint("Bearer token_xyz") == {"leave_balance": 12}
+
+    async def test_missing_row_is_not_found(self):
+        """Test that a user without a balance row gets a 404 instead of 0 days."""
+        with patch.object(main, "fetch_user_leave_balance", AsyncMock(return_value=None)):
+            with pytest.raises(HTTPException) as error:
+                await main.get_leave_balance_endpoint("Bearer token_xyz")
+
+        assert error.value.status_code == 404
+
+    async def test_lookup_error_is_unavailable(self):
+        """Test that a failed lookup gets a 503 so the Clerk adapter reports a failure."""
+        with patch.object(main, "fetch_user_leave_balance", AsyncMock(side_effect=TimeoutError())):
+            with pytest.raises(HTTPException) as error:
+                await main.get_leave_balance_endpoint("Bearer token_xyz")
+
+        assert error.value.status_code == 503
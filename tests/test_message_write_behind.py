@@ -0,0 +1,72 @@
+"""
+Tests for the write-behind message queue.
+"""
+import asyncio
+from unittest.mock import AsyncMock
+
+from infrastructure.supabase.message_write_behind import MessageWriteBehindQueue
+
+
+class TestMessageWriteBehindQueue:
+    """Test cases for MessageWriteBehindQueue."""
+
+    async def test_enqueue_returns_row_with_generated_id(self):
+        """Test that queued rows get an id and created_at and stay readable until written."""
+        writer = MessageWriteBehindQueue(AsyncMock(return_value=True))
+
+        row = await writer.enqueue({"chat_id": "conv_123", "content": "hi", "type": "ai"})
+
+        assert row["id"] and row["created_at"]
+        assert writer.pending("conv_123") == [row]
+        assert writer.pending("conv_other") == []
+
+    async def test_rows_are_written_in_one_batch(self):
+        """Test that messages queued together are inserted with a single call."""
+        insert_batch = AsyncMock(return_value=True)
+        writer = MessageWriteBehindQueue(insert_batch, batch_size=10, flush_interval=0.05)
+        writer.start()
+
+        for i in range(3):
+            await writer.enqueue({"chat_id": "conv_123", "content": f"answer {i}", "type": "ai"})
+        await writer.close(timeout=1)
+
+        insert_batch.assert_awaited_once()
+        assert [r["content"] for r in insert_batch.call_args[0][0]] == ["answer 0", "answer 1", "answer 2"]
+        assert writer.pending("conv_123") == []
+
+    async def test_failed_batch_is_retried_with_same_ids(self):
+        """Test that a failed insert is retried with the same rows."""
+        insert_batch = AsyncMock(side_effect=[Exception("timeout"), True])
+        writer = MessageWriteBehindQueue(insert_batch, flush_interval=0.01, retry_backoff=0.01)
+        writer.start()
+
+        await writer.enqueue({"chat_id": "conv_123", "content": "hi", "type": "ai"})
+        await writer.close(timeout=1)
+
+        assert insert_batch.await_count == 2
+        assert insert_batch.await_args_list[0][0][0] == insert_batch.await_args_list[1][0][0]
+
+    async def test_close_flushes_without_running_worker(self):
+        """Test that rows queued before the worker started are written on shutdown."""
+        insert_batch = AsyncMock(return_value=True)
+        writer = MessageWriteBehindQueue(insert_batch, batch_size=2)
+
+        for i in range(3):
+            await writer.enqueue({"chat_id": "conv_123", "content": f"answer {i}", "type": "ai"})
+        await writer.close()
+
+        assert insert_batch.await_count == 2
+        assert writer.pending("conv_123") == []
+
+    async def test_full_buffer_applies_backpressure(self):
+        """Test that enqueue waits for space instead of dropping rows when the buffer is full."""
+        writer = MessageWriteBehindQueue(AsyncMock(return_value=True), max_size=1)
+        await writer.enqueue({"chat_id": "conv_123", "content": "first", "type": "ai"})
+
+        blocked = asyncio.create_task(writer.enqueue({"chat_id": "conv_123", "content": "second", "type": "ai"}))
+        await asyncio.sleep(0.05)
+        assert not blocked.done()
+
+        writer.start()
+        await asyncio.wait_for(blocked, timeout=1)
+        await writer.close(timeout=1)
@@ -0,0 +1,58 @@
+"""
+Tests for the pre-flight steps of process_query.
+"""
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from fastapi import HTTPException
+
+pytest.importorskip("langchain_chroma")
+
+import main
+from domain.entities import UserQuery
+from infrastructure.supabase import supabase_client
+
+
+@pytest.fixture
+def user_query():
+    """Fixture for a query on a conversation."""
+    return UserQuery(query="How many days of leave do I have?", conversation_id="conv_123", auth_token="token_xyz")
+
+
+class TestQueryPreflight:
+    """Test cases for the auth-gated pre-flight steps."""
+
+    @pytest.mark.parametrize("user, owned, status_code", [(None, True, 401), (Mock(id="user_456"), False, 403)])
+    async def test_auth_failure_cancels_persistence_and_history(self, user_query, user, owned, status_code):
+        """Test that a failed auth or ownership check stops the insert and the history read."""
+        with patch.object(main, "verify_auth_token", AsyncMock(return_value=user)), \
+             patch.object(main, "is_chat_owned_by_user", AsyncMock(return_value=owned)), \
+             patch.object(main, "save_message_to_db", AsyncMock()) as save, \
+             patch.object(main, "get_chat_history", AsyncMock(return_value=[])) as history:
+            with pytest.raises(HTTPException) as error:
+                await main._run_preflight(user_query)
+            await asyncio.sleep(0)
+
+        assert error.value.status_code == status_code
+        save.assert_not_awaited()
+        history.assert_not_awaited()
+
+    async def test_nothing_is_written_for_a_chat_the_caller_does_not_own(self, user_query):
+        """Test that neither Supabase nor the Redis history cache are touched for a foreign chat."""
+        with patch.object(main, "verify_auth_token", AsyncMock(return_value=Mock(id="user_456"))), \
+             patch.object(main, "is_chat_owned_by_user", AsyncMock(return_value=False)), \
+             patch.object(supabase_client, "get_cached_chat_history", AsyncMock(return_value=(None, None))) as read_cache, \
+             patch.object(supabase_client, "cache_chat_history", AsyncMock()) as fill_cache, \
+             patch.object(supabase_client, "append_cached_chat_message", AsyncMock()) as append_cache, \
+             patch.object(supabase_client._service_supabase, "table") as service_table, \
+             patch.object(supabase_client.supabase, "table") as table:
+            with pytest.raises(HTTPException):
+                await main._run_preflight(user_query)
+            await asyncio.sleep(0)
+
+        read_cache.assert_not_awaited()
+        fill_cache.assert_not_awaited()
+        append_cache.assert_not_awaited()
+        service_table.assert_not_called()
+        table.assert_not_called()
@@ -0,0 +1,83 @@
+"""
+Tests for the authenticated Socket.IO handlers and room-targeted emits.
+"""
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+from socketio.exceptions import ConnectionRefusedError
+
+from infrastructure.socket import socket_manager as sm
+
+
+@pytest.fixture
+def server():
+    """Fixture patching the Socket.IO server methods used by the handlers."""
+    with patch.object(sm.socket_manager, "save_session", AsyncMock()) as save_session, \
+         patch.object(sm.socket_manager, "get_session", AsyncMock(return_value={"user_id": "user_456"})), \
+         patch.object(sm.socket_manager, "enter_room", AsyncMock()) as enter_room, \
+         patch.object(sm.socket_manager, "emit", AsyncMock()) as emit:
+        yield Mock(save_session=save_session, enter_room=enter_room, emit=emit)
+
+
+class TestSocketHandlers:
+    """Test cases for the connect and join_room handlers."""
+
+    async def test_connect_without_valid_token_is_refused(self, server):
+        """Test that unauthenticated sockets are rejected."""
+        with patch.object(sm, "verify_auth_token", AsyncMock(return_value=None)):
+            with pytest.raises(ConnectionRefusedError):
+                await sm.connect("sid_1", {}, {"token": "bad"})
+        server.enter_room.assert_not_awaited()
+
+    async def test_connect_joins_user_room(self, server):
+        """Test that an authenticated socket is placed in the room of its user."""
+        with patch.object(sm, "verify_auth_token", AsyncMock(return_value=Mock(id="user_456"))):
+            await sm.connect("sid_1", {}, {"token": "good"})
+        server.enter_room.assert_awaited_once_with("sid_1", "user:user_456")
+
+    async def test_join_room_checks_conversation_ownership(self, server):
+        """Test that a socket cannot join a conversation of another user."""
+        with patch.object(sm, "is_chat_owned_by_user", AsyncMock(return_value=False)):
+            assert await sm.join_room("sid_1", "conversation:conv_999") == {"ok": False}
+        with patch.object(sm, "is_chat_owned_by_user", AsyncMock(return_value=True)):
+            assert await sm.join_room("sid_1", "conversation:conv_123") == {"ok": True}
+        server.enter_room.assert_awaited_once_with("sid_1", "conversation:conv_123")
+
+    async def test_join_room_refuses_other_rooms(self, server):
+        """Test that user rooms and unknown rooms cannot be joined explicitly."""
+        assert await sm.join_room("sid_1", "user:user_999") == {"ok": False}
+        server.enter_room.assert_not_awaited()
+
+    async def test_hitl_event_is_sent_to_user_room_only(self, server):
+        """Test that HITL events are no longer broadcast to every client."""
+        await sm.broadcast_hitl_event("user_456", "conv_123", "Clerk", {"hitl_task": {}})
+
+        server.emit.assert_awaited_once_with(
+            "HITL_Intervention_Channel:user_456:conv_123:Clerk", {"hitl_task": {}}, room="user:user_456"
+        )
+
+
+class TestClientManager:
+    """Test cases for the Redis client manager shared by the worker processes."""
+
+    def test_client_manager_uses_the_redis_url(self):
+        """Test that emits are fanned out through Redis on the configured URL and channel."""
+        import socketio
+        from infrastructure.redis.redis_config import get_redis_url
+
+        manager = sm.create_client_manager(enabled=True)
+
+        assert isinstance(manager, socketio.AsyncRedisManager)
+        assert manager.redis_url == get_redis_url()
+        assert manager.channel == "socketio"
+        assert manager.redis_options == {"socket_keepalive": True}
+
+    def test_server_uses_the_module_client_manager(self):
+        """Test that the Socket.IO server is wired to the Redis manager when it is enabled."""
+        if sm.client_manager is None:
+            pytest.skip("SOCKETIO_REDIS_MANAGER_ENABLED is false")
+        assert sm.socket_manager.manager is sm.client_manager
+
+    def test_client_manager_can_be_disabled(self):
+        """Test that a single-process deployment falls back to the in-memory manager."""
+        assert sm.create_client_manager(enabled=False) is None
@@ -0,0 +1,83 @@
+"""
+Tests for the shared structured-output helper.
+"""
+import json
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from langchain_core.messages import HumanMessage
+
+from application.services.structured_output import (
+    JSON_MODE_KWARGS,
+    StructuredOutputError,
+    ainvoke_structured,
+)
+from domain.entities import ClerkMultipleTasksOutput, SupervisorTaskIntent
+
+
+def _reply(content):
+    return Mock(content=content)
+
+
+class TestInvokeStructured:
+    """Test cases for ainvoke_structured."""
+
+    async def test_requests_json_mode_and_validates(self):
+        """Test that the model is called in JSON mode and the reply is validated."""
+        llm = Mock()
+        llm.ainvoke = AsyncMock(return_value=_reply(json.dumps({"tasks": [{"action": "get_balance", "details": None}]})))
+
+        output, response = await ainvoke_structured(llm, [HumanMessage(content="balance")], ClerkMultipleTasksOutput)
+
+        assert output.tasks[0].action == "get_balance"
+        assert response is llm.ainvoke.return_value
+        assert llm.ainvoke.await_args.kwargs == JSON_MODE_KWARGS
+
+    async def test_repairs_invalid_reply_once(self):
+        """Test that a reply failing validation is retried with the error shown to the model."""
+        llm = Mock()
+        llm.ainvoke = AsyncMock(side_effect=[
+            _reply(json.dumps({"tasks": [{"action": "make_coffee"}]})),
+            _reply(json.dumps({"tasks": [{"action": "ticket_creation", "details": None}]})),
+        ])
+
+        output, _ = await ainvoke_structured(llm, [HumanMessage(content="raise a ticket")], ClerkMultipleTasksOutput)
+
+        assert output.tasks[0].action == "ticket_creation"
+        repair_messages = llm.ainvoke.await_args_list[1].args[0]
+        assert len(repair_messages) == 3
+        assert "make_coffee" in repair_messages[1].content
+        assert "JSON schema" in repair_messages[2].content
+
+    async def test_gives_up_after_repair_retries(self):
+        """Test that the number of calls is bounded and the failure is raised."""
+        llm = Mock()
+        llm.ainvoke = AsyncMock(return_value=_reply("not json"))
+
+        with pytest.raises(StructuredOutputError):
+            await ainvoke_structured(llm, [HumanMessage(content="hi")], ClerkMultipleTasksOutput, repair_retries=1)
+
+        assert llm.ainvoke.await_count == 2
+
+    async def test_provider_errors_are_not_retried(self):
+        """Test that errors unrelated to the output format propagate straight away."""
+        llm = Mock()
+        llm.ainvoke = AsyncMock(side_effect=ConnectionError("groq down"))
+
+        with pytest.raises(ConnectionError):
+            await ainvoke_structured(llm, [HumanMessage(content="hi")], ClerkMultipleTasksOutput)
+
+        assert llm.ainvoke.await_count == 1
+
+    async def test_async_repairs_json_mode_rejection(self):
+        """Test that a JSON mode generation rejected by the provider is repaired."""
+        llm = Mock()
+        llm.ainvoke = AsyncMock(side_effect=[
+            Exception("Error code: 400 - {'error': {'code': 'json_validate_failed'}}"),
+            _reply(json.dumps({"task": [{"agent": "Clerk", "intent": "Leave_Request", "decomposed_query": "balance"}]})),
+        ])
+
+        output, _ = await ainvoke_structured(llm, [HumanMessage(content="balance")], SupervisorTaskIntent)
+
+        assert output.task[0].id == "t1"
+        assert llm.ainvoke.await_count == 2
@@ -0,0 +1,192 @@
+"""
+Tests for the async Supabase data access layer.
+"""
+import threading
+import time
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+from infrastructure.supabase import supabase_client
+
+
+class TestSupabaseDataLayer:
+    """Test cases for the non-blocking Supabase helpers."""
+
+    async def test_calls_run_off_the_event_loop_thread(self):
+        """Test that blocking Supabase calls are executed in the worker pool."""
+        calling_threads = []
+
+        def get_user(token):
+            calling_threads.append(threading.current_thread())
+            return Mock(user=Mock(id="user_456"))
+
+        with patch.object(supabase_client.supabase.auth, "get_user", side_effect=get_user):
+            user = await supabase_client.get_user_from_token("token_xyz")
+
+        assert user.id == "user_456"
+        assert calling_threads[0] is not threading.main_thread()
+
+    async def test_slow_call_times_out(self):
+        """Test that a slow round-trip is bounded by the per-call timeout."""
+        def slow_query():
+            time.sleep(0.5)
+            return Mock(data=[{"chat_id": "conv_123"}])
+
+        with pytest.raises(TimeoutError):
+            await supabase_client._run_blocking(slow_query, timeout=0.05)
+
+    async def test_save_message_returns_none_on_error(self):
+        """Test that insert failures are reported as None."""
+        with patch.object(supabase_client._service_supabase, "table", side_effect=Exception("boom")):
+            saved = await supabase_client.save_message_to_db({"chat_id": "conv_123", "content": "hi", "type": "user"})
+
+        assert saved is None
+
+    async def test_save_message_stamps_created_at(self):
+        """Test that directly saved messages are stamped with the app clock like queued ones."""
+        table = Mock()
+        table.return_value.insert.return_value.execute.return_value = Mock(data=[{"id": "m1"}])
+
+        with patch.object(supabase_client._service_supabase, "table", table), \
+             patch.object(supabase_client, "append_cached_chat_message", AsyncMock()):
+            await supabase_client.save_message_to_db({"chat_id": "conv_123", "content": "hi", "type": "user"})
+
+        inserted = table.return_value.insert.call_args[0][0]
+        assert inserted["created_at"].endswith("+00:00")
+
+
+class TestLeaveBalanceCache:
+    """Test cases for the Redis-cached leave balance."""
+
+    async def test_cache_hit_skips_postgres(self):
+        """Test that a cached balance is returned without querying Supabase."""
+        with patch.object(supabase_client, "LEAVE_BALANCE_CACHE_ENABLED", True), \
+             patch.object(supabase_client, "get_cached_leave_balance", AsyncMock(return_value=9)), \
+             patch.object(supabase_client._service_supabase, "table") as table:
+            balance = await supabase_client.fetch_user_leave_balance("user_1")
+
+        assert balance == 9
+        table.assert_not_called()
+
+    async def test_cache_miss_saves_database_balance(self):
+        """Test that the balance read from Supabase is cached."""
+        table = Mock()
+        table.return_value.select.return_value.eq.return_value.maybe_single.return_value.execute.return_value = Mock(data={"balance": 14})
+
+        with patch.object(supabase_client, "LEAVE_BALANCE_CACHE_ENABLED", True), \
+             patch.object(supabase_client, "get_cached_leave_balance", AsyncMock(return_value=None)), \
+             patch.object(supabase_client, "save_cached_leave_balance", AsyncMock()) as save, \
+             patch.object(supabase_client._service_supabase, "table", table):
+            balance = await supabase_client.fetch_user_leave_balance("user_1")
+
+        assert balance == 14
+        save.assert_awaited_once_with("user_1", 14)
+
+    async def test_missing_row_is_not_cached(self):
+        """Test that a user without a balance row gets None and nothing is cached."""
+        table = Mock()
+        table.return_value.select.return_value.eq.return_value.maybe_single.return_value.execute.return_value = None
+
+        with patch.object(supabase_client, "LEAVE_BALANCE_CACHE_ENABLED", True), \
+             patch.object(supabase_client, "get_cached_leave_balance", AsyncMock(return_value=None)), \
+             patch.object(supabase_client, "save_cached_leave_balance", AsyncMock()) as save, \
+             patch.object(supabase_client._service_supabase, "table", table):
+            balance = await supabase_client.fetch_user_leave_balance("user_1")
+
+        assert balance is None
+        save.assert_not_awaited()
+
+    async def test_lookup_error_is_raised_and_not_cached(self):
+        """Test that a Supabase failure is raised instead of being reported as a zero balance."""
+        with patch.object(supabase_client, "LEAVE_BALANCE_CACHE_ENABLED", True), \
+             patch.object(supabase_client, "get_cached_leave_balance", AsyncMock(return_value=None)), \
+             patch.object(supabase_client, "save_cached_leave_balance", AsyncMock()) as save, \
+             patch.object(supabase_client._service_supabase, "table", side_effect=TimeoutError()):
+            with pytest.raises(TimeoutError):
+                await supabase_client.fetch_user_leave_balance("user_1")
+
+        save.assert_not_awaited()
+
+    async def test_leave_ticket_invalidates_balance(self):
+        """Test that creating a leave ticket drops the cached balance of the user."""
+        table = Mock()
+        table.return_value.insert.return_value.execute.return_value = Mock(data=[{"id": 1}])
+
+        with patch.object(supabase_client, "invalidate_leave_balance", AsyncMock()) as invalidate, \
+             patch.object(supabase_client._service_supabase, "table", table):
+            created = await supabase_client.create_ticket_in_db({"ticket_type": "leave", "user_id": "user_1", "leave_days": 2})
+
+        assert created is True
+        invalidate.assert_awaited_once_with("user_1")
+
+
+class TestWindowedChatHistory:
+    """Test cases for the windowed, Redis-cached chat history."""
+
+    async def test_cache_hit_skips_postgres(self):
+        """Test that a cached window is returned without querying Supabase."""
+        cached = [{"id": "m1", "type": "user", "content": "hi", "created_at": "2026-01-01T00:00:00"}]
+
+        with patch.object(supabase_client, "get_cached_chat_history", AsyncMock(return_value=(cached, "3"))), \
+             patch.object(supabase_client.supabase, "table") as table:
+            history = await supabase_client.get_chat_history("conv_123")
+
+        assert history == cached
+        table.assert_not_called()
+
+    async def test_cache_miss_reads_latest_window_and_fills_cache(self):
+        """Test that a miss reads the newest rows, returns them oldest first and fills the cache."""
+        rows_newest_first = [
+            {"id": "m2", "type": "ai", "content": "hello", "created_at": "2026-01-01T00:00:02"},
+            {"id": "m1", "type": "user", "content": "hi", "created_at": "2026-01-01T00:00:01"},
+        ]
+        request = Mock()
+        request.select.return_value = request
+        request.eq.return_value = request
+        request.order.return_value = request
+        request.limit.return_value = request
+        request.execute.return_value = Mock(data=rows_newest_first)
+        fill_cache = AsyncMock()
+
+        with patch.object(supabase_client, "get_cached_chat_history", AsyncMock(return_value=(None, "3"))), \
+             patch.object(supabase_client, "cache_chat_history", fill_cache), \
+             patch.object(supabase_client.supabase, "table", return_value=request):
+            history = await supabase_client.get_chat_history("conv_123")
+
+        assert [m["id"] for m in history] == ["m1", "m2"]
+        request.order.assert_called_once_with("created_at", desc=True)
+        request.limit.assert_called_once_with(supabase_client.CHAT_HISTORY_WINDOW)
+        fill_cache.assert_awaited_once_with("conv_123", history, "3")
+
+    async def test_older_page_uses_keyset_and_bypasses_cache(self):
+        """Test that paging back uses created_at as the keyset and never touches the cache."""
+        request = Mock()
+        for method in ("select", "eq", "lt", "order", "limit"):
+            getattr(request, method).return_value = request
+        request.execute.return_value = Mock(data=[])
+        read_cache = AsyncMock()
+
+        with patch.object(supabase_client, "get_cached_chat_history", read_cache), \
+             patch.object(supabase_client.supabase, "table", return_value=request):
+            await supabase_client.get_chat_history("conv_123", before="2026-01-01T00:00:01")
+
+        request.lt.assert_called_once_with("created_at", "2026-01-01T00:00:01")
+        read_cache.assert_not_awaited()
+
+    async def test_queued_messages_are_merged_into_history(self):
+        """Test that messages still in the write-behind queue are part of the latest window."""
+        request = Mock()
+        for method in ("select", "eq", "order", "limit"):
+            getattr(request, method).return_value = request
+        request.execute.return_value = Mock(data=[
+            {"id": "m1", "type": "user", "content": "hi", "created_at": "2026-01-01T00:00:01+00:00"},
+        ])
+        queued = {"id": "m2", "chat_id": "conv_123", "type": "ai", "content": "hello", "created_at": "2026-01-01T00:00:02+00:00"}
+
+        with patch.object(supabase_client, "get_cached_chat_history", AsyncMock(return_value=(None, None))), \
+             patch.object(supabase_client, "cache_chat_history", AsyncMock()), \
+             patch.object(supabase_client._message_writer, "pending", return_value=[queued]), \
+             patch.object(supabase_client.supabase, "table", return_value=request):
+            history = await supabase_client.get_chat_history("conv_123")
+
+        assert [m["id"] for m in history] == ["m1", "m2"]
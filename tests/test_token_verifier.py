@@ -0,0 +1,86 @@
+"""
+Tests for the auth token verification layer and its LRU+TTL cache.
+"""
+import time
+import jwt
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from infrastructure.cache.lru_ttl_cache import LRUTTLCache
+from infrastructure.supabase.token_verifier import TokenVerifier
+
+SECRET = "test-jwt-secret-with-at-least-32-bytes"
+
+
+def make_token(secret=SECRET, expires_in=3600, sub="user_456"):
+    """Build a Supabase-style access token."""
+    return jwt.encode(
+        {"sub": sub, "aud": "authenticated", "exp": int(time.time()) + expires_in},
+        secret,
+        algorithm="HS256",
+    )
+
+
+class TestLRUTTLCache:
+    """Test cases for LRUTTLCache."""
+
+    def test_evicts_least_recently_used(self):
+        """Test that the oldest unused entry is evicted when full."""
+        cache = LRUTTLCache(max_size=2, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_entries_expire(self):
+        """Test that entries are dropped after their TTL."""
+        cache = LRUTTLCache(max_size=2, ttl_seconds=60)
+        cache.set("a", 1, ttl_seconds=0.01)
+        time.sleep(0.02)
+
+        assert cache.get("a") is None
+        assert cache.stats()["misses"] == 1
+
+
+class TestTokenVerifier:
+    """Test cases for TokenVerifier."""
+
+    async def test_remote_lookup_only_on_cache_miss(self):
+        """Test that a valid token hits Supabase once and is then served from cache."""
+        remote_lookup = AsyncMock(return_value=Mock(id="user_456"))
+        verifier = TokenVerifier(remote_lookup, secret=SECRET)
+        token = make_token()
+
+        first = await verifier.verify(token)
+        second = await verifier.verify(token)
+
+        assert first.id == "user_456"
+        assert second is first
+        remote_lookup.assert_awaited_once_with(token)
+
+    @pytest.mark.parametrize("token", [
+        make_token(secret="wrong-jwt-secret-with-at-least-32-bytes"),
+        make_token(expires_in=-10),
+        "not-a-jwt",
+    ])
+    async def test_invalid_tokens_rejected_locally(self, token):
+        """Test that bad signatures, expired and malformed tokens never reach Supabase."""
+        remote_lookup = AsyncMock(return_value=Mock(id="user_456"))
+        verifier = TokenVerifier(remote_lookup, secret=SECRET)
+
+        assert await verifier.verify(token) is None
+        remote_lookup.assert_not_awaited()
+
+    async def test_revoked_token_not_cached(self):
+        """Test that a token rejected by Supabase is looked up again next time."""
+        remote_lookup = AsyncMock(return_value=None)
+        verifier = TokenVerifier(remote_lookup, secret=SECRET)
+        token = make_token()
+
+        assert await verifier.verify(token) is None
+        assert await verifier.verify(token) is None
+        assert remote_lookup.await_count == 2
@@ -0,0 +1,75 @@
+"""
+Tests for the process-wide embedding model and vector store provider.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, patch
+
+import pytest
+
+pytest.importorskip("langchain_chroma")
+pytest.importorskip("langchain_huggingface")
+
+from infrastructure.vector_store import chroma_client
+from infrastructure.vector_store.chroma_client import VectorStoreProvider
+
+
+@pytest.fixture
+def stub_backends():
+    """Fixture replacing the embedding model and Chroma with slow stubs that count their instances."""
+    created = {"embeddings": 0, "stores": 0}
+    count_lock = threading.Lock()
+
+    def make_embeddings(model_name):
+        time.sleep(0.02)
+        with count_lock:
+            created["embeddings"] += 1
+        return Mock(name=f"embeddings-{created['embeddings']}")
+
+    def make_store(embedding_model, persist_dir):
+        with count_lock:
+            created["stores"] += 1
+        return Mock(name=f"store-{created['stores']}")
+
+    with patch.object(chroma_client, "HuggingFaceEmbeddings", side_effect=make_embeddings), \
+         patch.object(chroma_client, "create_chroma_instance", side_effect=make_store):
+        yield created
+
+
+class TestVectorStoreProvider:
+    """Test cases for VectorStoreProvider."""
+
+    def test_concurrent_calls_build_one_instance(self, stub_backends):
+        """Test that threads racing on first use share one embedding model and one store."""
+        provider = VectorStoreProvider(persist_dir="/tmp/policies")
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            stores = list(pool.map(lambda _: provider.get_vector_store(), range(8)))
+
+        assert stub_backends == {"embeddings": 1, "stores": 1}
+        assert all(store is stores[0] for store in stores)
+
+    def test_start_is_idempotent(self, stub_backends):
+        """Test that starting twice keeps the first instances and warms the model once."""
+        provider = VectorStoreProvider()
+
+        provider.start()
+        embedding_model = provider.get_embedding_model()
+        provider.start()
+
+        assert provider.get_embedding_model() is embedding_model
+        embedding_model.embed_query.assert_called_once_with("warm up")
+        assert stub_backends == {"embeddings": 1, "stores": 1}
+
+    def test_close_resets_state(self, stub_backends):
+        """Test that close releases the instances and the next use builds new ones."""
+        provider = VectorStoreProvider()
+        first_store = provider.get_vector_store()
+
+        provider.close()
+
+        assert provider._vector_store is None
+        assert provider._embedding_model is None
+        assert provider.get_vector_store() is not first_store
+        assert stub_backends == {"embeddings": 2, "stores": 2}
@@ -0,0 +1,60 @@
+"""
+Tests for the Supervisor workflow, including streaming of the final response.
+"""
+import json
+from unittest.mock import AsyncMock, Mock
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+from application.agents.supervisor import SupervisorAgent
+from application.workflow import SupervisorWorkflow
+
+
+def _workflow(llm_responses, synthesis_policy="auto"):
+    llm = GenericFakeChatModel(messages=iter([AIMessage(content=c) for c in llm_responses]))
+    clerk_executor = Mock()
+    clerk_executor.execute_clerk_agent_graph = AsyncMock(return_value="Balance is 12 days.")
+    agent = SupervisorAgent(llm, clerk_executor, Mock(), synthesis_policy=synthesis_policy)
+    registry = Mock(supervisor_graph=agent.create_supervisor_agent_graph())
+    return SupervisorWorkflow(registry)
+
+
+class TestStreamUserQuery:
+    """Test cases for SupervisorWorkflow.stream_user_query."""
+
+    async def test_streams_only_synthesis_tokens(self, sample_supervisor_state):
+        """Test that synthesis tokens are streamed and the decomposition JSON is not."""
+        decomposition = json.dumps({"task": [{
+            "agent": "Clerk",
+            "intent": "Leave_Request",
+            "decomposed_query": "What is my leave balance?",
+            "status": "pending",
+            "result": None,
+        }]})
+        workflow = _workflow([decomposition, "You have 12 days of leave left."], synthesis_policy="always")
+
+        events = [e async for e in workflow.stream_user_query(sample_supervisor_state)]
+
+        tokens = [e["content"] for e in events if e["type"] == "token"]
+        assert len(tokens) > 1
+        assert "".join(tokens) == "You have 12 days of leave left."
+        assert events[-1] == {"type": "final", "content": "You have 12 days of leave left."}
+
+    async def test_direct_response_is_sent_as_one_chunk(self, sample_supervisor_state):
+        """Test that responses produced without the synthesis call still reach the stream."""
+        decomposition = json.dumps({"task": [{
+            "agent": "Supervisor",
+            "intent": "General_Chat",
+            "decomposed_query": "hello",
+            "status": "pending",
+            "result": None,
+        }]})
+        workflow = _workflow([decomposition, "Hi there! How can I help with HR today?"])
+
+        events = [e async for e in workflow.stream_user_query(sample_supervisor_state)]
+
+        assert events == [
+            {"type": "token", "content": "Hi there! How can I help with HR today?"},
+            {"type": "final", "content": "Hi there! How can I help with HR today?"},
+        ]